@@ -7,11 +7,13 @@ from io import StringIO
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 
-from ....core.constants import SECTOR_MAP
 from ....core.response_handler import StandardResponse
 from ....core.security import get_current_user
 from ....services.analytics import AnalyticsService
+from ....services.cache import market_ttl
+from ....services.cache_aside import cache_aside
 from ....services.portfolio import get_prices_for_holdings, get_user_holdings
+from ....services.symbols import get_symbol_master
 from .schemas import SimulateRequest
 
 router = APIRouter()
@@ -214,16 +216,14 @@ async def get_health_score(
     current_user: dict = Depends(get_current_user),
 ) -> StandardResponse:
     """Calculate portfolio health score (0-100) from holdings."""
-    from ....services.cache import cache_get, cache_set, market_ttl
+    return StandardResponse.ok(await _health_score(current_user["_id"]))
 
-    ck = f"health_score:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
 
-    holdings = await get_user_holdings(current_user["_id"])
+@cache_aside("health_score", ttl=market_ttl)
+async def _health_score(user_id: str) -> dict:
+    holdings = await get_user_holdings(user_id)
     if not holdings:
-        return StandardResponse.ok({"score": 0, "factors": []})
+        return {"score": 0, "factors": []}
 
     prices = await get_prices_for_holdings(holdings) or {}
     equity = [h for h in holdings if h.holding_type != "MF"]
@@ -269,7 +269,7 @@ async def get_health_score(
     # 3. Sector spread
     sectors = set()
     for h in equity:
-        sectors.add(SECTOR_MAP.get(h.symbol, "Others"))
+        sectors.add(get_symbol_master().sector(h.symbol))
     sec_count = len(sectors)
     if sec_count >= 5:
         factors.append({"name": "Sector Spread", "score": 20, "max": 20, "note": f"{sec_count} sectors"})
@@ -322,35 +322,30 @@ async def get_health_score(
 
     grade = "A" if score >= 80 else "B" if score >= 60 else "C" if score >= 40 else "D"
     result = {"score": max(0, score), "grade": grade, "factors": factors}
-    await cache_set(ck, result, ttl=market_ttl())
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.get("/returns", summary="Get returns breakdown", description="Get returns by holding")
 async def get_returns(current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Get returns breakdown with proper CAGR calculation."""
-    from datetime import datetime
+    return StandardResponse.ok(await _returns(current_user["_id"]))
 
-    from ....services.cache import cache_get, cache_set, market_ttl
 
-    ck = f"returns:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
+@cache_aside("returns", ttl=market_ttl)
+async def _returns(user_id: str) -> dict:
+    from datetime import datetime
 
-    holdings = await get_user_holdings(current_user["_id"])
+    holdings = await get_user_holdings(user_id)
     if not holdings:
-        return StandardResponse.ok(
-            {
-                "invested": 0,
-                "current_value": 0,
-                "absolute_return": 0,
-                "absolute_return_pct": 0,
-                "cagr": 0,
-                "holding_period_years": 0,
-                "benchmark_comparison": {"outperformance": 0},
-            }
-        )
+        return {
+            "invested": 0,
+            "current_value": 0,
+            "absolute_return": 0,
+            "absolute_return_pct": 0,
+            "cagr": 0,
+            "holding_period_years": 0,
+            "benchmark_comparison": {"outperformance": 0},
+        }
 
     prices = await get_prices_for_holdings(holdings)
     invested = sum(h.quantity * h.avg_price for h in holdings)
@@ -407,22 +402,20 @@ async def get_returns(current_user: dict = Depends(get_current_user)) -> Standar
             "outperformance": round(cagr - nifty_benchmark, 2),
         },
     }
-    await cache_set(ck, result, ttl=market_ttl())
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.get("/drawdown", summary="Get drawdown analysis", description="Get portfolio drawdown metrics")
 async def get_drawdown(current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Analyze portfolio drawdown."""
-    from ....services.cache import cache_get, cache_set, market_ttl
+    return StandardResponse.ok(await _drawdown(current_user["_id"]))
 
-    ck = f"drawdown:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
-    holdings = await get_user_holdings(current_user["_id"])
+
+@cache_aside("drawdown", ttl=lambda: market_ttl(300, 3600))
+async def _drawdown(user_id: str) -> dict:
+    holdings = await get_user_holdings(user_id)
     if not holdings:
-        return StandardResponse.ok({"portfolio_drawdown": 0, "holdings_in_drawdown": [], "total_holdings_down": 0})
+        return {"portfolio_drawdown": 0, "holdings_in_drawdown": [], "total_holdings_down": 0}
 
     prices = await get_prices_for_holdings(holdings)
     total_invested = sum(h.quantity * h.avg_price for h in holdings)
@@ -461,8 +454,7 @@ async def get_drawdown(current_user: dict = Depends(get_current_user)) -> Standa
         "total_holdings_down": len(holdings_in_drawdown),
         "risk_note": "A 50% loss requires 100% gain to recover. Consider rebalancing if drawdown exceeds 20%.",
     }
-    await cache_set(ck, result, ttl=market_ttl(300, 3600))
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.get("/sector-risk", summary="Get sector risk")
@@ -573,27 +565,25 @@ async def get_signals(current_user: dict = Depends(get_current_user)) -> Standar
 @router.get("/mf-overlap", summary="MF Overlap Analyzer", description="Find overlapping stocks across mutual funds")
 async def get_mf_overlap(current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Analyze stock overlap across mutual fund holdings."""
+    return StandardResponse.ok(await _mf_overlap(current_user["_id"]))
 
+
+@cache_aside("mf_overlap", ttl=600)
+async def _mf_overlap(user_id: str) -> dict:
     import asyncio
 
     from beanie import PydanticObjectId
 
     from ....models.documents import Holding
-    from ....services.cache import cache_get, cache_set
     from ....services.mf import fetch_mf_holdings
 
-    ck = f"mf_overlap:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
-
     holdings = await Holding.find(
-        Holding.user_id == PydanticObjectId(current_user["_id"]),
+        Holding.user_id == PydanticObjectId(user_id),
         Holding.holding_type == "MF",
     ).to_list()
 
     if not holdings:
-        return StandardResponse.ok({"funds": [], "overlaps": [], "matrix": [], "summary": {}})
+        return {"funds": [], "overlaps": [], "matrix": [], "summary": {}}
 
     # Classify fund type from name
     def classify_fund(name: str) -> str:
@@ -795,8 +785,7 @@ async def get_mf_overlap(current_user: dict = Depends(get_current_user)) -> Stan
             ),
         },
     }
-    await cache_set(ck, result, ttl=600)
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.post(
@@ -833,7 +822,7 @@ async def simulate_trade(
             v = h["qty"] * p
             total += v
             vals.append(v)
-            sec = SECTOR_MAP.get(h["symbol"], "Others")
+            sec = get_symbol_master().sector(h["symbol"])
             sectors[sec] = sectors.get(sec, 0) + v
         weights = [v / total for v in vals] if total else []
         hhi = sum(w * w for w in weights) * 10000 if weights else 0
@@ -908,17 +897,16 @@ async def get_insights(
     current_user: dict = Depends(get_current_user),
 ) -> StandardResponse:
     """Generate proactive AI insight cards from portfolio data."""
-    from ....core.config import settings
-    from ....services.cache import cache_get, cache_set
+    return StandardResponse.ok(await _insights(current_user["_id"]))
 
-    ck = f"insights:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
 
-    holdings = await get_user_holdings(current_user["_id"])
+@cache_aside("insights", ttl=1800, empty=lambda r: not r["insights"])
+async def _insights(user_id: str) -> dict:
+    from ....core.config import settings
+
+    holdings = await get_user_holdings(user_id)
     if not holdings:
-        return StandardResponse.ok({"insights": []})
+        return {"insights": []}
 
     equity = [h for h in holdings if h.holding_type != "MF"]
     prices = await get_prices_for_holdings(holdings) or {}
@@ -931,7 +919,7 @@ async def get_insights(
         p = prices.get(h.symbol, {}).get("current_price", h.avg_price)
         v = h.quantity * p
         total_val += v
-        sec = SECTOR_MAP.get(h.symbol, "Others")
+        sec = get_symbol_master().sector(h.symbol)
         sectors[sec] = sectors.get(sec, 0) + v
         pnl_pct = ((p - h.avg_price) / h.avg_price * 100) if h.avg_price else 0
         if pnl_pct < -10:
@@ -946,7 +934,7 @@ async def get_insights(
     losers_str = ", ".join(losers[:5]) if losers else "none"
 
     if not settings.groq_api_key:
-        return StandardResponse.ok({"insights": []})
+        return {"insights": []}
 
     try:
         from groq import Groq
@@ -995,10 +983,9 @@ async def get_insights(
             insights = []
 
         result = {"insights": insights[:4]}
-        await cache_set(ck, result, ttl=1800)
-        return StandardResponse.ok(result)
+        return result
     except Exception as e:
         from ....utils.logger import logger
 
         logger.warning(f"Insights generation failed: {e}")
-        return StandardResponse.ok({"insights": []})
+        return {"insights": []}
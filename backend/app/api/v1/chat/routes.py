@@ -102,7 +102,7 @@ async def build_context(user_id: str) -> str:
     if not holdings:
         return "User has no holdings."
 
-    from ....core.constants import SECTOR_MAP
+    from ....services.symbols import get_symbol_master
     from ....services.market.price_service import get_bulk_prices
 
     symbols = [h.symbol for h in holdings if h.holding_type != "MF"]
@@ -125,7 +125,7 @@ async def build_context(user_id: str) -> str:
         total_invested += invested
         total_current += current
 
-        sec = SECTOR_MAP.get(h.symbol, h.sector or "Others")
+        sec = get_symbol_master().sector(h.symbol, h.sector or "Others")
         sectors[sec] = sectors.get(sec, 0) + current
 
         # First buy date and holding period
@@ -191,13 +191,14 @@ async def build_context(user_id: str) -> str:
 
 
 async def get_stock_fundamentals(symbol: str) -> str:
-    """Fetch stock fundamentals from Screener.in."""
-    from ....services.analytics.service import get_screener_fundamentals
+    """Stock fundamentals from the Screener.in store."""
+    from ....services.fundamentals import get_fundamentals
 
     try:
-        data = await get_screener_fundamentals(symbol.replace("?", "").strip())
-        if not data:
+        record = await get_fundamentals(symbol.replace("?", "").strip().upper())
+        if not record:
             return ""
+        data = {k: v for k, v in record.as_dict().items() if v is not None}
         return (
             f"FUNDAMENTALS for {symbol}:\n"
             f"Price: ₹{data.get('current_price', 'N/A')} | "
@@ -396,26 +397,24 @@ async def get_sentiment(symbol: str) -> str:
 
 
 async def get_sparkline_data(symbol: str) -> list:
-    """Fetch 30-day price data for sparkline chart."""
-    import httpx
+    """30-day closes from the candle store, plus today's last recorded tick while the market is open."""
+    from datetime import datetime
+
+    from ....services.market.candles import get_candles
+    from ....services.market.intraday import intraday_recorder
+    from ....services.market_calendar import IST, market_open
 
     try:
-        async with httpx.AsyncClient(timeout=8) as c:
-            resp = await c.get(
-                f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.NS?interval=1d&range=1mo",
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
-            if resp.status_code == 200:
-                result = resp.json()["chart"]["result"][0]
-                closes = result["indicators"]["quote"][0]["close"]
-                timestamps = result["timestamp"]
-                from datetime import datetime
-
-                return [
-                    {"date": datetime.fromtimestamp(t).strftime("%m/%d"), "price": round(c, 2)}
-                    for t, c in zip(timestamps, closes)
-                    if c is not None
-                ]
+        points = [
+            {"date": f"{c['date'][5:7]}/{c['date'][8:10]}", "price": round(c["close"], 2)}
+            for c in await get_candles(symbol, days=31)
+            if c["close"] is not None
+        ]
+        if market_open():
+            last = await intraday_recorder.last_price(symbol)
+            if last:
+                points.append({"date": datetime.now(IST).strftime("%m/%d"), "price": round(last, 2)})
+        return points
     except Exception:
         pass
     return []
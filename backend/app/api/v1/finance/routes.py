@@ -6,6 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from ....core.response_handler import StandardResponse
 from ....core.security import get_current_user
 from ....models.documents import SIP, Goal, Holding
+from ....services.cache import market_ttl
+from ....services.cache_aside import cache_aside
 from ....services.portfolio import get_prices_for_holdings, get_user_holdings
 from .schemas import (
     GoalCreate,
@@ -117,7 +119,8 @@ async def get_sips(current_user: dict = Depends(get_current_user)) -> StandardRe
     # Fetch prices in parallel
     import asyncio
 
-    mf_nav_task = get_bulk_mf_nav(mf_symbols) if mf_symbols else asyncio.coroutine(lambda: {})()
+    mf_names = {sym: holdings_map[sym].name for sym in mf_symbols}
+    mf_nav_task = get_bulk_mf_nav(mf_symbols, mf_names) if mf_symbols else asyncio.coroutine(lambda: {})()
     stock_prices_task = get_bulk_prices(stock_symbols) if stock_symbols else asyncio.coroutine(lambda: {})()
     mf_navs, stock_prices = await asyncio.gather(mf_nav_task, stock_prices_task)
 
@@ -260,18 +263,16 @@ async def get_goal_projections(current_user: dict = Depends(get_current_user)) -
 )
 async def get_tax_harvest(current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Get tax loss harvesting opportunities."""
-    from datetime import datetime, timedelta
+    return StandardResponse.ok(await _tax_harvest(current_user["_id"]))
 
-    from ....services.cache import cache_get, cache_set
 
-    cache_key = f"tax_harvest:{current_user['_id']}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return StandardResponse.ok(cached)
+@cache_aside("tax_harvest", ttl=300)
+async def _tax_harvest(user_id: str) -> dict:
+    from datetime import datetime, timedelta
 
-    holdings = await get_user_holdings(current_user["_id"])
+    holdings = await get_user_holdings(user_id)
     if not holdings:
-        return StandardResponse.ok({"losses": [], "gains": [], "stcg": {}, "ltcg": {}, "note": ""})
+        return {"losses": [], "gains": [], "stcg": {}, "ltcg": {}, "note": ""}
 
     prices = await get_prices_for_holdings(holdings) or {}
     losses = []
@@ -353,8 +354,7 @@ async def get_tax_harvest(current_user: dict = Depends(get_current_user)) -> Sta
             "Avoid wash sale - wait 30 days before rebuying."
         ),
     }
-    await cache_set(cache_key, result, ttl=300)
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.get("/tax", summary="Get tax summary")
@@ -367,17 +367,11 @@ async def get_tax_summary(current_user: dict = Depends(get_current_user)) -> Sta
 
 @router.get("/dividends", summary="Get dividends", description="List dividend income from holdings")
 async def get_dividends(current_user: dict = Depends(get_current_user)) -> StandardResponse:
-    """Get dividend income based on holdings and Yahoo dividend data."""
+    """Get dividend income from the corporate actions store joined with holdings."""
     from datetime import datetime
 
-    import httpx
-
-    from ....services.cache import cache_get, cache_set
-
-    cache_key = f"dividends:{current_user['_id']}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return StandardResponse.ok(cached)
+    from ....services.market.corporate_actions import find_corporate_actions
+    from ....services.market_calendar import IST
 
     holdings = await Holding.find(Holding.user_id == PydanticObjectId(current_user["_id"])).to_list()
     if not holdings:
@@ -388,38 +382,27 @@ async def get_dividends(current_user: dict = Depends(get_current_user)) -> Stand
     upcoming_dividends = []
     past_income = 0
     upcoming_income = 0
-    now = datetime.now()
+    today = datetime.now(IST).strftime("%Y-%m-%d")
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        for symbol, holding in list(holdings_map.items())[:10]:
-            try:
-                resp = await client.get(
-                    f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.NS?interval=1d&range=1y&events=div",
-                    headers={"User-Agent": "Mozilla/5.0"},
-                )
-                if resp.status_code == 200:
-                    events = resp.json().get("chart", {}).get("result", [{}])[0].get("events", {})
-                    for ts, div in events.get("dividends", {}).items():
-                        div_date = datetime.fromtimestamp(int(ts))
-                        amount = div.get("amount", 0)
-                        income = amount * holding.quantity
-                        dividend = {
-                            "symbol": symbol,
-                            "date": div_date.strftime("%Y-%m-%d"),
-                            "value": amount,
-                            "quantity": holding.quantity,
-                            "expected_income": round(income, 2),
-                        }
-                        if div_date > now:
-                            upcoming_dividends.append(dividend)
-                            upcoming_income += income
-                        else:
-                            past_dividends.append(dividend)
-                            past_income += income
-            except Exception:
-                pass
+    for action in await find_corporate_actions(list(holdings_map)):
+        if action["action_type"] != "DIVIDEND":
+            continue
+        holding = holdings_map[action["symbol"]]
+        income = action["value"] * holding.quantity
+        dividend = {
+            "symbol": action["symbol"],
+            "date": action["ex_date"],
+            "value": action["value"],
+            "quantity": holding.quantity,
+            "expected_income": round(income, 2),
+        }
+        if action["ex_date"] > today:
+            upcoming_dividends.append(dividend)
+            upcoming_income += income
+        else:
+            past_dividends.append(dividend)
+            past_income += income
 
-    past_dividends.sort(key=lambda x: x["date"], reverse=True)
     upcoming_dividends.sort(key=lambda x: x["date"])
 
     result = {
@@ -429,7 +412,6 @@ async def get_dividends(current_user: dict = Depends(get_current_user)) -> Stand
         "expected_income": round(upcoming_income, 2),
         "past_income": round(past_income, 2),
     }
-    await cache_set(cache_key, result, ttl=300)
     return StandardResponse.ok(result)
 
 
@@ -466,7 +448,7 @@ async def add_asset(
     current_user: dict = Depends(get_current_user),
 ) -> StandardResponse:
     from ....models.documents import Asset
-    from ....services.cache import cache_delete
+    from ....services.cache import bump_data_version
 
     asset = Asset(
         user_id=PydanticObjectId(current_user["_id"]),
@@ -479,7 +461,7 @@ async def add_asset(
         notes=data.get("notes"),
     )
     await asset.insert()
-    await cache_delete(f"networth:{current_user['_id']}")
+    await bump_data_version(current_user["_id"])
     return StandardResponse.ok({"id": str(asset.id)}, "Asset added")
 
 
@@ -490,7 +472,7 @@ async def update_asset(
     current_user: dict = Depends(get_current_user),
 ) -> StandardResponse:
     from ....models.documents import Asset
-    from ....services.cache import cache_delete
+    from ....services.cache import bump_data_version
 
     asset = await Asset.find_one(
         Asset.id == PydanticObjectId(asset_id),
@@ -510,7 +492,7 @@ async def update_asset(
         if field in data:
             setattr(asset, field, data[field])
     await asset.save()
-    await cache_delete(f"networth:{current_user['_id']}")
+    await bump_data_version(current_user["_id"])
     return StandardResponse.ok(message="Asset updated")
 
 
@@ -520,7 +502,7 @@ async def delete_asset(
     current_user: dict = Depends(get_current_user),
 ) -> StandardResponse:
     from ....models.documents import Asset
-    from ....services.cache import cache_delete
+    from ....services.cache import bump_data_version
 
     asset = await Asset.find_one(
         Asset.id == PydanticObjectId(asset_id),
@@ -529,22 +511,21 @@ async def delete_asset(
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     await asset.delete()
-    await cache_delete(f"networth:{current_user['_id']}")
+    await bump_data_version(current_user["_id"])
     return StandardResponse.ok(message="Asset deleted")
 
 
 @router.get("/networth", summary="Get networth", description="Get total networth breakdown")
 async def get_networth(current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Get total networth breakdown."""
-    from ....models.documents import Asset
-    from ....services.cache import cache_get, cache_set, market_ttl
+    return StandardResponse.ok(await _networth(current_user["_id"]))
 
-    ck = f"networth:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
 
-    holdings = await get_user_holdings(current_user["_id"])
+@cache_aside("networth", ttl=lambda: market_ttl(300, 3600))
+async def _networth(user_id: str) -> dict:
+    from ....models.documents import Asset
+
+    holdings = await get_user_holdings(user_id)
     prices = (await get_prices_for_holdings(holdings) if holdings else {}) or {}
 
     equity = mf = 0
@@ -557,7 +538,7 @@ async def get_networth(current_user: dict = Depends(get_current_user)) -> Standa
             equity += value
 
     # Get other assets
-    assets = await Asset.find(Asset.user_id == PydanticObjectId(current_user["_id"])).to_list()
+    assets = await Asset.find(Asset.user_id == PydanticObjectId(user_id)).to_list()
 
     assets_by_category = {}
     for asset in assets:
@@ -577,29 +558,27 @@ async def get_networth(current_user: dict = Depends(get_current_user)) -> Standa
         "allocation": allocation,
         "assets": [{"name": a.name, "category": a.category, "value": a.value, "id": str(a.id)} for a in assets],
     }
-    await cache_set(ck, result, ttl=market_ttl(300, 3600))
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.get("/networth/history", summary="Get networth history")
 async def get_networth_history(year: int, current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Get monthly networth history for a year."""
+    return StandardResponse.ok(await _networth_history(current_user["_id"], year))
+
+
+@cache_aside("networth_hist", ttl=600)
+async def _networth_history(user_id: str, year: int) -> dict:
     from datetime import datetime
 
     from ....models.documents import NetworthHistory
-    from ....services.cache import cache_get, cache_set
-
-    ck = f"networth_hist:{current_user['_id']}:{year}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
 
     start = datetime(year, 1, 1)
     end = datetime(year, 12, 31, 23, 59, 59)
 
     history = (
         await NetworthHistory.find(
-            NetworthHistory.user_id == PydanticObjectId(current_user["_id"]),
+            NetworthHistory.user_id == PydanticObjectId(user_id),
             NetworthHistory.date >= start,
             NetworthHistory.date <= end,
         )
@@ -610,7 +589,7 @@ async def get_networth_history(year: int, current_user: dict = Depends(get_curre
     # Get last snapshot of previous year's December for Jan comparison
     prev_dec = (
         await NetworthHistory.find(
-            NetworthHistory.user_id == PydanticObjectId(current_user["_id"]),
+            NetworthHistory.user_id == PydanticObjectId(user_id),
             NetworthHistory.date >= datetime(year - 1, 12, 1),
             NetworthHistory.date <= datetime(year - 1, 12, 31, 23, 59, 59),
         )
@@ -683,8 +662,7 @@ async def get_networth_history(year: int, current_user: dict = Depends(get_curre
             "good_growth": annualized >= 15,
         },
     }
-    await cache_set(ck, result, ttl=600)
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.post("/networth/snapshot", summary="Take networth snapshot")
@@ -693,6 +671,7 @@ async def take_networth_snapshot(current_user: dict = Depends(get_current_user))
     from datetime import datetime
 
     from ....models.documents import Asset, NetworthHistory
+    from ....services.cache import bump_data_version
 
     holdings = await get_user_holdings(current_user["_id"])
     prices = (await get_prices_for_holdings(holdings) if holdings else {}) or {}
@@ -717,6 +696,7 @@ async def take_networth_snapshot(current_user: dict = Depends(get_current_user))
         user_id=PydanticObjectId(current_user["_id"]), date=datetime.now(), value=total, breakdown=breakdown
     )
     await snapshot.insert()
+    await bump_data_version(current_user["_id"])
 
     return StandardResponse.ok({"message": "Snapshot saved", "total": round(total, 2)})
 
@@ -729,6 +709,7 @@ async def import_networth_history(
     from datetime import datetime
 
     from ....models.documents import NetworthHistory
+    from ....services.cache import bump_data_version
 
     imported = 0
     for snap in data.snapshots:
@@ -750,6 +731,7 @@ async def import_networth_history(
             await history.insert()
         imported += 1
 
+    await bump_data_version(current_user["_id"])
     return StandardResponse.ok({"message": f"Imported {imported} snapshots"})
 
 
@@ -100,27 +100,17 @@ async def get_ipos_from_db() -> StandardResponse:
 @router.get("/upcoming", summary="Get upcoming IPOs", description="List upcoming and open IPOs")
 async def get_upcoming_ipos() -> StandardResponse:
     """Get upcoming IPOs."""
-    from ....services.cache import cache_get, cache_set
+    from ....services.cache_aside import cached
 
-    cached = await cache_get("ipo:upcoming")
-    if cached:
-        return StandardResponse.ok(cached)
-    result = await get_ipos_from_db()
-    await cache_set("ipo:upcoming", result, ttl=3600)
-    return StandardResponse.ok(result)
+    return StandardResponse.ok(await cached("ipo:upcoming", get_ipos_from_db, ttl=3600))
 
 
 @router.get("/gmp", summary="Get GMP tracker", description="Get IPO grey market premium data")
 async def get_gmp_tracker() -> StandardResponse:
     """Get IPO GMP data."""
-    from ....services.cache import cache_get, cache_set
-
-    cached = await cache_get("ipo:gmp")
-    if cached:
-        return StandardResponse.ok(cached)
-    result = await get_ipos_from_db()
-    await cache_set("ipo:gmp", result, ttl=3600)
-    return StandardResponse.ok(result)
+    from ....services.cache_aside import cached
+
+    return StandardResponse.ok(await cached("ipo:gmp", get_ipos_from_db, ttl=3600))
 
 
 @router.post("/refresh", summary="Refresh IPO data", description="Manually refresh IPO data from sources")
@@ -1,18 +1,27 @@
 """Market routes - quotes, search, indices, research, screener, compare, corporate actions."""
 
+import asyncio
 import re
 from datetime import datetime
 
 import httpx
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ....core.response_handler import StandardResponse
 from ....core.security import get_current_user
 from ....middleware.rate_limit import rate_limit
 from ....models.documents import Holding
 from ....services.analytics.service import get_combined_analysis
-from ....services.market.price_service import get_bulk_prices, get_stock_price, search_stock
+from ....services.fundamentals import get_fundamentals_bulk
+from ....services.market import screener
+from ....services.market.candles import PERIOD_DAYS, bar_time, get_candles, with_live_bar
+from ....services.market.corporate_actions import describe_action, find_corporate_actions
+from ....services.market.intraday import BAR_INTERVALS, intraday_recorder
+from ....services.market.price_service import get_bulk_prices, get_stock_price, is_market_open, search_stock
+from ....services.market.rolling_stats import get_rolling_stats
+from ....services.market_calendar import IST
+from ....services.symbols import SearchIndex
 from ....utils.logger import logger
 
 router = APIRouter()
@@ -54,12 +63,13 @@ async def search(q: str) -> StandardResponse:
 @router.get("/indices", summary="Get market indices", description="Get NIFTY, SENSEX, BANKNIFTY prices")
 async def get_indices() -> StandardResponse:
     """Get major market indices prices."""
-    from ....services.cache import cache_get, cache_set, market_ttl
+    from ....services.cache import market_ttl
+    from ....services.cache_aside import cached
 
-    cached = await cache_get("market:indices")
-    if cached:
-        return StandardResponse.ok(cached)
+    return StandardResponse.ok(await cached("market:indices", _load_indices, ttl=lambda: market_ttl(60, None)))
 
+
+async def _load_indices() -> dict:
     indices = {"NIFTY50": "^NSEI", "SENSEX": "^BSESN", "BANKNIFTY": "^NSEBANK"}
     result: dict = {}
     async with httpx.AsyncClient(timeout=10) as client:
@@ -79,8 +89,7 @@ async def get_indices() -> StandardResponse:
                     }
             except (httpx.HTTPError, KeyError, ValueError):
                 pass
-    await cache_set("market:indices", result, ttl=market_ttl(60, 3600))
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.get("/quotes", summary="Get bulk quotes", description="Get prices for multiple stocks")
@@ -100,11 +109,13 @@ async def get_bulk_quotes(symbols: str) -> StandardResponse:
 async def search_my_symbols(q: str = "", current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Search symbols from user's portfolio holdings."""
     holdings = await Holding.find(Holding.user_id == PydanticObjectId(current_user["_id"])).to_list()
-    results = [{"symbol": h.symbol, "name": h.name, "type": h.holding_type} for h in holdings]
-    if q:
-        q = q.upper()
-        results = [r for r in results if q in r["symbol"] or q in r["name"].upper()]
-    return StandardResponse.ok(results[:10])
+    if not q:
+        return StandardResponse.ok(
+            [{"symbol": h.symbol, "name": h.name, "type": h.holding_type} for h in holdings[:10]]
+        )
+    index = SearchIndex((h.symbol, h.name, h.exchange, h.holding_type) for h in holdings)
+    results = [{"symbol": r["symbol"], "name": r["name"], "type": r["payload"]} for r in index.search(q)]
+    return StandardResponse.ok(results)
 
 
 @router.get("/research/{symbol}", summary="Get stock research", description="Get detailed analysis for a stock")
@@ -131,6 +142,21 @@ async def get_stock_news(symbol: str) -> StandardResponse:
 @router.get("/research/{symbol}/chart", summary="Get chart data", description="Get OHLCV candle data for charts")
 async def get_chart_data(symbol: str, range: str = "6mo", interval: str = "1d") -> StandardResponse:
     """Get OHLCV chart data for a stock."""
+    symbol = _sanitize_symbol(symbol)
+    if interval == "1d" and range in PERIOD_DAYS:
+        stored = await get_candles(symbol, days=PERIOD_DAYS[range])
+        if is_market_open():  # Stored bars end at the last close; add today's bar from the live quote
+            stored = with_live_bar(stored, await get_stock_price(symbol))
+        candles = [
+            {"time": bar_time(c["date"]), **{k: c[k] for k in ("open", "high", "low", "close", "volume")}}
+            for c in stored
+            if c["open"] and c["close"]
+        ]
+        return StandardResponse.ok({"symbol": symbol, "candles": candles})
+    if range == "1d" and interval in BAR_INTERVALS:
+        candles = await intraday_recorder.bars(symbol, BAR_INTERVALS[interval], full_session=True)
+        if candles:
+            return StandardResponse.ok({"symbol": symbol, "candles": candles})
     try:
         async with httpx.AsyncClient(timeout=10) as client:
             resp = await client.get(
@@ -177,89 +203,41 @@ async def get_52week_highs_lows() -> StandardResponse:
     """Get stocks near 52-week high or low."""
     symbols = ["RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK"]
     result: dict = {"near_high": [], "near_low": []}
-    async with httpx.AsyncClient(timeout=10) as client:
-        for symbol in symbols:
-            try:
-                resp = await client.get(
-                    f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.NS?interval=1d&range=1y",
-                    headers={"User-Agent": "Mozilla/5.0"},
-                )
-                if resp.status_code == 200:
-                    data = resp.json()["chart"]["result"][0]
-                    highs = [h for h in data["indicators"]["quote"][0]["high"] if h]
-                    lows = [low for low in data["indicators"]["quote"][0]["low"] if low]
-                    current = data["meta"].get("regularMarketPrice", 0)
-                    if highs and current >= max(highs) * 0.95:
-                        result["near_high"].append({"symbol": symbol, "price": current, "high_52w": max(highs)})
-                    if lows and current <= min(lows) * 1.05:
-                        result["near_low"].append({"symbol": symbol, "price": current, "low_52w": min(lows)})
-            except (httpx.HTTPError, KeyError, ValueError):
-                pass
+    stats, prices = await asyncio.gather(get_rolling_stats(symbols), get_bulk_prices(symbols))
+    for symbol in symbols:
+        high, low = stats.get(symbol, {}).get("high_52w"), stats.get(symbol, {}).get("low_52w")
+        current = prices.get(symbol, {}).get("current_price", 0)
+        if not current:
+            continue
+        if high and current >= high * 0.95:
+            result["near_high"].append({"symbol": symbol, "price": current, "high_52w": high})
+        if low and current <= low * 1.05:
+            result["near_low"].append({"symbol": symbol, "price": current, "low_52w": low})
     return StandardResponse.ok(result)
 
 
 @router.get("/compare", summary="Compare stocks", description="Compare multiple stocks side by side")
 async def compare_stocks(symbols: str) -> StandardResponse:
     """Compare multiple stocks side by side with fundamentals."""
-    import asyncio
-
-    from ....services.analytics.service import get_screener_fundamentals
-    from ....services.cache import cache_get, cache_set
-
     symbol_list = [s.strip().upper() for s in symbols.split(",")][:5]
 
-    # Check cache for each symbol's fundamentals
-    async def get_cached_fundamentals(s):
-        ck = f"screener_fund:{s}"
-        cached = await cache_get(ck)
-        if cached:
-            return cached
-        try:
-            fund = await get_screener_fundamentals(s)
-            if fund:
-                await cache_set(ck, fund, ttl=3600)  # 1hr cache
-            return fund or {}
-        except Exception:
-            return {}
-
-    # Fetch prices and fundamentals in parallel
-    prices = await get_bulk_prices(symbol_list)
-    fundamentals_list = await asyncio.gather(*[get_cached_fundamentals(s) for s in symbol_list])
-
-    def parse_num(val):
-        if not val:
-            return None
-        try:
-            return float(str(val).replace(",", "").replace("%", ""))
-        except (ValueError, AttributeError):
-            return None
+    # Fetch prices and stored fundamentals in parallel
+    prices, fundamentals = await asyncio.gather(get_bulk_prices(symbol_list), get_fundamentals_bulk(symbol_list))
 
     stocks = []
-    for i, s in enumerate(symbol_list):
+    for s in symbol_list:
         price_data = prices.get(s, {})
-        fund_data = fundamentals_list[i]
+        fund = fundamentals[s].as_dict() if s in fundamentals else {}
 
         stocks.append(
             {
                 "symbol": s,
-                "name": price_data.get("name") or fund_data.get("company_name") or s,
+                "name": price_data.get("name") or fund.get("company_name") or s,
                 "price": price_data.get("current_price"),
-                "market_cap": fund_data.get("market_cap"),
-                "pe": parse_num(fund_data.get("stock_p/e")),
-                "pb": parse_num(fund_data.get("price_to_book_value")),
-                "roe": parse_num(fund_data.get("roe")),
-                "roce": parse_num(fund_data.get("roce")),
-                "dividend_yield": parse_num(fund_data.get("dividend_yield")),
-                "high_52w": (
-                    fund_data.get("high_/_low", "").split(" / ")[0].strip()
-                    if " / " in fund_data.get("high_/_low", "")
-                    else fund_data.get("high_/_low")
-                ),
-                "low_52w": (
-                    fund_data.get("high_/_low", "").split(" / ")[-1].strip()
-                    if " / " in fund_data.get("high_/_low", "")
-                    else None
-                ),
+                **{
+                    k: fund.get(k)
+                    for k in ("market_cap", "pe", "pb", "roe", "roce", "dividend_yield", "high_52w", "low_52w")
+                },
             }
         )
 
@@ -289,48 +267,32 @@ async def get_corporate_actions(current_user: dict = Depends(get_current_user))
     if not holdings:
         return StandardResponse.ok({"actions": [], "upcoming": []})
 
-    symbols = [h.symbol for h in holdings if h.holding_type != "MF"][:10]
-    actions: list = []
-    upcoming: list = []
-
-    async with httpx.AsyncClient(timeout=10) as client:
-        for symbol in symbols:
-            try:
-                resp = await client.get(
-                    f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.NS?interval=1d&range=1y&events=div",
-                    headers={"User-Agent": "Mozilla/5.0"},
-                )
-                if resp.status_code == 200:
-                    events = resp.json().get("chart", {}).get("result", [{}])[0].get("events", {})
-                    for ts, div in events.get("dividends", {}).items():
-                        amount = div.get("amount", 0)
-                        action = {
-                            "type": "DIVIDEND",
-                            "symbol": symbol,
-                            "date": datetime.fromtimestamp(int(ts)).strftime("%Y-%m-%d"),
-                            "value": amount,
-                            "description": f"₹{amount} per share dividend",
-                        }
-                        actions.append(action)
-                        if datetime.fromtimestamp(int(ts)) > datetime.now():
-                            upcoming.append(action)
-            except (httpx.HTTPError, KeyError, ValueError):
-                pass
-
-    return StandardResponse.ok(
-        {"actions": sorted(actions, key=lambda x: x["date"], reverse=True)[:20], "upcoming": upcoming}
-    )
+    symbols = [h.symbol for h in holdings if h.holding_type != "MF"]
+    today = datetime.now(IST).strftime("%Y-%m-%d")
+    actions = [
+        {
+            "type": a["action_type"],
+            "symbol": a["symbol"],
+            "date": a["ex_date"],
+            "value": a["value"],
+            "description": describe_action(a),
+        }
+        for a in await find_corporate_actions(symbols)
+    ]
+    upcoming = sorted((a for a in actions if a["date"] > today), key=lambda x: x["date"])
+    return StandardResponse.ok({"actions": actions[:20], "upcoming": upcoming})
 
 
 @router.get("/market-summary", summary="Get market summary", description="Get top movers and market overview")
 async def get_market_summary() -> StandardResponse:
     """Get market summary with top movers."""
-    from ....services.cache import cache_get, cache_set, market_ttl
+    from ....services.cache import market_ttl
+    from ....services.cache_aside import cached
+
+    return StandardResponse.ok(await cached("market:summary", _load_market_summary, ttl=lambda: market_ttl(60, None)))
 
-    cached = await cache_get("market:summary")
-    if cached:
-        return StandardResponse.ok(cached)
 
+async def _load_market_summary() -> dict:
     symbols = ["RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK", "KOTAKBANK", "SBIN", "BHARTIARTL", "ITC", "LT"]
     prices = await get_bulk_prices(symbols)
     movers = sorted(
@@ -342,20 +304,27 @@ async def get_market_summary() -> StandardResponse:
         key=lambda x: abs(x["change_pct"]),
         reverse=True,
     )
-    result = {"top_movers": movers[:10]}
-    await cache_set("market:summary", result, ttl=market_ttl(60, 3600))
-    return StandardResponse.ok(result)
+    return {"top_movers": movers[:10]}
 
 
 @router.get("/fii-dii", summary="Get FII/DII data", description="Get FII and DII activity data")
 async def get_fii_dii() -> StandardResponse:
     """Get FII/DII activity data."""
-    from ....services.cache import cache_get, cache_set
+    from ....services.cache_aside import cached
+
+    result = await cached("market:fii_dii", _load_fii_dii, ttl=1800)
+    return StandardResponse.ok(
+        result
+        or {
+            "fii": {"buy": 0, "sell": 0, "net": 0},
+            "dii": {"buy": 0, "sell": 0, "net": 0},
+            "note": "FII/DII data temporarily unavailable",
+        }
+    )
 
-    cached = await cache_get("market:fii_dii")
-    if cached:
-        return StandardResponse.ok(cached)
 
+async def _load_fii_dii() -> dict | None:
+    """Today's FII/DII row from Moneycontrol; None when unavailable (negative-cached briefly)."""
     try:
         async with httpx.AsyncClient(timeout=15) as client:
             resp = await client.get(
@@ -391,17 +360,10 @@ async def get_fii_dii() -> StandardResponse:
                                     "net": parse_val(cells[6].text),
                                 },
                             }
-                            await cache_set("market:fii_dii", result, ttl=1800)
-                            return StandardResponse.ok(result)
+                            return result
     except Exception as e:
         logger.warning(f"FII/DII fetch error: {e}")
-    return StandardResponse.ok(
-        {
-            "fii": {"buy": 0, "sell": 0, "net": 0},
-            "dii": {"buy": 0, "sell": 0, "net": 0},
-            "note": "FII/DII data temporarily unavailable",
-        }
-    )
+    return None
 
 
 @router.get("/screener/screens", summary="Get screener screens", description="Get predefined stock screens")
@@ -418,22 +380,12 @@ async def get_screener_screens() -> StandardResponse:
 
 
 @router.get("/screener/run/{screen_id}", summary="Run screener", description="Run a predefined screen")
-async def run_screener(screen_id: str) -> StandardResponse:
-    """Run a predefined screen."""
-    symbols = ["RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK", "KOTAKBANK", "SBIN", "BHARTIARTL", "ITC", "LT"]
-    prices = await get_bulk_prices(symbols)
-
-    results = [
-        {"symbol": s, "price": p.get("price", 0), "change_pct": p.get("day_change_pct", 0)}
-        for s, p in prices.items()
-        if p
-    ]
-
-    if screen_id == "gainers":
-        results = sorted(results, key=lambda x: x["change_pct"], reverse=True)[:10]
-    elif screen_id == "losers":
-        results = sorted(results, key=lambda x: x["change_pct"])[:10]
-
+async def run_screener(screen_id: str, limit: int = Query(10, ge=1, le=100)) -> StandardResponse:
+    """Run a predefined screen over the symbol universe."""
+    screen = screener.SCREENS.get(screen_id)
+    if not screen:
+        raise HTTPException(status_code=404, detail=f"Unknown screen: {screen_id}")
+    results = await screener.run_screen(screen.filters, screen.sort_by, screen.descending, limit)
     return StandardResponse.ok({"results": results})
 
 
@@ -444,13 +396,26 @@ async def custom_screener(
     roe_min: float = None,
     dividend_yield_min: float = None,
     market_cap_min: float = None,
+    filters: str = "",
+    sort_by: str = "market_cap",
+    order: str = "desc",
+    limit: int = Query(50, ge=1, le=200),
 ) -> StandardResponse:
-    """Run custom screen."""
-    symbols = ["RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK"]
-    prices = await get_bulk_prices(symbols)
-    results = [
-        {"symbol": s, "price": p.get("price", 0), "change_pct": p.get("day_change_pct", 0)}
-        for s, p in prices.items()
-        if p
-    ]
+    """Run a custom screen: named bounds plus ``filters`` expressions like ``roce>=20,debt_equity<0.5``."""
+    try:
+        screen_filters = screener.parse_filters(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if sort_by not in screener.COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown screener column: {sort_by}")
+    for column, op, value in (
+        ("pe", "<=", pe_max),
+        ("pb", "<=", pb_max),
+        ("roe", ">=", roe_min),
+        ("dividend_yield", ">=", dividend_yield_min),
+        ("market_cap", ">=", market_cap_min),
+    ):
+        if value is not None:
+            screen_filters.append(screener.Filter(column, op, value))
+    results = await screener.run_screen(screen_filters, sort_by, order != "asc", limit)
     return StandardResponse.ok({"results": results})
@@ -6,13 +6,14 @@ import io
 from beanie import PydanticObjectId
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 
-from ....core.constants import SECTOR_MAP
 from ....core.response_handler import StandardResponse
 from ....core.security import get_current_user
 from ....models.documents import Holding
 from ....models.documents.holding import EmbeddedTransaction
-from ....services.cache import cache_delete
-from ....services.portfolio import get_prices_for_holdings, get_user_holdings
+from ....services.cache import bump_data_version
+from ....services.cache_aside import cache_aside
+from ....services.mf import normalize_scheme_name, resolve_schemes
+from ....services.portfolio import get_dashboard_data, get_prices_for_holdings, get_user_holdings
 from ....services.portfolio.portfolio_service import PortfolioService
 from .schemas import (
     HoldingCreate,
@@ -25,9 +26,8 @@ router = APIRouter()
 
 
 async def _invalidate_portfolio_cache(user_id: str) -> None:
-    """Clear all portfolio-related cache keys for a user."""
-    for prefix in ("holdings", "sectors", "dashboard", "analytics"):
-        await cache_delete(f"{prefix}:{user_id}")
+    """Invalidate every derived cache key for a user (holdings, dashboard, analytics, ...)."""
+    await bump_data_version(user_id)
 
 
 @router.get("", summary="Get portfolio summary")
@@ -98,147 +98,7 @@ async def get_sector_allocation(current_user: dict = Depends(get_current_user))
 )
 async def get_dashboard(current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Get complete dashboard with holdings, sectors, and recent transactions."""
-    from ....services.cache import cache_get, cache_set
-
-    cache_key = f"dashboard:{current_user['_id']}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return StandardResponse.ok(cached)
-
-    holdings = await get_user_holdings(current_user["_id"])
-    if not holdings:
-        return StandardResponse.ok(
-            {
-                "holdings": [],
-                "sectors": [],
-                "xirr": None,
-                "transactions": [],
-                "summary": {"invested": 0, "current": 0, "pnl": 0, "pnl_pct": 0},
-            }
-        )
-
-    prices = await get_prices_for_holdings(holdings) or {}
-    holdings_list: list = []
-    txns: list = []
-    total_inv = total_val = 0.0
-    sector_values: dict[str, float] = {}
-
-    for h in holdings:
-        p = prices.get(h.symbol, {})
-        curr_price = p.get("current_price") or h.current_price or h.avg_price
-        inv = h.quantity * h.avg_price
-        val = h.quantity * curr_price
-        total_inv += inv
-        total_val += val
-        sector = SECTOR_MAP.get(h.symbol, "Others") if h.holding_type != "MF" else h.name
-        sector_values[sector] = sector_values.get(sector, 0) + val
-
-        holdings_list.append(
-            {
-                "_id": str(h.id),
-                "symbol": h.symbol,
-                "name": h.name,
-                "holding_type": h.holding_type,
-                "quantity": h.quantity,
-                "avg_price": h.avg_price,
-                "current_price": round(curr_price, 2),
-                "day_change_pct": p.get("day_change_pct", 0),
-                "current_value": round(val, 2),
-                "total_investment": round(inv, 2),
-                "pnl": round(val - inv, 2),
-                "pnl_pct": round(((val - inv) / inv * 100) if inv > 0 else 0, 2),
-                "sector": sector,
-            }
-        )
-        for i, t in enumerate(h.transactions):
-            txns.append({"symbol": h.symbol, "holding_id": str(h.id), "index": i, **t.model_dump()})
-
-    txns.sort(key=lambda x: x.get("date", ""), reverse=True)
-    sectors = [
-        {"sector": s, "value": round(v, 2), "percentage": round(v / total_val * 100, 1) if total_val > 0 else 0}
-        for s, v in sorted(sector_values.items(), key=lambda x: x[1], reverse=True)
-    ]
-
-    result = {
-        "holdings": holdings_list,
-        "sectors": sectors,
-        "xirr": _calc_xirr(holdings, total_val),
-        "xirr_stocks": _calc_xirr(
-            [h for h in holdings if h.holding_type != "MF"],
-            sum(hl["current_value"] for hl in holdings_list if hl["holding_type"] != "MF"),
-        ),
-        "xirr_mf": _calc_xirr(
-            [h for h in holdings if h.holding_type == "MF"],
-            sum(hl["current_value"] for hl in holdings_list if hl["holding_type"] == "MF"),
-        ),
-        "transactions": txns[:50],
-        "summary": {
-            "invested": round(total_inv, 2),
-            "current": round(total_val, 2),
-            "pnl": round(total_val - total_inv, 2),
-            "pnl_pct": round(((total_val - total_inv) / total_inv * 100) if total_inv > 0 else 0, 2),
-        },
-    }
-    await cache_set(cache_key, result, ttl=120 if _market_open() else 3600)
-    return StandardResponse.ok(result)
-
-
-def _market_open() -> bool:
-    from ....services.cache import market_open
-
-    return market_open()
-
-
-def _calc_xirr(holdings, current_value):
-    """Calculate XIRR from transaction history using Newton's method."""
-    from datetime import datetime
-
-    cashflows = []  # (date, amount) — negative for outflows, positive for inflows
-    for h in holdings:
-        for t in h.transactions:
-            try:
-                dt = datetime.strptime(t.date, "%Y-%m-%d")
-                amt = t.quantity * t.price
-                cashflows.append((dt, -amt if t.type == "BUY" else amt))
-            except (ValueError, TypeError):
-                continue
-
-    if not cashflows:
-        return None
-
-    # Add current portfolio value as final inflow
-    cashflows.append((datetime.now(), current_value))
-    cashflows.sort(key=lambda x: x[0])
-
-    if len(cashflows) < 2:
-        return None
-
-    # Newton's method for XIRR
-    d0 = cashflows[0][0]
-    days = [(cf[0] - d0).days / 365.0 for cf in cashflows]
-    amounts = [cf[1] for cf in cashflows]
-
-    def npv(rate):
-        return sum(a / (1 + rate) ** d for a, d in zip(amounts, days))
-
-    def dnpv(rate):
-        return sum(-d * a / (1 + rate) ** (d + 1) for a, d in zip(amounts, days))
-
-    rate = 0.1  # initial guess 10%
-    for _ in range(100):
-        n = npv(rate)
-        dn = dnpv(rate)
-        if abs(dn) < 1e-12:
-            break
-        new_rate = rate - n / dn
-        if abs(new_rate - rate) < 1e-7:
-            rate = new_rate
-            break
-        rate = new_rate
-        if rate < -0.99 or rate > 10:
-            return None
-
-    return round(rate * 100, 2) if -1 < rate < 10 else None
+    return StandardResponse.ok(await get_dashboard_data(current_user["_id"]))
 
 
 @router.get("/transactions", summary="Get transactions")
@@ -333,6 +193,8 @@ async def import_holdings(
         except (ValueError, KeyError):
             skipped += 1
 
+    if imported:
+        await _invalidate_portfolio_cache(current_user["_id"])
     return StandardResponse.ok(ImportResult(broker=broker, imported=imported, skipped=skipped))
 
 
@@ -381,43 +243,32 @@ async def import_transactions(
     else:
         imported, skipped, created = await _import_stock_transactions(ws, header_row, col, user_id)
 
+    if imported or created:
+        await _invalidate_portfolio_cache(current_user["_id"])
     return StandardResponse.ok(
         {"imported": imported, "skipped": skipped, "holdings_created": created, "type": "MF" if is_mf else "STOCKS"}
     )
 
 
-# MF scheme name -> DB symbol mapping
-MF_SYMBOL_MAP = {
-    "parag parikh flexi cap": "PPFAS",
-    "hdfc mid cap": "HDFC-MC",
-    "kotak large & midcap": "KOTAK-LM",
-    "bandhan small cap": "BANDHAN-SC",
-    "pgim india ultra short": "PGIM-USD",
-    "axis liquid": "AXIS-LIQ",
-    "motilal oswal midcap": "MOTILAL-MC",
-    "motilal oswal nifty 200": "MOTILAL-MOM30",
-    "jm flexicap": "JM-FLEXI",
-    "axis small cap": "AXIS-SC",
-    "nippon india small cap": "NIPPON-SC",
-}
-
-
-def _resolve_mf_symbol(scheme_name: str) -> str:
-    name = scheme_name.lower()
-    for key, symbol in MF_SYMBOL_MAP.items():
-        if key in name:
-            return symbol
-    # Fallback: first 2 words uppercased
-    parts = scheme_name.split()[:2]
-    return "-".join(p.upper()[:6] for p in parts)
+async def _resolve_mf_symbols(schemes: list, user_id) -> dict:
+    """Scheme name -> holding symbol: the user's existing holding for that scheme, else its AMFI scheme code."""
+    existing = await Holding.find(Holding.user_id == user_id, Holding.holding_type == "MF").to_list()
+    by_name = {normalize_scheme_name(h.name): h.symbol for h in existing}
+    codes = await resolve_schemes({s: s for s in schemes})
+    resolved = {}
+    for scheme in schemes:
+        symbol = by_name.get(normalize_scheme_name(scheme)) or codes.get(scheme)
+        if not symbol:
+            # Not in the AMFI index: first 2 words uppercased
+            symbol = "-".join(p.upper()[:6] for p in scheme.split()[:2])
+        resolved[scheme] = symbol
+    return resolved
 
 
 async def _import_mf_transactions(ws, header_row, col, user_id):
     from datetime import datetime
 
-    txn_map = {}  # symbol -> list of txns
-    name_map = {}  # symbol -> scheme name
-
+    rows = []  # (scheme name, txn)
     for row in ws.iter_rows(min_row=header_row + 1, values_only=True):
         if not row or not row[col.get("scheme name", 0)]:
             continue
@@ -437,13 +288,17 @@ async def _import_mf_transactions(ws, header_row, col, user_id):
         except (ValueError, TypeError):
             continue
 
-        symbol = _resolve_mf_symbol(scheme)
+        rows.append((scheme, {"type": txn_type, "quantity": round(units, 4), "price": round(nav, 2), "date": date_iso}))
+
+    symbols = await _resolve_mf_symbols(list({scheme for scheme, _ in rows}), user_id)
+    txn_map = {}  # symbol -> list of txns
+    name_map = {}  # symbol -> scheme name
+    for scheme, txn in rows:
+        symbol = symbols[scheme]
         if symbol not in txn_map:
             txn_map[symbol] = []
             name_map[symbol] = scheme
-        txn_map[symbol].append(
-            {"type": txn_type, "quantity": round(units, 4), "price": round(nav, 2), "date": date_iso}
-        )
+        txn_map[symbol].append(txn)
 
     imported = skipped = created = 0
     for symbol, txns in txn_map.items():
@@ -590,20 +445,16 @@ def categorize_mf(name: str) -> tuple[str, int]:
 @router.get("/mf/health", summary="MF health check", description="Analyze mutual fund performance and health")
 async def mf_health_check(current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Analyze mutual fund portfolio health with benchmarks and recommendations."""
-    from ....services.cache import cache_get, cache_set
+    return StandardResponse.ok(await _mf_health(current_user["_id"]))
 
-    ck = f"mf_health:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
 
-    holdings = await get_user_holdings(current_user["_id"])
+@cache_aside("mf_health", ttl=600)
+async def _mf_health(user_id: str) -> dict:
+    holdings = await get_user_holdings(user_id)
     mf_holdings = [h for h in holdings if h.holding_type == "MF"]
 
     if not mf_holdings:
-        return StandardResponse.ok(
-            {"message": "No mutual funds in portfolio", "funds": [], "total_mf_value": 0, "health_score": 100}
-        )
+        return {"message": "No mutual funds in portfolio", "funds": [], "total_mf_value": 0, "health_score": 100}
 
     prices = await get_prices_for_holdings(mf_holdings) or {}
     analysis = []
@@ -722,8 +573,7 @@ async def mf_health_check(current_user: dict = Depends(get_current_user)) -> Sta
         "recommendations": recommendations,
         "note": "Returns comparison is vs annual benchmarks. Short holding periods may show underperformance.",
     }
-    await cache_set(ck, result, ttl=600)
-    return StandardResponse.ok(result)
+    return result
 
 
 @router.get("/mf/overlap", summary="MF overlap analysis", description="Analyze stock overlap between mutual funds")
@@ -808,103 +658,33 @@ async def get_earnings_calendar(
     current_user: dict = Depends(get_current_user),
 ) -> StandardResponse:
     """Get upcoming earnings dates for user's stock holdings."""
-    import httpx
-
-    from ....services.cache import cache_get, cache_set
+    from datetime import timezone
 
-    ck = f"earnings_cal:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
+    from ....services.market.earnings import find_upcoming_earnings
 
     holdings = await get_user_holdings(current_user["_id"])
-    equity = [h for h in holdings if h.holding_type != "MF"]
-    if not equity:
-        return StandardResponse.ok({"earnings": []})
-
+    symbols = list({h.symbol for h in holdings if h.holding_type != "MF"})
     earnings = []
-
-    import asyncio
-
-    async def _fetch_earnings(symbol):
-        try:
-            async with httpx.AsyncClient(timeout=8) as c:
-                # Try Yahoo Finance first
-                resp = await c.get(
-                    f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.NS",
-                    headers={"User-Agent": "Mozilla/5.0"},
-                )
-                if resp.status_code == 200:
-                    meta = resp.json().get("chart", {}).get("result", [{}])[0].get("meta", {})
-                    ts = meta.get("earningsTimestamp")
-                    if ts:
-                        from datetime import datetime, timezone
-
-                        dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-                        if dt > datetime.now(timezone.utc):
-                            return {
-                                "symbol": symbol,
-                                "date": dt.isoformat(),
-                                "date_str": dt.strftime("%d %b %Y"),
-                                "source": "yahoo",
-                            }
-
-                # Fallback to Screener.in
-                screener_resp = await c.get(
-                    f"https://www.screener.in/company/{symbol}/",
-                    headers={"User-Agent": "Mozilla/5.0"},
-                    follow_redirects=True,
-                )
-                if screener_resp.status_code == 200:
-                    import re
-
-                    text = screener_resp.text
-                    # Look for "Results" or "Earnings" date patterns
-                    date_pattern = (
-                        r"(?:Results|Earnings|Board Meeting).*?"
-                        r"(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})"
-                    )
-                    match = re.search(date_pattern, text, re.IGNORECASE)
-                    if match:
-                        from datetime import datetime, timezone
-
-                        try:
-                            dt = datetime.strptime(match.group(1), "%d %b %Y").replace(tzinfo=timezone.utc)
-                            if dt > datetime.now(timezone.utc):
-                                return {
-                                    "symbol": symbol,
-                                    "date": dt.isoformat(),
-                                    "date_str": dt.strftime("%d %b %Y"),
-                                    "source": "screener",
-                                }
-                        except ValueError:
-                            pass
-        except Exception:
-            pass
-        return None
-
-    results = await asyncio.gather(*[_fetch_earnings(h.symbol) for h in equity[:20]])
-    earnings = [r for r in results if r]
-
-    earnings.sort(key=lambda x: x["date"])
-    result = {"earnings": earnings}
-    await cache_set(ck, result, ttl=3600)
-    return StandardResponse.ok(result)
+    for e in await find_upcoming_earnings(symbols):
+        dt = e["earnings_date"].replace(tzinfo=timezone.utc)
+        earnings.append(
+            {"symbol": e["symbol"], "date": dt.isoformat(), "date_str": dt.strftime("%d %b %Y"), "source": e["source"]}
+        )
+    return StandardResponse.ok({"earnings": earnings})
 
 
 @router.get("/snapshots", summary="Portfolio growth over time")
 async def get_snapshots(range: str = "3M", current_user: dict = Depends(get_current_user)) -> StandardResponse:
+    return StandardResponse.ok(await _snapshots(current_user["_id"], range))
+
+
+@cache_aside("snapshots", ttl=3600)
+async def _snapshots(user_id: str, range: str) -> dict:
     from datetime import datetime, timedelta
 
     from ....models.documents.portfolio_snapshot import PortfolioSnapshot
-    from ....services.cache import cache_get, cache_set
-
-    ck = f"snapshots:{current_user['_id']}:{range}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
 
-    uid = PydanticObjectId(current_user["_id"])
+    uid = PydanticObjectId(user_id)
     days = {"1W": 7, "1M": 30, "3M": 90, "6M": 180, "1Y": 365, "ALL": 3650}.get(range, 90)
     since = datetime.utcnow() - timedelta(days=days)
 
@@ -925,5 +705,4 @@ async def get_snapshots(range: str = "3M", current_user: dict = Depends(get_curr
         for s in snaps
     ]
     result = {"snapshots": data, "range": range, "count": len(data)}
-    await cache_set(ck, result, ttl=3600)
-    return StandardResponse.ok(result)
+    return result
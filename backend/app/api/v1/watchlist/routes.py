@@ -6,6 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from ....core.response_handler import StandardResponse
 from ....core.security import get_current_user
 from ....models.documents import WatchlistItem
+from ....services.cache import bump_data_version, market_ttl
+from ....services.cache_aside import cache_aside
 from ....services.market.price_service import get_bulk_prices
 from .schemas import WatchlistAdd, WatchlistItemResponse
 
@@ -15,17 +17,16 @@ router = APIRouter()
 @router.get("", summary="Get watchlist", description="List all watchlist items with prices")
 async def get_watchlist(current_user: dict = Depends(get_current_user)) -> StandardResponse:
     """Get watchlist items."""
-    from ....services.cache import cache_get, cache_set, market_ttl
+    return StandardResponse.ok(await _watchlist(current_user["_id"]))
 
-    ck = f"watchlist:{current_user['_id']}"
-    cached = await cache_get(ck)
-    if cached:
-        return StandardResponse.ok(cached)
-    items = await WatchlistItem.find(WatchlistItem.user_id == PydanticObjectId(current_user["_id"])).to_list()
+
+@cache_aside("watchlist", ttl=lambda: market_ttl(60, 3600))
+async def _watchlist(user_id: str) -> list:
+    items = await WatchlistItem.find(WatchlistItem.user_id == PydanticObjectId(user_id)).to_list()
     symbols = [w.symbol for w in items]
     prices = await get_bulk_prices(symbols) if symbols else {}
 
-    result = [
+    return [
         WatchlistItemResponse(
             _id=str(w.id),
             symbol=w.symbol,
@@ -33,12 +34,9 @@ async def get_watchlist(current_user: dict = Depends(get_current_user)) -> Stand
             current_price=prices.get(w.symbol, {}).get("current_price"),
             day_change_pct=prices.get(w.symbol, {}).get("day_change_pct", 0),
             added_at=w.added_at,
-        )
+        ).model_dump(mode="json", by_alias=True)
         for w in items
     ]
-    serialized = [r.model_dump() if hasattr(r, "model_dump") else r for r in result]
-    await cache_set(ck, serialized, ttl=market_ttl(60, 3600))
-    return StandardResponse.ok(result)
 
 
 @router.post("/", summary="Add to watchlist", description="Add a stock to watchlist")
@@ -53,6 +51,7 @@ async def add_to_watchlist(item: WatchlistAdd, current_user: dict = Depends(get_
 
     doc = WatchlistItem(user_id=user_id, symbol=symbol, notes=item.notes, added_at=datetime.now(timezone.utc))
     await doc.insert()
+    await bump_data_version(user_id)
     return StandardResponse.ok({"id": str(doc.id), "symbol": symbol}, "Added to watchlist")
 
 
@@ -67,4 +66,5 @@ async def remove_from_watchlist(item_id: str, current_user: dict = Depends(get_c
     if not item:
         raise HTTPException(status_code=404, detail="Not found")
     await item.delete()
+    await bump_data_version(current_user["_id"])
     return StandardResponse.ok(message="Removed from watchlist")
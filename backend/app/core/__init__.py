@@ -1,5 +1,5 @@
 from .config import settings
-from .constants import BENCHMARKS, DEFAULT_ALLOCATION, SECTOR_MAP, TAX_RATES
+from .constants import BENCHMARKS, DEFAULT_ALLOCATION, TAX_RATES
 from .database import get_database, init_db
 from .exceptions import (
     AppException,
@@ -13,6 +13,10 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379"
     upstash_redis_rest_url: str = ""
     upstash_redis_rest_token: str = ""
+    cache_serializer: str = "json"  # json (orjson when installed) | msgpack
+    cache_compression: str = "zstd"  # zstd | lz4 | none — used only when the library is installed
+    cache_compress_threshold: int = 1024  # Serialized bytes before compression kicks in
+    cache_fallback_size: int = 5000  # In-process entries kept while Redis is unreachable
 
     # JWT
     secret_key: str
@@ -11,6 +11,21 @@ client: AsyncIOMotorClient = None
 db = None
 
 
+async def _dedupe_price_cache(database) -> None:
+    """Drop duplicate price_cache rows left by the old find-then-insert updater so the unique index can build."""
+    dupes = database.price_cache.aggregate(
+        [
+            {"$sort": {"last_updated": -1}},  # Newest first, so ids[0] is the row kept
+            {"$group": {"_id": "$symbol", "ids": {"$push": "$_id"}, "n": {"$sum": 1}}},
+            {"$match": {"n": {"$gt": 1}}},
+        ]
+    )
+    extra = [oid async for group in dupes for oid in group["ids"][1:]]
+    if extra:
+        await database.price_cache.delete_many({"_id": {"$in": extra}})
+        logger.info(f"Removed {len(extra)} duplicate price_cache rows")
+
+
 async def init_db(max_retries: int = 5, retry_delay: int = 3):
     global client, db
 
@@ -29,6 +44,7 @@ async def init_db(max_retries: int = 5, retry_delay: int = 3):
             )
             db = client[settings.mongodb_db]
             await client.admin.command("ping")
+            await _dedupe_price_cache(db)
             await init_beanie(database=db, document_models=ALL_DOCUMENTS)
             logger.info(f"Connected to MongoDB: {settings.mongodb_db}")
             return
@@ -17,6 +17,7 @@ from .middleware.security_headers import SecurityHeadersMiddleware
 from .services.cache import close_redis, get_redis
 from .services.http_client import close_http_client
 from .services.market.price_service import get_bulk_prices
+from .services.symbols import get_search_index
 from .services.websocket import ws_manager
 from .tasks.scheduler import start_scheduler
 from .utils.logger import logger
@@ -34,6 +35,7 @@ if settings.cors_origins:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting StockPilot API...")
+    get_search_index()
     await init_db()
     start_scheduler()
     logger.info("StockPilot API ready")
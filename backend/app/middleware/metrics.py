@@ -21,10 +21,40 @@ REQUEST_COUNT = Counter(
 )
 ACTIVE_REQUESTS = Gauge("http_active_requests", "Currently active requests")
 ERROR_COUNT = Counter("http_errors_total", "Total HTTP errors (4xx/5xx)", ["method", "endpoint", "status"])
-CACHE_HIT = Counter("cache_hits_total", "Cache hits")
-CACHE_MISS = Counter("cache_misses_total", "Cache misses")
+CACHE_HIT = Counter("cache_hits_total", "Cache hits", ["namespace"])
+CACHE_MISS = Counter("cache_misses_total", "Cache misses", ["namespace"])
+CACHE_LATENCY = Histogram(
+    "cache_lookup_duration_seconds",
+    "Cache-aside call time, including the load on a miss",
+    ["namespace", "result"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+REDIS_CIRCUIT_OPEN = Gauge("redis_circuit_open", "1 while the cache is serving from the local fallback tier")
 WS_CONNECTIONS = Gauge("websocket_active_connections", "Active WebSocket connections")
 SCHEDULER_RUNS = Counter("scheduler_job_runs_total", "Scheduler job executions", ["job_id", "status"])
+UPSTREAM_QUEUE_DEPTH = Gauge("upstream_queue_depth", "Requests waiting for an upstream token", ["host", "lane"])
+UPSTREAM_WAIT = Histogram(
+    "upstream_wait_seconds",
+    "Time spent waiting for an upstream rate-limit token",
+    ["host", "lane"],
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+QUOTE_SOURCE_LATENCY = Histogram(
+    "quote_source_duration_seconds",
+    "Per-symbol quote source call time",
+    ["source", "result"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0],
+)
+HTTP_CONDITIONAL = Counter(
+    "http_conditional_fetches_total", "Scraped upstream fetches: full body vs 304 not modified", ["result"]
+)
+PRICE_UPDATE_DURATION = Histogram(
+    "price_update_duration_seconds",
+    "update_all_prices run time per stage",
+    ["stage"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+)
+PRICE_UPDATE_SYMBOLS = Gauge("price_update_symbols", "Symbols in the last update_all_prices run", ["result"])
 
 
 def _normalize_path(path: str) -> str:
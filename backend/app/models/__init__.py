@@ -6,6 +6,7 @@ from .documents import (
     AdvisorHistory,
     Alert,
     Asset,
+    Candle,
     DailyDigest,
     Dividend,
     Goal,
@@ -5,9 +5,13 @@ from .ais_line_item import AISCategory, AISLineItem, AISMatchSource, AISStatus
 from .alert import Alert
 from .asset import Asset
 from .base import BaseDocument
+from .candle import Candle
 from .chat import ChatMessage, ChatSession
+from .corporate_action import CorporateAction
 from .daily_digest import DailyDigest
 from .dividend import Dividend
+from .earnings_event import EarningsEvent
+from .fundamentals import StockFundamentals
 from .goal import Goal
 from .holding import Holding
 from .ipo import IPO
@@ -16,6 +20,7 @@ from .networth_history import NetworthHistory
 from .notification import Notification
 from .portfolio_snapshot import PortfolioSnapshot
 from .price_cache import PriceCache
+from .rolling_stats import RollingStats
 from .signal_history import SignalHistory
 from .sip import SIP
 from .tax_audit_trail import TaxAuditTrail
@@ -59,6 +64,11 @@ ALL_DOCUMENTS = [
     AdvisorHistory,
     DailyDigest,
     PriceCache,
+    Candle,
+    RollingStats,
+    CorporateAction,
+    EarningsEvent,
+    StockFundamentals,
     Ledger,
     VaultEntry,
     VaultNominee,
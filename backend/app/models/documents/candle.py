@@ -0,0 +1,24 @@
+from typing import Optional
+
+from pymongo import ASCENDING, IndexModel
+
+from .base import BaseDocumentNoUser
+
+
+class Candle(BaseDocumentNoUser):
+    """Daily OHLCV bar for one symbol — appended incrementally by the candle store."""
+
+    symbol: str
+    exchange: str = "NSE"
+    date: str  # YYYY-MM-DD (IST trading day)
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    close: float
+    volume: int = 0
+
+    class Settings:
+        name = "candles"
+        indexes = [
+            IndexModel([("symbol", ASCENDING), ("exchange", ASCENDING), ("date", ASCENDING)], unique=True),
+        ]
@@ -0,0 +1,22 @@
+from typing import Literal
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from .base import BaseDocumentNoUser
+
+
+class CorporateAction(BaseDocumentNoUser):
+    """Dividend or split event for one symbol — refreshed nightly for every held symbol."""
+
+    symbol: str
+    action_type: Literal["DIVIDEND", "SPLIT"]  # Yahoo reports bonus issues as splits
+    ex_date: str  # YYYY-MM-DD (IST)
+    value: float  # Dividend per share, or new shares per old share for splits
+    ratio: str = ""  # "numerator:denominator" for splits
+
+    class Settings:
+        name = "corporate_actions"
+        indexes = [
+            IndexModel([("symbol", ASCENDING), ("action_type", ASCENDING), ("ex_date", ASCENDING)], unique=True),
+            IndexModel([("symbol", ASCENDING), ("ex_date", DESCENDING)]),
+        ]
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Literal
+
+from pymongo import ASCENDING, IndexModel
+
+from .base import BaseDocumentNoUser
+
+
+class EarningsEvent(BaseDocumentNoUser):
+    """Next results date for one symbol — refreshed nightly for every held or watchlisted symbol."""
+
+    symbol: str
+    earnings_date: datetime  # UTC
+    source: Literal["yahoo", "screener"]
+
+    class Settings:
+        name = "earnings_events"
+        indexes = [
+            IndexModel([("symbol", ASCENDING)], unique=True),
+            IndexModel([("earnings_date", ASCENDING), ("symbol", ASCENDING)]),
+        ]
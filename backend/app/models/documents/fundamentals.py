@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from pymongo import ASCENDING, IndexModel
+
+from .base import BaseDocumentNoUser
+
+
+class StockFundamentals(BaseDocumentNoUser):
+    """Latest Screener.in ratios for one symbol — refreshed nightly by the fundamentals crawler."""
+
+    symbol: str
+    company_name: Optional[str] = None
+    current_price: Optional[float] = None
+    market_cap: Optional[float] = None  # ₹ Cr
+    pe: Optional[float] = None
+    pb: Optional[float] = None
+    roe: Optional[float] = None
+    roce: Optional[float] = None
+    debt_equity: Optional[float] = None
+    dividend_yield: Optional[float] = None
+    high_52w: Optional[float] = None
+    low_52w: Optional[float] = None
+    profit_growth_3yr: Optional[float] = None
+    promoter_holding: Optional[float] = None
+    promoter_pledge: Optional[float] = None
+    fetched_at: datetime
+
+    class Settings:
+        name = "fundamentals"
+        indexes = [
+            IndexModel([("symbol", ASCENDING)], unique=True),
+        ]
+
+    def as_dict(self) -> Dict:
+        """Ratios and identity only — JSON-safe for API responses and Redis caching."""
+        return self.model_dump(exclude={"id", "revision_id", "created_at", "updated_at", "fetched_at"})
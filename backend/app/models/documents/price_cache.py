@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Optional
 
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 from .base import BaseDocumentNoUser
 
@@ -16,3 +17,6 @@ class PriceCache(BaseDocumentNoUser):
 
     class Settings:
         name = "price_cache"
+        indexes = [
+            IndexModel([("symbol", ASCENDING)], unique=True),
+        ]
@@ -0,0 +1,29 @@
+from typing import Dict, Optional
+
+from pymongo import ASCENDING, IndexModel
+
+from .base import BaseDocumentNoUser
+
+
+class RollingStats(BaseDocumentNoUser):
+    """Per-symbol rolling statistics as of the last completed session — recomputed after each close."""
+
+    symbol: str
+    as_of: str  # YYYY-MM-DD of the last bar included
+    last_close: float
+    high_52w: Optional[float] = None
+    low_52w: Optional[float] = None
+    avg_volume_20d: Optional[float] = None
+    sma_20: Optional[float] = None
+    sma_50: Optional[float] = None
+    sma_200: Optional[float] = None
+    atr_14: Optional[float] = None
+
+    class Settings:
+        name = "rolling_stats"
+        indexes = [
+            IndexModel([("symbol", ASCENDING)], unique=True),
+        ]
+
+    def as_dict(self) -> Dict:
+        return self.model_dump(exclude={"id", "revision_id", "created_at", "updated_at"})
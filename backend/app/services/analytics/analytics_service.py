@@ -6,9 +6,8 @@ Extracted from analytics/routes.py to separate business logic from HTTP concerns
 
 from beanie import PydanticObjectId
 
-from ...core.constants import SECTOR_MAP
+from ..symbols import get_symbol_master
 from ..base import BaseService
-from ..cache import cache_get, cache_set, market_ttl
 from ..portfolio import get_prices_for_holdings, get_user_holdings
 
 
@@ -26,11 +25,9 @@ class AnalyticsService(BaseService):
 
     async def get_sector_analytics(self) -> dict:
         """Sector breakdown with caching."""
-        ck = self._cache_key("analytics")
-        cached = await cache_get(ck)
-        if cached:
-            return cached
+        return await self._cached("analytics", self._load_sector_analytics)
 
+    async def _load_sector_analytics(self) -> dict:
         holdings, prices = await self._get_holdings_with_prices()
         if not holdings:
             return {"total_value": 0, "sectors": [], "holdings_count": 0}
@@ -41,7 +38,7 @@ class AnalyticsService(BaseService):
             curr = prices.get(h.symbol, {}).get("current_price") or h.current_price or h.avg_price
             value = h.quantity * curr
             total_value += value
-            sector = SECTOR_MAP.get(h.symbol, "Others")
+            sector = get_symbol_master().sector(h.symbol)
             sector_values[sector] = sector_values.get(sector, 0) + value
 
         sectors = [
@@ -49,7 +46,6 @@ class AnalyticsService(BaseService):
             for s, v in sorted(sector_values.items(), key=lambda x: x[1], reverse=True)
         ]
         result = {"total_value": round(total_value, 2), "sectors": sectors, "holdings_count": len(holdings)}
-        await cache_set(ck, result, ttl=market_ttl())
         return result
 
     async def get_pnl_calendar(self) -> dict:
@@ -170,7 +166,7 @@ class AnalyticsService(BaseService):
             curr = prices.get(h.symbol, {}).get("current_price") or h.current_price or h.avg_price
             val = h.quantity * curr
             total += val
-            sector = SECTOR_MAP.get(h.symbol, "Others")
+            sector = get_symbol_master().sector(h.symbol)
             sector_values[sector] = sector_values.get(sector, 0) + val
 
         sectors = []
@@ -2,7 +2,7 @@
 Enhanced stock analysis combining multiple data sources:
 - Yahoo Finance (primary for price data)
 - NSEpy (NSE official data)
-- Screener.in (fundamentals)
+- Screener.in (fundamentals, from the nightly-crawled store)
 """
 
 from typing import Dict, Optional
@@ -10,7 +10,10 @@ from typing import Dict, Optional
 import httpx
 from bs4 import BeautifulSoup
 
+from ...models.documents import StockFundamentals
 from ...utils.logger import logger
+from ..cache_aside import cached
+from ..fundamentals import get_fundamentals
 
 
 async def get_nse_data(symbol: str) -> Optional[Dict]:
@@ -20,44 +23,6 @@ async def get_nse_data(symbol: str) -> Optional[Dict]:
     return None
 
 
-async def get_screener_fundamentals(symbol: str) -> Optional[Dict]:
-    """Scrape fundamental data from Screener.in"""
-    try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            url = f"https://www.screener.in/company/{symbol}/consolidated/"
-            resp = await client.get(
-                url, headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-            )
-
-            if resp.status_code != 200:
-                return None
-
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            # Extract key metrics
-            data = {"symbol": symbol}
-
-            # Market Cap, P/E, etc.
-            ratios = soup.find_all("li", class_="flex flex-space-between")
-            for ratio in ratios:
-                name = ratio.find("span", class_="name")
-                value = ratio.find("span", class_="number")
-                if name and value:
-                    key = name.text.strip().lower().replace(" ", "_")
-                    val = value.text.strip()
-                    data[key] = val
-
-            # Company name
-            name_tag = soup.find("h1")
-            if name_tag:
-                data["company_name"] = name_tag.text.strip()
-
-            return data
-    except (httpx.HTTPError, KeyError, ValueError) as e:
-        logger.error(f"Screener scraping error for {symbol}: {e}")
-        return None
-
-
 async def get_moneycontrol_news(symbol: str) -> list:
     """Scrape news from MoneyControl"""
     try:
@@ -97,25 +62,22 @@ async def get_moneycontrol_news(symbol: str) -> list:
 async def get_combined_analysis(symbol: str, exchange: str = "NSE") -> Dict:
     """
     Combine data from multiple sources for comprehensive analysis.
-    All external calls run in parallel for speed. Results cached in Redis.
+    All external calls run in parallel for speed. Results cached in Redis for 5 minutes.
     """
+    return await cached(f"analysis:{symbol}:{exchange}", lambda: _load_combined_analysis(symbol, exchange), ttl=300)
+
+
+async def _load_combined_analysis(symbol: str, exchange: str) -> Dict:
     import asyncio
 
-    from ..cache import cache_get, cache_set
     from ..market.price_service import get_historical_data, get_stock_price
 
-    # Check cache first (5 min TTL)
-    cache_key = f"analysis:{symbol}:{exchange}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return cached
-
     result = {"symbol": symbol, "exchange": exchange, "sources": {}}
 
     # Run all fetches in parallel
     yahoo_task = get_stock_price(symbol, exchange)
     hist_task = get_historical_data(symbol, exchange, period="1y")
-    fundamentals_task = get_screener_fundamentals(symbol)
+    fundamentals_task = get_fundamentals(symbol)
 
     yahoo_data, hist, fundamentals = await asyncio.gather(
         yahoo_task, hist_task, fundamentals_task, return_exceptions=True
@@ -161,21 +123,17 @@ async def get_combined_analysis(symbol: str, exchange: str = "NSE") -> Dict:
                 result["trend"] = "BULLISH" if result["current_price"] > result["sma_20"] else "BEARISH"
 
     # Process fundamentals
-    if isinstance(fundamentals, dict) and fundamentals:
-        result["sources"]["fundamentals"] = fundamentals
-        result["market_cap"] = fundamentals.get("market_cap")
-        result["pe_ratio"] = fundamentals.get("stock_p/e")
-        result["pb_ratio"] = fundamentals.get("price_to_book_value")
-        result["roe"] = fundamentals.get("roe")
-        result["roce"] = fundamentals.get("roce")
+    if isinstance(fundamentals, StockFundamentals):
+        result["sources"]["fundamentals"] = fundamentals.as_dict()
+        result["market_cap"] = fundamentals.market_cap
+        result["pe_ratio"] = fundamentals.pe
+        result["pb_ratio"] = fundamentals.pb
+        result["roe"] = fundamentals.roe
+        result["roce"] = fundamentals.roce
 
     sources_available = len([v for v in result["sources"].values() if v])
     result["data_quality"] = f"{sources_available}/3 sources"
     result["recommendation"] = generate_recommendation(result)
-
-    # Cache for 5 minutes
-    await cache_set(cache_key, result, 300)
-
     return result
 
 
@@ -184,30 +142,22 @@ def generate_recommendation(data: Dict) -> str:
     score = 0
 
     # Check P/E ratio
-    pe = data.get("pe_ratio")
-    if pe:
-        try:
-            pe_val = float(pe.replace(",", ""))
-            if pe_val < 15:
-                score += 2
-            elif pe_val < 25:
-                score += 1
-            elif pe_val > 40:
-                score -= 2
-        except ValueError:
-            pass
+    pe_val = data.get("pe_ratio")
+    if pe_val:
+        if pe_val < 15:
+            score += 2
+        elif pe_val < 25:
+            score += 1
+        elif pe_val > 40:
+            score -= 2
 
     # Check ROE
-    roe = data.get("roe")
-    if roe:
-        try:
-            roe_val = float(roe.replace(",", ""))
-            if roe_val > 15:
-                score += 2
-            elif roe_val > 10:
-                score += 1
-        except ValueError:
-            pass
+    roe_val = data.get("roe")
+    if roe_val:
+        if roe_val > 15:
+            score += 2
+        elif roe_val > 10:
+            score += 1
 
     # Check delivery percentage (NSE data)
     nse = data.get("sources", {}).get("nse", {})
@@ -6,7 +6,8 @@ Services encapsulate business logic and orchestrate repositories + external call
 
 from beanie import PydanticObjectId
 
-from ...services.cache import cache_delete, cache_get, cache_set, market_ttl
+from ...services.cache import bump_data_version, market_ttl, user_cache_key
+from ...services.cache_aside import Ttl, cached
 
 
 class BaseService:
@@ -15,20 +16,13 @@ class BaseService:
     def __init__(self, user_id: PydanticObjectId):
         self.user_id = user_id
 
-    def _cache_key(self, prefix: str) -> str:
-        return f"{prefix}:{self.user_id}"
-
-    async def _cached(self, prefix: str, loader, ttl: int | None = None):
-        """Get from cache or compute + store."""
-        key = self._cache_key(prefix)
-        cached = await cache_get(key)
-        if cached is not None:
-            return cached
-        result = await loader()
-        await cache_set(key, result, ttl=ttl or market_ttl())
-        return result
-
-    async def _invalidate(self, *prefixes: str):
-        """Invalidate cache keys for this user."""
-        for prefix in prefixes:
-            await cache_delete(self._cache_key(prefix))
+    async def _cache_key(self, prefix: str) -> str:
+        return await user_cache_key(prefix, self.user_id)
+
+    async def _cached(self, prefix: str, loader, ttl: Ttl = market_ttl):
+        """Get from cache or compute + store (coalesced, jittered TTL, hit/miss metrics)."""
+        return await cached(await self._cache_key(prefix), loader, ttl, namespace=prefix)
+
+    async def _invalidate(self):
+        """Invalidate every derived cache key for this user."""
+        await bump_data_version(self.user_id)
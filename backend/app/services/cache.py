@@ -1,14 +1,23 @@
-import json
-from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
-import pytz
 import redis.asyncio as redis
 
 from ..core.config import settings
+from ..middleware.metrics import REDIS_CIRCUIT_OPEN
 from ..utils.logger import logger
+from .cache_codec import CacheCodec
+from .circuit_breaker import CircuitBreaker
+from .local_cache import LocalCache
+from .market_calendar import market_open, seconds_until_next_open
+
+DATA_VERSION_PREFIX = "data_version:"
+DATA_VERSION_LOCAL_TTL = 86400
+
+T = TypeVar("T")
 
 _redis: Optional[redis.Redis] = None
+_redis_bytes: Optional[redis.Redis] = None  # Raw-bytes client for codec-encoded cache values
+codec = CacheCodec(settings.cache_serializer, settings.cache_compression, settings.cache_compress_threshold)
 
 
 async def get_redis() -> redis.Redis:
@@ -26,110 +35,252 @@ async def get_redis() -> redis.Redis:
     return _redis
 
 
+async def get_redis_bytes() -> redis.Redis:
+    """Redis connection that returns raw bytes — used for cache_* values, which may be compressed."""
+    global _redis_bytes
+    if _redis_bytes is None:
+        _redis_bytes = redis.from_url(
+            settings.redis_url,
+            decode_responses=False,
+            max_connections=20,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            retry_on_timeout=True,
+        )
+    return _redis_bytes
+
+
 async def close_redis() -> None:
-    """Close Redis connection."""
-    global _redis
+    """Close Redis connections."""
+    global _redis, _redis_bytes
     if _redis:
         await _redis.aclose()
         _redis = None
+    if _redis_bytes:
+        await _redis_bytes.aclose()
+        _redis_bytes = None
 
 
-async def cache_get(key: str) -> Optional[Any]:
-    """Get value from cache."""
+def _decode(key: str, data: Optional[bytes]) -> Optional[Any]:
     try:
-        r = await get_redis()
-        data = await r.get(key)
-        return json.loads(data) if data else None
+        return codec.decode(data)
     except Exception as e:
-        logger.debug(f"Cache get error: {e}")
+        logger.debug(f"Cache decode error for {key}: {e}")
         return None
 
 
+# ── Degraded mode ──
+# While Redis is unreachable the breaker is open and cache_* calls are served from a
+# bounded in-process tier instead of waiting on connect timeouts. When a probe succeeds,
+# values, deletes and data-version bumps made in the meantime are pushed back to Redis.
+
+redis_breaker = CircuitBreaker(threshold=3, cooldown=10.0)
+_fallback = LocalCache(maxsize=settings.cache_fallback_size, ttl=60)
+_pending_bumps: dict[str, int] = {}  # user id → data-version bumps made while degraded
+_pending_deletes: set[str] = set()  # keys deleted while degraded
+
+
+def _failed(op: str, e: Exception) -> None:
+    was_open = redis_breaker.is_open
+    redis_breaker.failure()
+    if redis_breaker.is_open and not was_open:
+        REDIS_CIRCUIT_OPEN.set(1)
+        logger.warning(f"Redis unavailable ({op}: {e}); serving cache from local fallback")
+    else:
+        logger.debug(f"Cache {op} error: {e}")
+
+
+async def _succeeded() -> None:
+    if redis_breaker.success():
+        REDIS_CIRCUIT_OPEN.set(0)
+        await _resync()
+
+
+async def _resync() -> None:
+    """Push degraded-mode writes to Redis without clobbering newer values, then drop the local tier."""
+    entries = list(_fallback.items())
+    bumps = dict(_pending_bumps)
+    deletes = list(_pending_deletes)
+    _pending_bumps.clear()
+    _pending_deletes.clear()
+    try:
+        r = await get_redis_bytes()
+        pipe = r.pipeline(transaction=False)
+        if deletes:
+            pipe.delete(*deletes)
+        for user_id, count in bumps.items():
+            pipe.incrby(_data_version_key(user_id), count)
+        for key, ttl, value in entries:
+            if not key.startswith(DATA_VERSION_PREFIX):
+                pipe.set(key, codec.encode(value), ex=max(1, int(ttl)), nx=True)
+        await pipe.execute()
+        _fallback.clear()
+        logger.info(
+            f"Redis back; resynced {len(entries)} cached values, {len(deletes)} deletes and {len(bumps)} data versions"
+        )
+    except Exception as e:
+        for user_id, count in bumps.items():
+            _pending_bumps[user_id] = _pending_bumps.get(user_id, 0) + count
+        _pending_deletes.update(deletes)
+        logger.warning(f"Cache resync after Redis recovery failed: {e}")
+
+
+async def redis_call(op: str, fn: Callable[[redis.Redis], Awaitable[T]], fallback: Callable[[], T]) -> T:
+    """``fn(redis)`` behind the breaker — ``fallback()`` while the circuit is open or when the call fails.
+
+    For Redis users outside the cache (locks, rate limits, streams) so they degrade
+    with it instead of each waiting out a connect timeout.
+    """
+    if redis_breaker.allow():
+        try:
+            result = await fn(await get_redis())
+            await _succeeded()
+            return result
+        except Exception as e:
+            _failed(op, e)
+    return fallback()
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Get value from cache (local fallback tier while Redis is down)."""
+    if redis_breaker.allow():
+        try:
+            r = await get_redis_bytes()
+            data = await r.get(key)
+            await _succeeded()
+            return _decode(key, data)
+        except Exception as e:
+            _failed("get", e)
+    return _fallback.get(key)
+
+
 async def cache_set(key: str, value: Any, ttl: int = 60) -> bool:
     """Set value in cache with TTL."""
     try:
-        r = await get_redis()
-        await r.setex(key, ttl, json.dumps(value))
-        return True
+        data = codec.encode(value)
     except Exception as e:
-        logger.debug(f"Cache set error: {e}")
+        logger.debug(f"Cache encode error for {key}: {e}")
         return False
+    if redis_breaker.allow():
+        try:
+            r = await get_redis_bytes()
+            await r.setex(key, ttl, data)
+            await _succeeded()
+            return True
+        except Exception as e:
+            _failed("set", e)
+    _fallback.set(key, value, ttl)
+    return True
 
 
 async def cache_delete(key: str) -> bool:
-    """Delete key from cache."""
-    try:
-        r = await get_redis()
-        await r.delete(key)
-        return True
-    except Exception as e:
-        logger.debug(f"Cache delete error: {e}")
-        return False
+    """Delete key from cache — replayed against Redis on recovery if it is down."""
+    _fallback.delete(key)
+    if redis_breaker.allow():
+        try:
+            r = await get_redis()
+            await r.delete(key)
+            await _succeeded()
+            return True
+        except Exception as e:
+            _failed("delete", e)
+    _pending_deletes.add(key)
+    return False
 
 
-_IST = pytz.timezone("Asia/Kolkata")
-
-# NSE holidays 2026 (update annually — check NSE circular each December)
-_NSE_HOLIDAYS = {
-    (1, 26),
-    (3, 10),
-    (3, 31),
-    (4, 1),
-    (4, 14),
-    (4, 18),
-    (5, 1),
-    (6, 26),
-    (7, 17),
-    (8, 15),
-    (8, 27),
-    (10, 2),
-    (10, 20),
-    (10, 21),
-    (11, 5),
-    (11, 26),
-    (12, 25),
-}
-
-
-def market_open() -> bool:
-    """Check if Indian stock market is currently open (accounts for holidays)."""
-    now = datetime.now(_IST)
-    if now.weekday() >= 5:
-        return False
-    if (now.month, now.day) in _NSE_HOLIDAYS:
-        return False
-    return 915 <= now.hour * 100 + now.minute <= 1530
+def _data_version_key(user_id) -> str:
+    return f"{DATA_VERSION_PREFIX}{user_id}"
+
+
+async def data_version(user_id) -> int:
+    """Current version of a user's portfolio/finance data — bumped on every write, 0 if never written."""
+    key = _data_version_key(user_id)
+    if redis_breaker.allow():
+        try:
+            r = await get_redis()
+            version = int(await r.get(key) or 0)
+            await _succeeded()
+            _fallback.set(key, version, ttl=DATA_VERSION_LOCAL_TTL)
+            return version
+        except Exception as e:
+            _failed("version read", e)
+    return _fallback.get(key) or 0
+
 
+async def bump_data_version(user_id) -> None:
+    """Invalidate every versioned cache key for a user with a single INCR."""
+    key = _data_version_key(user_id)
+    if redis_breaker.allow():
+        try:
+            r = await get_redis()
+            version = await r.incr(key)
+            await _succeeded()
+            _fallback.set(key, version, ttl=DATA_VERSION_LOCAL_TTL)
+            return
+        except Exception as e:
+            _failed("version bump", e)
+    # Degraded: bump locally so this worker stops serving stale keys, and replay the INCR on recovery
+    _fallback.set(key, (_fallback.get(key) or 0) + 1, ttl=DATA_VERSION_LOCAL_TTL)
+    _pending_bumps[str(user_id)] = _pending_bumps.get(str(user_id), 0) + 1
 
-def market_ttl(active: int = 120, closed: int = 3600) -> int:
-    """Return TTL based on market hours."""
-    return active if market_open() else closed
+
+async def user_cache_key(prefix: str, user_id, *parts) -> str:
+    """``prefix:user:v<version>[:parts]`` — derived per-user data that goes stale on any write.
+
+    Old versions are never read again and simply age out on their TTL.
+    """
+    suffix = "".join(f":{p}" for p in parts)
+    return f"{prefix}:{user_id}:v{await data_version(user_id)}{suffix}"
+
+
+def market_ttl(active: int = 120, closed: Optional[int] = 3600) -> int:
+    """TTL for market-derived data: ``active`` during a session, otherwise until the next open.
+
+    ``closed`` caps the closed-market TTL for data that can change between sessions
+    (e.g. user edits); pass None for pure market data that only moves when trading.
+    """
+    if market_open():
+        return active
+    until_open = seconds_until_next_open()
+    return max(active, min(closed, until_open) if closed else until_open)
 
 
 async def cache_mget(keys: list[str]) -> dict[str, Any]:
-    """Get multiple values from cache."""
+    """Get multiple values from cache — only hits are decoded and returned."""
     if not keys:
         return {}
-    try:
-        r = await get_redis()
-        values = await r.mget(keys)
-        return {k: json.loads(v) if v else None for k, v in zip(keys, values)}
-    except Exception as e:
-        logger.debug(f"Cache mget error: {e}")
-        return {}
+    if redis_breaker.allow():
+        try:
+            r = await get_redis_bytes()
+            values = await r.mget(keys)
+            await _succeeded()
+            return {k: _decode(k, v) for k, v in zip(keys, values) if v}
+        except Exception as e:
+            _failed("mget", e)
+    return {k: v for k in keys if (v := _fallback.get(k)) is not None}
 
 
 async def cache_mset(data: dict[str, Any], ttl: int = 60) -> bool:
     """Set multiple values in cache with TTL."""
     if not data:
         return True
-    try:
-        r = await get_redis()
-        pipe = r.pipeline()
-        for key, value in data.items():
-            pipe.setex(key, ttl, json.dumps(value))
-        await pipe.execute()
-        return True
-    except Exception as e:
-        logger.debug(f"Cache mset error: {e}")
-        return False
+    encoded: dict[str, bytes] = {}
+    for key, value in data.items():
+        try:
+            encoded[key] = codec.encode(value)
+        except Exception as e:
+            logger.debug(f"Cache encode error for {key}: {e}")
+    if encoded and redis_breaker.allow():
+        try:
+            r = await get_redis_bytes()
+            pipe = r.pipeline()
+            for key, blob in encoded.items():
+                pipe.setex(key, ttl, blob)
+            await pipe.execute()
+            await _succeeded()
+            return len(encoded) == len(data)
+        except Exception as e:
+            _failed("mset", e)
+    for key in encoded:
+        _fallback.set(key, data[key], ttl)
+    return len(encoded) == len(data)
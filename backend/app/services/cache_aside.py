@@ -0,0 +1,106 @@
+"""Cache-aside — one read-through path for derived data, with metrics, single-flight and TTL jitter.
+
+``cached`` reads a key and, on a miss, runs the loader once per worker (concurrent
+callers share the in-flight call), stores the result under a jittered TTL so keys
+written together don't expire together, and returns it. Empty results are cached
+for a short ``NEGATIVE_TTL`` so an empty portfolio doesn't recompute on every request.
+``cache_aside`` wraps a per-user loader in the same path, keyed by the user's data version,
+and exposes ``prime`` so jobs can build a user's entry ahead of demand.
+"""
+
+import functools
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from ..middleware.metrics import CACHE_HIT, CACHE_LATENCY, CACHE_MISS
+from .cache import cache_get, cache_set, user_cache_key
+from .singleflight import SingleFlight
+
+NEGATIVE_TTL = 60
+TTL_JITTER = 0.1  # ± share of the TTL
+_NONE = "__none__"  # Stored in place of a None result, which would otherwise read back as a miss
+
+Ttl = Union[int, Callable[[], int]]
+
+_flight = SingleFlight()
+
+
+def jittered(ttl: int, spread: float = TTL_JITTER) -> int:
+    return max(1, round(ttl * random.uniform(1 - spread, 1 + spread)))
+
+
+def _resolve(ttl: Ttl) -> int:
+    return ttl() if callable(ttl) else ttl
+
+
+def is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (list, dict)) and not value)
+
+
+async def cached(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: Ttl = 300,
+    namespace: Optional[str] = None,
+    empty: Callable[[Any], bool] = is_empty,
+    negative_ttl: int = NEGATIVE_TTL,
+) -> Any:
+    """Value for ``key`` from cache, else from ``loader`` (coalesced per key) and stored.
+
+    ``ttl`` may be a callable such as ``market_ttl`` — it is evaluated when the value is stored.
+    ``namespace`` labels the metrics and defaults to the key's first segment.
+    """
+    namespace = namespace or key.split(":", 1)[0]
+    start = time.perf_counter()
+    value = await cache_get(key)
+    if value is not None:
+        CACHE_HIT.labels(namespace).inc()
+        CACHE_LATENCY.labels(namespace, "hit").observe(time.perf_counter() - start)
+        return None if value == _NONE else value
+
+    CACHE_MISS.labels(namespace).inc()
+
+    async def _load() -> Any:
+        result = await loader()
+        if empty(result):
+            await cache_set(key, _NONE if result is None else result, ttl=negative_ttl)
+        else:
+            await cache_set(key, result, ttl=jittered(_resolve(ttl)))
+        return result
+
+    result = await _flight.do(key, _load)
+    CACHE_LATENCY.labels(namespace, "miss").observe(time.perf_counter() - start)
+    return result
+
+
+def cache_aside(namespace: str, ttl: Ttl = 300, **options):
+    """Decorate ``async def f(user_id, *args)`` to cache per user and args under ``namespace``.
+
+    Keys carry the user's data version, so any write to their data invalidates every entry.
+    ``f.prime(user_id, *args, ttl=...)`` recomputes and overwrites the entry, optionally
+    under a TTL other than the decorator's (e.g. to outlive a market open).
+    """
+    default_ttl = ttl
+    empty = options.get("empty", is_empty)
+    negative_ttl = options.get("negative_ttl", NEGATIVE_TTL)
+
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        @functools.wraps(fn)
+        async def wrapper(user_id, *args):
+            key = await user_cache_key(namespace, user_id, *args)
+            return await cached(key, lambda: fn(user_id, *args), ttl, namespace=namespace, **options)
+
+        async def prime(user_id, *args, ttl: Optional[int] = None) -> Any:
+            key = await user_cache_key(namespace, user_id, *args)
+            result = await fn(user_id, *args)
+            if empty(result):
+                await cache_set(key, _NONE if result is None else result, ttl=negative_ttl)
+            else:
+                await cache_set(key, result, ttl=jittered(ttl or _resolve(default_ttl)))
+            return result
+
+        wrapper.prime = prime
+        return wrapper
+
+    return decorator
@@ -0,0 +1,103 @@
+"""Cache value codec — serializer plus optional compression behind a versioned header.
+
+Encoded values are ``MAGIC | flags | payload``: the flags byte packs the serializer
+(high nibble) and the compressor (low nibble), so a reader decodes whatever a peer
+wrote regardless of its own settings. Values without the magic byte are legacy plain
+JSON strings and still decode, which lets workers roll over one at a time.
+
+orjson, msgpack, zstandard and lz4 are optional; without them values fall back to
+stdlib JSON and stay uncompressed.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..utils.logger import logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional codec
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional compressor
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional compressor
+    lz4_frame = None
+
+MAGIC = 0x01  # Format version; bump when the header layout changes
+JSON, MSGPACK = 0, 1
+NONE, ZSTD, LZ4 = 0, 1, 2
+
+SERIALIZERS = {"json": JSON, "msgpack": MSGPACK}
+COMPRESSORS = {"none": NONE, "zstd": ZSTD, "lz4": LZ4}
+
+
+def _json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _available() -> Tuple[Dict[int, Tuple[Callable, Callable]], Dict[int, Tuple[Callable, Callable]]]:
+    serializers = {JSON: (_json_dumps, _json_loads)}
+    if msgpack is not None:
+        serializers[MSGPACK] = (
+            lambda v: msgpack.packb(v, use_bin_type=True),
+            lambda d: msgpack.unpackb(d, raw=False, strict_map_key=False),
+        )
+    compressors = {NONE: (lambda d: d, lambda d: d)}
+    if zstandard is not None:
+        compressors[ZSTD] = (zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress)
+    if lz4_frame is not None:
+        compressors[LZ4] = (lz4_frame.compress, lz4_frame.decompress)
+    return serializers, compressors
+
+
+_SERIALIZERS, _COMPRESSORS = _available()
+
+
+class CacheCodec:
+    """Encode/decode cache values; compression kicks in at ``threshold`` serialized bytes."""
+
+    def __init__(self, serializer: str = "json", compressor: str = "zstd", threshold: int = 1024):
+        self.serializer = SERIALIZERS.get(serializer, JSON)
+        if self.serializer not in _SERIALIZERS:
+            logger.warning(f"Cache serializer {serializer!r} unavailable, using json")
+            self.serializer = JSON
+        self.compressor = COMPRESSORS.get(compressor, NONE)
+        if self.compressor not in _COMPRESSORS:
+            self.compressor = next((c for c in (ZSTD, LZ4) if c in _COMPRESSORS), NONE)
+        self.threshold = threshold
+
+    def encode(self, value: Any) -> bytes:
+        payload = _SERIALIZERS[self.serializer][0](value)
+        compressor = self.compressor if len(payload) >= self.threshold else NONE
+        if compressor != NONE:
+            payload = _COMPRESSORS[compressor][0](payload)
+        return bytes((MAGIC, self.serializer << 4 | compressor)) + payload
+
+    def decode(self, data: Optional[bytes]) -> Optional[Any]:
+        """Stored bytes → value. None for empty input or a payload this worker can't read."""
+        if not data:
+            return None
+        if data[0] != MAGIC:
+            return _json_loads(data)  # Legacy plain-JSON value
+        serializer, compressor = data[1] >> 4, data[1] & 0x0F
+        if serializer not in _SERIALIZERS or compressor not in _COMPRESSORS:
+            logger.debug(f"Cache value with unsupported codec flags {data[1]:#04x}")
+            return None
+        return _SERIALIZERS[serializer][1](_COMPRESSORS[compressor][1](data[2:]))
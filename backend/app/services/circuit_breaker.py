@@ -0,0 +1,41 @@
+"""Circuit breaker — stop calling a dependency that keeps failing, probe it again after a cooldown."""
+
+import time
+
+
+class CircuitBreaker:
+    """Closed → open after ``threshold`` consecutive failures; one probe call per ``cooldown`` while open.
+
+    ``allow()`` says whether to attempt the call; report the outcome with ``success()``
+    or ``failure()``. ``success()`` returns True when it closes an open circuit, so the
+    caller can resync whatever it did in degraded mode.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 10.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.threshold
+
+    def allow(self) -> bool:
+        if not self.is_open:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.cooldown:
+            return False
+        self.opened_at = now  # Half-open: this call probes, everyone else waits out another cooldown
+        return True
+
+    def success(self) -> bool:
+        recovered = self.is_open
+        self.failures = 0
+        return recovered
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
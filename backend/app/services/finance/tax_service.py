@@ -9,7 +9,6 @@ from datetime import datetime, timedelta
 from beanie import PydanticObjectId
 
 from ..base import BaseService
-from ..cache import cache_get, cache_set
 from ..portfolio import get_prices_for_holdings, get_user_holdings
 
 
@@ -21,11 +20,9 @@ class TaxService(BaseService):
 
     async def get_tax_summary(self) -> dict:
         """Calculate STCG/LTCG tax liability based on holding period."""
-        cache_key = self._cache_key("tax_summary")
-        cached = await cache_get(cache_key)
-        if cached:
-            return cached
+        return await self._cached("tax_summary", self._load_tax_summary, ttl=300)
 
+    async def _load_tax_summary(self) -> dict:
         holdings = await get_user_holdings(str(self.user_id))
         now = datetime.now()
         fy_start = datetime(now.year if now.month >= 4 else now.year - 1, 4, 1)
@@ -81,5 +78,4 @@ class TaxService(BaseService):
             },
             "transactions": [],
         }
-        await cache_set(cache_key, result, ttl=300)
         return result
@@ -0,0 +1,4 @@
+from .parser import parse_screener_page
+from .store import get_fundamentals, get_fundamentals_bulk, refresh_fundamentals
+
+__all__ = ["get_fundamentals", "get_fundamentals_bulk", "parse_screener_page", "refresh_fundamentals"]
@@ -0,0 +1,82 @@
+"""Screener.in company page → typed fundamentals, extracted with lxml XPath.
+
+Only the few nodes we need are visited (top-ratio list, compounded-growth tables,
+shareholding rows), instead of building and walking a BeautifulSoup tree.
+"""
+
+from typing import Dict, Optional
+
+from lxml import html
+
+# Top-ratio labels (lower-cased) → record fields
+RATIO_FIELDS = {
+    "market cap": "market_cap",
+    "current price": "current_price",
+    "stock p/e": "pe",
+    "price to book value": "pb",
+    "roe": "roe",
+    "roce": "roce",
+    "debt to equity": "debt_equity",
+    "dividend yield": "dividend_yield",
+    "pledged percentage": "promoter_pledge",
+}
+
+_RATIO_ITEMS = "//li[contains(concat(' ', normalize-space(@class), ' '), ' flex-space-between ')]"
+_NUMBERS = ".//span[contains(@class, 'number')]/text()"
+
+
+def parse_number(text: str) -> Optional[float]:
+    try:
+        return float(text.replace(",", "").replace("%", "").replace("₹", "").strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+def _text(node) -> str:
+    return " ".join(node.text_content().split())
+
+
+def parse_screener_page(page: str) -> Dict[str, Optional[float]]:
+    """Extract the ratios Screener shows on a company page. Missing ratios are left out."""
+    tree = html.fromstring(page)
+    data: Dict = {}
+
+    title = tree.xpath("//h1")
+    if title:
+        data["company_name"] = _text(title[0])
+
+    book_value = None
+    for li in tree.xpath(_RATIO_ITEMS):
+        label = " ".join(li.xpath("string(.//span[contains(@class, 'name')])").split()).lower()
+        numbers = [n for n in map(parse_number, li.xpath(_NUMBERS)) if n is not None]
+        if not numbers:
+            continue
+        if label == "high / low" and len(numbers) == 2:
+            data["high_52w"], data["low_52w"] = numbers
+        elif label == "book value":
+            book_value = numbers[0]
+        elif label in RATIO_FIELDS:
+            data[RATIO_FIELDS[label]] = numbers[0]
+    # P/B isn't in Screener's default ratio set; derive it from price and book value
+    if "pb" not in data and book_value and data.get("current_price"):
+        data["pb"] = round(data["current_price"] / book_value, 2)
+
+    for table in tree.xpath("//table[contains(@class, 'ranges-table')]"):
+        if "profit growth" not in table.xpath("string(.//th)").lower():
+            continue
+        for row in table.xpath(".//tr[td]"):
+            cells = row.xpath("./td")
+            if len(cells) == 2 and _text(cells[0]).startswith("3 Years"):
+                data["profit_growth_3yr"] = parse_number(_text(cells[1]))
+
+    rows = tree.xpath("//section[@id='shareholding']//tr[td]") or tree.xpath("//tr[td]")
+    for row in rows:
+        cells = row.xpath("./td")
+        if len(cells) < 2:
+            continue
+        label = _text(cells[0]).lower()
+        if "pledge" in label:
+            data.setdefault("promoter_pledge", parse_number(_text(cells[-1])))
+        elif "promoter" in label:
+            data.setdefault("promoter_holding", parse_number(_text(cells[-1])))
+    return data
@@ -0,0 +1,130 @@
+"""Fundamentals store — Screener.in ratios per symbol, crawled nightly into the ``fundamentals`` collection.
+
+Readers hit an in-process cache, then Mongo. A symbol the crawler hasn't seen yet (or
+whose record is older than ``STALE_AFTER``) is scraped once on demand, with concurrent
+readers sharing the fetch, and written back so nobody scrapes it again until it ages out.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from pymongo import UpdateOne
+
+from ...models.documents import StockFundamentals
+from ...utils.logger import logger
+from ..http_cache import get_parsed
+from ..http_client import get_http_client
+from ..local_cache import LocalCache
+from ..singleflight import SingleFlight
+from .parser import parse_screener_page
+
+SCREENER_URL = "https://www.screener.in/company/{symbol}/{view}"
+STALE_AFTER = timedelta(days=7)
+CRAWL_CONCURRENCY = 4
+METRICS = ("pe", "pb", "roe", "roce", "debt_equity", "market_cap")
+
+_local = LocalCache(maxsize=512, ttl=3600)
+_flight = SingleFlight()
+
+
+def _is_stale(record: StockFundamentals) -> bool:
+    fetched = record.fetched_at
+    if fetched.tzinfo is None:  # Mongo hands back naive UTC datetimes
+        fetched = fetched.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - fetched > STALE_AFTER
+
+
+async def fetch_fundamentals(symbol: str) -> Optional[Dict]:
+    """Scrape the consolidated page, falling back to standalone when it has no numbers. None on failure.
+
+    Pages are revalidated with a conditional GET, so an unchanged page is not re-parsed.
+    """
+    try:
+        client = await get_http_client()
+        for view in ("consolidated/", ""):
+            data = await get_parsed(
+                client,
+                SCREENER_URL.format(symbol=symbol, view=view),
+                lambda resp: parse_screener_page(resp.text),
+                namespace="fundamentals",
+                timeout=10,
+                follow_redirects=True,
+            )
+            if data and any(data.get(m) is not None for m in METRICS):
+                return data
+    except (httpx.HTTPError, ValueError) as e:
+        logger.debug(f"Fundamentals fetch failed for {symbol}: {e}")
+    return None
+
+
+def _upsert(symbol: str, data: Dict, now: datetime) -> UpdateOne:
+    return UpdateOne(
+        {"symbol": symbol},
+        {"$set": {**data, "fetched_at": now, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+        upsert=True,
+    )
+
+
+async def refresh_fundamentals(symbols: List[str]) -> int:
+    """Crawl ``symbols`` with bounded concurrency and upsert every parsed page in one bulk write."""
+    sem = asyncio.Semaphore(CRAWL_CONCURRENCY)
+
+    async def _one(symbol: str) -> Optional[Dict]:
+        async with sem:
+            return await fetch_fundamentals(symbol)
+
+    now = datetime.now(timezone.utc)
+    results = await asyncio.gather(*[_one(s) for s in symbols])
+    ops = [_upsert(s, data, now) for s, data in zip(symbols, results) if data]
+    if ops:
+        await StockFundamentals.get_motor_collection().bulk_write(ops, ordered=False)
+        _local.clear()
+    return len(ops)
+
+
+async def _fetch_and_store(symbol: str) -> Optional[StockFundamentals]:
+    data = await fetch_fundamentals(symbol)
+    if data is None:
+        return None
+    now = datetime.now(timezone.utc)
+    try:
+        await StockFundamentals.get_motor_collection().bulk_write([_upsert(symbol, data, now)])
+    except Exception as e:
+        logger.warning(f"Fundamentals store write failed for {symbol}: {e}")
+    return StockFundamentals(symbol=symbol, fetched_at=now, **data)
+
+
+async def get_fundamentals_bulk(symbols: List[str]) -> Dict[str, StockFundamentals]:
+    """Stored fundamentals for each symbol, scraping only the ones missing or stale in the store."""
+    found: Dict[str, StockFundamentals] = {}
+    missing = []
+    for s in dict.fromkeys(symbols):
+        record = _local.get(s)
+        if record is not None:
+            found[s] = record
+        else:
+            missing.append(s)
+    if not missing:
+        return found
+
+    try:
+        stored = {r.symbol: r for r in await StockFundamentals.find({"symbol": {"$in": missing}}).to_list()}
+    except Exception as e:
+        logger.warning(f"Fundamentals store read failed: {e}")
+        stored = {}
+    stale = [s for s in missing if s not in stored or _is_stale(stored[s])]
+    fetched = await asyncio.gather(*[_flight.do(f"fundamentals:{s}", lambda s=s: _fetch_and_store(s)) for s in stale])
+    stored.update({s: r for s, r in zip(stale, fetched) if r is not None})
+
+    for s in missing:
+        if s in stored:
+            _local.set(s, stored[s])
+            found[s] = stored[s]
+    return found
+
+
+async def get_fundamentals(symbol: str) -> Optional[StockFundamentals]:
+    """Stored fundamentals for one symbol, or None when Screener has nothing for it."""
+    return (await get_fundamentals_bulk([symbol])).get(symbol)
@@ -0,0 +1,97 @@
+"""Conditional GET — ETag/Last-Modified revalidation for scraped upstream pages.
+
+``get_parsed`` sends the validators from the last full response. On ``304 Not
+Modified`` it returns the value parsed from that response without reading or
+parsing a body, so an unchanged page costs one empty round trip. Validators and
+the parsed value are cached under ``http:<namespace>:<sha1(url)>``; the namespace
+keeps two parsers of the same page (e.g. fundamentals and earnings on Screener.in)
+from reading each other's values.
+
+Callers that already keep the data elsewhere (the AMFI hashes, the IPO collection)
+use ``conditional_headers``/``remember`` directly and treat a 304 as nothing to do.
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+from ..middleware.metrics import HTTP_CONDITIONAL
+from .cache import cache_get, cache_set
+from .market.sources import BROWSER_HEADERS, rate_limited_get
+
+KEY_PREFIX = "http:"
+VALIDATOR_TTL = 2 * 86400  # Outlives the nightly crawls and daily AMFI refreshes between runs
+
+T = TypeVar("T")
+
+
+def _key(namespace: str, url: str) -> str:
+    return f"{KEY_PREFIX}{namespace}:{hashlib.sha1(url.encode()).hexdigest()}"
+
+
+def response_validators(resp: httpx.Response) -> Dict[str, str]:
+    """The response's ``ETag``/``Last-Modified`` headers; empty when the upstream sends neither."""
+    found = {}
+    if etag := resp.headers.get("etag"):
+        found["etag"] = etag
+    if modified := resp.headers.get("last-modified"):
+        found["last_modified"] = modified
+    return found
+
+
+def _request_headers(entry: Optional[Dict]) -> Dict[str, str]:
+    if not entry:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+async def conditional_headers(namespace: str, url: str) -> Dict[str, str]:
+    """``If-None-Match``/``If-Modified-Since`` for ``url`` from the last remembered response, {} if none."""
+    return _request_headers(await cache_get(_key(namespace, url)))
+
+
+async def remember(
+    namespace: str, url: str, validators: Dict[str, str], value: Any = None, ttl: int = VALIDATOR_TTL
+) -> None:
+    """Store a full response's validators (and what was parsed from it) for the next conditional request."""
+    if validators:
+        await cache_set(_key(namespace, url), {**validators, "value": value}, ttl=ttl)
+
+
+def record(result: str) -> None:
+    HTTP_CONDITIONAL.labels(result).inc()
+
+
+async def get_parsed(
+    client: httpx.AsyncClient,
+    url: str,
+    parse: Callable[[httpx.Response], T],
+    namespace: str,
+    headers: Optional[Dict[str, str]] = None,
+    **kwargs,
+) -> Optional[T]:
+    """``parse(response)`` for a 200, the last parsed value for a 304, None for any other status.
+
+    ``parse`` must return something the cache can serialize. Goes through the
+    upstream rate limiter like ``rate_limited_get``.
+    """
+    key = _key(namespace, url)
+    entry = await cache_get(key)
+    resp = await rate_limited_get(
+        client, url, headers={**(headers or BROWSER_HEADERS), **_request_headers(entry)}, **kwargs
+    )
+    if resp.status_code == 304 and entry:
+        record("not_modified")
+        return entry.get("value")
+    if resp.status_code != 200:
+        return None
+    record("fetched")
+    value = parse(resp)
+    await remember(namespace, url, response_validators(resp), value)
+    return value
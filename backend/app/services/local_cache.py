@@ -0,0 +1,47 @@
+"""In-process LRU cache with per-entry TTL — the tier in front of Redis for hot keys."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Iterator, Optional, Tuple
+
+
+class LocalCache:
+    """Bounded LRU map; entries expire ``ttl`` seconds after they are written."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def items(self) -> Iterator[Tuple[str, float, Any]]:
+        """Live ``(key, seconds left, value)`` entries, oldest first."""
+        now = time.monotonic()
+        for key, (expires_at, value) in list(self._data.items()):
+            if expires_at > now:
+                yield key, expires_at - now, value
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -1,6 +1,6 @@
 """Market services - price data, quotes"""
 
-from .multi_source_price import get_price as get_multi_source_price
 from .price_service import get_bulk_prices, get_stock_price, is_market_open
+from .provider import QuoteProvider, quote_provider
 
-__all__ = ["get_stock_price", "get_bulk_prices", "is_market_open", "get_multi_source_price"]
+__all__ = ["get_stock_price", "get_bulk_prices", "is_market_open", "QuoteProvider", "quote_provider"]
@@ -0,0 +1,68 @@
+"""Quote access tracking — which cache keys are read, and how often, across workers.
+
+Reads are counted in-process and flushed to a Redis sorted set at most every
+``FLUSH_INTERVAL`` seconds, so tracking costs one pipelined round trip per flush
+rather than one per request. The prefetch job decays the scores each run and
+drops keys that fall below ``MIN_SCORE``, so symbols nobody reads lapse on
+their own and hot ones stay ranked.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from ..cache import redis_call
+
+ACCESS_KEY = "quote:access"
+FLUSH_INTERVAL = 5.0
+DECAY = 0.8  # Score multiplier per prefetch run — older reads count for less
+MIN_SCORE = 0.5  # Below this a key has gone cold and is dropped from tracking
+
+
+class AccessTracker:
+    """Buffered read counter over a shared decaying Redis sorted set."""
+
+    def __init__(self, key: str = ACCESS_KEY, flush_interval: float = FLUSH_INTERVAL):
+        self.key = key
+        self.flush_interval = flush_interval
+        self._counts: Counter[str] = Counter()
+        self._last_flush = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, keys: Iterable[str]) -> None:
+        """Count one read of each key; schedules a background flush when the buffer is due."""
+        self._counts.update(keys)
+        if time.monotonic() - self._last_flush >= self.flush_interval and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> None:
+        counts, self._counts = self._counts, Counter()
+        self._last_flush = time.monotonic()
+        if not counts:
+            return
+
+        async def _flush(r) -> None:
+            pipe = r.pipeline(transaction=False)
+            for key, count in counts.items():
+                pipe.zincrby(self.key, count, key)
+            await pipe.execute()
+
+        await redis_call("access flush", _flush, lambda: None)  # Counts are dropped while Redis is down
+
+    async def hot(self, min_score: float, limit: int) -> List[str]:
+        """Keys scoring at least ``min_score``, hottest first — none while Redis is unavailable."""
+        return await redis_call(
+            "access read", lambda r: r.zrevrangebyscore(self.key, "+inf", min_score, start=0, num=limit), list
+        )
+
+    async def decay(self, factor: float = DECAY, min_score: float = MIN_SCORE) -> None:
+        """Scale every score by ``factor`` and drop keys that fall below ``min_score``."""
+
+        async def _decay(r) -> None:
+            pipe = r.pipeline(transaction=True)
+            pipe.zunionstore(self.key, {self.key: factor})
+            pipe.zremrangebyscore(self.key, "-inf", f"({min_score}")
+            await pipe.execute()
+
+        await redis_call("access decay", _decay, lambda: None)
@@ -0,0 +1,189 @@
+"""Candle store — daily OHLCV bars persisted in Mongo and appended incrementally.
+
+Reads are served from an in-process cache, then the ``candles`` collection.
+Upstream (Yahoo chart API) is only asked for the tail since the last stored bar,
+and at most once per completed session per symbol across all workers.
+"""
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dtime
+from typing import Dict, List, Optional
+
+import httpx
+from pymongo import ASCENDING, UpdateOne
+
+from ...core.constants import YAHOO_CHART_URL
+from ...models.documents import Candle
+from ...utils.logger import logger
+from ..cache import cache_get, cache_set
+from ..http_client import get_http_client
+from ..local_cache import LocalCache
+from ..market_calendar import IST, SESSION_OPEN, last_complete_session, market_open
+from ..singleflight import SingleFlight
+from .sources import rate_limited_get, yahoo_ticker
+
+HISTORY_DAYS = 731  # Depth of the first backfill for a new symbol
+SYNC_MARKER_TTL = 43200
+# Yahoo ``range`` values the store can answer; anything longer goes upstream directly
+PERIOD_DAYS = {"1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": HISTORY_DAYS}
+
+# symbol:exchange -> [(date, open, high, low, close, volume), ...] — tuples keep the footprint small
+_local = LocalCache(maxsize=256, ttl=300)
+_flight = SingleFlight()
+
+
+def _today() -> date:
+    return datetime.now(IST).date()
+
+
+def bar_time(day: str) -> int:
+    """Epoch seconds of a trading day's 09:15 IST open — the timestamp Yahoo uses for daily bars."""
+    return int(IST.localize(datetime.combine(date.fromisoformat(day), SESSION_OPEN)).timestamp())
+
+
+_FIELDS = ("date", "open", "high", "low", "close", "volume")
+
+
+def _to_dict(row: tuple) -> Dict:
+    return dict(zip(_FIELDS, row))
+
+
+async def fetch_yahoo_candles(symbol: str, exchange: str = "NSE", **params) -> Optional[List[Dict]]:
+    """Daily bars straight from Yahoo (``range=`` or ``period1=/period2=``). None on upstream failure."""
+    query = "&".join(f"{k}={v}" for k, v in {"interval": "1d", **params}.items())
+    try:
+        client = await get_http_client()
+        resp = await rate_limited_get(client, f"{YAHOO_CHART_URL}/{yahoo_ticker(symbol, exchange)}?{query}", timeout=10)
+        if resp.status_code != 200:
+            return None
+        result = resp.json().get("chart", {}).get("result", [{}])[0]
+        timestamps = result.get("timestamp", [])
+        quote = result.get("indicators", {}).get("quote", [{}])[0]
+        return [
+            {
+                "date": datetime.fromtimestamp(ts, IST).strftime("%Y-%m-%d"),
+                "open": round(quote["open"][i], 2) if quote["open"][i] else None,
+                "high": round(quote["high"][i], 2) if quote["high"][i] else None,
+                "low": round(quote["low"][i], 2) if quote["low"][i] else None,
+                "close": round(quote["close"][i], 2),
+                "volume": quote["volume"][i] or 0,
+            }
+            for i, ts in enumerate(timestamps)
+            if quote.get("close") and quote["close"][i]
+        ]
+    except (httpx.HTTPError, KeyError, ValueError, IndexError, TypeError) as e:
+        logger.debug(f"Candle fetch error for {symbol}: {e}")
+        return None
+
+
+async def _upsert(symbol: str, exchange: str, bars: List[Dict]) -> None:
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {"symbol": symbol, "exchange": exchange, "date": b["date"]},
+            {
+                "$set": {k: b[k] for k in ("open", "high", "low", "close", "volume")} | {"updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
+        for b in bars
+    ]
+    await Candle.get_motor_collection().bulk_write(ops, ordered=False)
+
+
+async def sync_candles(symbol: str, exchange: str = "NSE") -> int:
+    """Append bars missing since the last stored one. Returns how many bars were written."""
+    target = last_complete_session()
+    marker_key = f"candles:synced:{symbol}:{exchange}"
+    if await cache_get(marker_key) == target:
+        return 0
+
+    last = await Candle.find(Candle.symbol == symbol, Candle.exchange == exchange).sort(-Candle.date).limit(1).to_list()
+    if last and last[0].date >= target:
+        await cache_set(marker_key, target, SYNC_MARKER_TTL)
+        return 0
+
+    start = date.fromisoformat(last[0].date) + timedelta(days=1) if last else _today() - timedelta(days=HISTORY_DAYS)
+    period1 = int(IST.localize(datetime.combine(start, dtime.min)).timestamp())
+    bars = await fetch_yahoo_candles(symbol, exchange, period1=period1, period2=int(time.time()))
+    if bars is None:
+        return 0
+
+    # Only completed sessions are stored; today's in-progress bar comes from the live quote
+    bars = [b for b in bars if b["date"] <= target]
+    if bars:
+        await _upsert(symbol, exchange, bars)
+    await cache_set(marker_key, target, SYNC_MARKER_TTL)
+    return len(bars)
+
+
+async def _load(symbol: str, exchange: str) -> List[tuple]:
+    key = f"{symbol}:{exchange}"
+    rows = _local.get(key)
+    if rows is not None:
+        return rows
+
+    async def loader():
+        try:
+            await sync_candles(symbol, exchange)
+        except Exception as e:
+            logger.warning(f"Candle sync failed for {symbol}: {e}")
+        try:
+            cursor = (
+                Candle.get_motor_collection()
+                .find({"symbol": symbol, "exchange": exchange}, {"_id": 0, "symbol": 0, "exchange": 0})
+                .sort("date", ASCENDING)
+            )
+            loaded = [tuple(d.get(f) for f in _FIELDS) async for d in cursor]
+        except Exception as e:
+            # Store unavailable — answer from upstream without caching so the next call retries the store
+            logger.warning(f"Candle store read failed for {symbol}: {e}")
+            bars = await fetch_yahoo_candles(symbol, exchange, range="2y") or []
+            return [tuple(b[f] for f in _FIELDS) for b in bars]
+        _local.set(key, loaded)
+        return loaded
+
+    return await _flight.do(key, loader)
+
+
+async def get_candles(symbol: str, exchange: str = "NSE", days: int = 365) -> List[Dict]:
+    """Completed daily bars for the last ``days`` calendar days, oldest first."""
+    cutoff = (_today() - timedelta(days=days)).isoformat()
+    return [_to_dict(row) for row in await _load(symbol, exchange) if row[0] >= cutoff]
+
+
+async def get_candles_bulk(
+    symbols: List[str], exchange: str = "NSE", days: int = 365, concurrency: int = 8
+) -> Dict[str, List[Dict]]:
+    """Candles for many symbols with bounded upstream concurrency for the ones that need a sync."""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(s: str) -> List[Dict]:
+        async with sem:
+            return await get_candles(s, exchange, days)
+
+    results = await asyncio.gather(*[_one(s) for s in symbols], return_exceptions=True)
+    return {s: r for s, r in zip(symbols, results) if isinstance(r, list)}
+
+
+def with_live_bar(candles: List[Dict], quote: Optional[Dict]) -> List[Dict]:
+    """Append today's in-progress bar built from a live quote while a session is running."""
+    if not quote or not quote.get("current_price") or not market_open():
+        return candles
+    today = _today().isoformat()
+    if candles and candles[-1]["date"] >= today:
+        return candles
+    price = quote["current_price"]
+    return candles + [
+        {
+            "date": today,
+            "open": quote.get("day_open") or price,
+            "high": quote.get("day_high") or price,
+            "low": quote.get("day_low") or price,
+            "close": price,
+            "volume": quote.get("volume") or 0,
+        }
+    ]
@@ -0,0 +1,110 @@
+"""Corporate actions store — dividend and split events per symbol, refreshed in a nightly batch.
+
+Endpoints read the ``corporate_actions`` collection joined with the caller's holdings,
+so their latency no longer depends on portfolio size or the Yahoo chart API.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from pymongo import DESCENDING, UpdateOne
+
+from ...core.constants import YAHOO_CHART_URL
+from ...models.documents import CorporateAction
+from ...utils.logger import logger
+from ..http_client import get_http_client
+from ..market_calendar import IST
+from .sources import rate_limited_get, yahoo_ticker
+
+EVENTS_RANGE = "2y"
+REFRESH_CONCURRENCY = 8
+DESCRIPTIONS = {"DIVIDEND": "₹{value} per share dividend", "SPLIT": "{ratio} stock split"}
+
+
+def _ex_date(ts) -> str:
+    return datetime.fromtimestamp(int(ts), IST).strftime("%Y-%m-%d")
+
+
+def parse_chart_events(events: Dict) -> List[Dict]:
+    """Yahoo chart ``events`` → action rows. Yahoo reports bonus issues as splits, so both land as SPLIT."""
+    actions = [
+        {"action_type": "DIVIDEND", "ex_date": _ex_date(ts), "value": float(div["amount"]), "ratio": ""}
+        for ts, div in events.get("dividends", {}).items()
+        if div.get("amount")
+    ]
+    for ts, split in events.get("splits", {}).items():
+        numerator, denominator = split.get("numerator"), split.get("denominator")
+        if numerator and denominator:
+            actions.append(
+                {
+                    "action_type": "SPLIT",
+                    "ex_date": _ex_date(ts),
+                    "value": round(numerator / denominator, 4),
+                    "ratio": f"{int(numerator)}:{int(denominator)}",
+                }
+            )
+    return actions
+
+
+def describe_action(action: Dict) -> str:
+    """Human-readable line for a stored action, by its ``action_type``."""
+    return DESCRIPTIONS.get(action["action_type"], "{action_type}").format(**action)
+
+
+async def fetch_yahoo_events(symbol: str) -> Optional[List[Dict]]:
+    """Dividend and split events over ``EVENTS_RANGE``. None on upstream failure."""
+    url = f"{YAHOO_CHART_URL}/{yahoo_ticker(symbol)}?interval=1d&range={EVENTS_RANGE}&events=div%7Csplit"
+    try:
+        client = await get_http_client()
+        resp = await rate_limited_get(client, url, timeout=10)
+        if resp.status_code != 200:
+            return None
+        result = resp.json().get("chart", {}).get("result", [{}])[0]
+        return parse_chart_events(result.get("events", {}))
+    except (httpx.HTTPError, KeyError, ValueError, IndexError, TypeError) as e:
+        logger.debug(f"Corporate actions fetch error for {symbol}: {e}")
+        return None
+
+
+async def refresh_corporate_actions(symbols: List[str]) -> int:
+    """Fetch events for every symbol with bounded concurrency and upsert them in one bulk write."""
+    sem = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+    async def _one(symbol: str) -> List[Dict]:
+        async with sem:
+            return [{"symbol": symbol, **a} for a in await fetch_yahoo_events(symbol) or []]
+
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {"symbol": a["symbol"], "action_type": a["action_type"], "ex_date": a["ex_date"]},
+            {
+                "$set": {"value": a["value"], "ratio": a["ratio"], "updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
+        for actions in await asyncio.gather(*[_one(s) for s in symbols])
+        for a in actions
+    ]
+    if ops:
+        await CorporateAction.get_motor_collection().bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def find_corporate_actions(symbols: List[str], days: int = 365) -> List[Dict]:
+    """Stored actions for ``symbols`` with an ex-date in the last ``days`` days or later, newest first."""
+    if not symbols:
+        return []
+    since = (datetime.now(IST) - timedelta(days=days)).strftime("%Y-%m-%d")
+    cursor = (
+        CorporateAction.get_motor_collection()
+        .find(
+            {"symbol": {"$in": symbols}, "ex_date": {"$gte": since}},
+            {"_id": 0, "symbol": 1, "action_type": 1, "ex_date": 1, "value": 1, "ratio": 1},
+        )
+        .sort("ex_date", DESCENDING)
+    )
+    return [doc async for doc in cursor]
@@ -0,0 +1,117 @@
+"""Earnings calendar store — next results date per symbol, refreshed in a nightly batch.
+
+The portfolio calendar and the earnings-alert job both read the ``earnings_events``
+collection with an indexed date-range query, so a symbol's date is fetched once per
+night for everyone holding or watching it instead of once per user per request.
+"""
+
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from pymongo import ASCENDING, UpdateOne
+
+from ...core.constants import YAHOO_CHART_URL
+from ...models.documents import EarningsEvent
+from ...utils.logger import logger
+from ..http_cache import get_parsed
+from ..http_client import get_http_client
+from .sources import rate_limited_get, yahoo_ticker
+
+SCREENER_COMPANY_URL = "https://www.screener.in/company/{symbol}/"
+REFRESH_CONCURRENCY = 8
+
+_SCREENER_DATE_RE = re.compile(
+    r"(?:Results|Earnings|Board Meeting).*?(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})",
+    re.IGNORECASE,
+)
+
+
+def parse_screener_date(text: str) -> Optional[datetime]:
+    """First "Results/Earnings/Board Meeting … 12 Nov 2026" mention on a Screener.in page."""
+    match = _SCREENER_DATE_RE.search(text)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%d %b %Y").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _screener_date_iso(resp: httpx.Response) -> Optional[str]:
+    dt = parse_screener_date(resp.text)
+    return dt.isoformat() if dt else None  # Cached alongside the page validators, so keep it JSON-safe
+
+
+async def fetch_earnings_date(symbol: str) -> Optional[Dict]:
+    """Next earnings date from Yahoo's chart meta, falling back to Screener.in. None if neither has a future date."""
+    now = datetime.now(timezone.utc)
+    client = await get_http_client()
+    try:
+        resp = await rate_limited_get(client, f"{YAHOO_CHART_URL}/{yahoo_ticker(symbol)}", timeout=8)
+        if resp.status_code == 200:
+            meta = resp.json().get("chart", {}).get("result", [{}])[0].get("meta", {})
+            ts = meta.get("earningsTimestamp")
+            if ts and (dt := datetime.fromtimestamp(ts, tz=timezone.utc)) > now:
+                return {"earnings_date": dt, "source": "yahoo"}
+    except (httpx.HTTPError, KeyError, ValueError, IndexError, TypeError) as e:
+        logger.debug(f"Yahoo earnings fetch error for {symbol}: {e}")
+    try:
+        parsed = await get_parsed(
+            client,
+            SCREENER_COMPANY_URL.format(symbol=symbol),
+            _screener_date_iso,
+            namespace="earnings",
+            timeout=8,
+            follow_redirects=True,
+        )
+        if parsed and (dt := datetime.fromisoformat(parsed)) > now:
+            return {"earnings_date": dt, "source": "screener"}
+    except httpx.HTTPError as e:
+        logger.debug(f"Screener earnings fetch error for {symbol}: {e}")
+    return None
+
+
+async def refresh_earnings(symbols: List[str]) -> int:
+    """Fetch dates for every symbol with bounded concurrency and upsert them in one bulk write."""
+    sem = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+    async def _one(symbol: str) -> Optional[Dict]:
+        async with sem:
+            return await fetch_earnings_date(symbol)
+
+    now = datetime.now(timezone.utc)
+    results = await asyncio.gather(*[_one(s) for s in symbols])
+    ops = [
+        UpdateOne(
+            {"symbol": symbol},
+            {"$set": {**event, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+            upsert=True,
+        )
+        for symbol, event in zip(symbols, results)
+        if event
+    ]
+    if ops:
+        await EarningsEvent.get_motor_collection().bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def find_upcoming_earnings(symbols: List[str], days: Optional[int] = None) -> List[Dict]:
+    """Stored dates for ``symbols`` from today (UTC) onward — within ``days`` days if given — soonest first."""
+    if not symbols:
+        return []
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    date_range = {"$gte": today}
+    if days is not None:
+        date_range["$lt"] = today + timedelta(days=days + 1)
+    cursor = (
+        EarningsEvent.get_motor_collection()
+        .find(
+            {"symbol": {"$in": symbols}, "earnings_date": date_range},
+            {"_id": 0, "symbol": 1, "earnings_date": 1, "source": 1},
+        )
+        .sort("earnings_date", ASCENDING)
+    )
+    return [doc async for doc in cursor]
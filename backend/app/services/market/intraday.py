@@ -0,0 +1,222 @@
+"""Intraday recorder — broadcast quotes kept as per-symbol tick rings and rolled into 1m/5m bars.
+
+Each symbol holds the current session's ticks (timestamp, price, cumulative day volume)
+in preallocated NumPy arrays used as a ring buffer. Every tick is mirrored to a per-day
+Redis stream, so workers that don't run the broadcaster catch up with an incremental
+``XRANGE`` from the last stream id they saw instead of calling the Yahoo chart API.
+"""
+
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..cache import redis_call
+from ..local_cache import LocalCache
+from ..market_calendar import IST, SESSION_OPEN
+
+TICK_CAPACITY = 4800  # A 5 s broadcast fills ~4500 ticks over the 375-minute session
+STREAM_TTL = 86400
+CATCHUP_INTERVAL = 5  # Seconds between stream reads per symbol on workers that only read
+BAR_INTERVALS = {"1m": 60, "5m": 300}
+
+
+def _day(ts: float) -> date:
+    return datetime.fromtimestamp(ts, IST).date()
+
+
+def _session_open(day: date) -> float:
+    return IST.localize(datetime.combine(day, SESSION_OPEN)).timestamp()
+
+
+def _stream_key(day: date, symbol: str) -> str:
+    return f"ticks:{day.isoformat()}:{symbol}"
+
+
+class TickRing:
+    """Fixed-size ring of (timestamp, price, cumulative volume) for one symbol and one day."""
+
+    __slots__ = ("ts", "price", "volume", "start", "size", "day", "last_id", "synced_at")
+
+    def __init__(self, capacity: int = TICK_CAPACITY):
+        self.ts = np.zeros(capacity)
+        self.price = np.zeros(capacity)
+        self.volume = np.zeros(capacity)
+        self.reset(None)
+
+    def reset(self, day: Optional[date]) -> None:
+        self.start = 0
+        self.size = 0
+        self.day = day
+        self.last_id = "0-0"  # Last Redis stream id folded into the ring
+        self.synced_at = 0.0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, ts: float, price: float, volume: float) -> None:
+        capacity = len(self.ts)
+        i = (self.start + self.size) % capacity
+        self.ts[i], self.price[i], self.volume[i] = ts, price, volume
+        if self.size < capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % capacity
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Timestamps, prices and volumes, oldest first."""
+        idx = (self.start + np.arange(self.size)) % len(self.ts)
+        return self.ts[idx], self.price[idx], self.volume[idx]
+
+    def first_ts(self) -> float:
+        return float(self.ts[self.start]) if self.size else 0.0
+
+    def last_ts(self) -> float:
+        return float(self.ts[(self.start + self.size - 1) % len(self.ts)]) if self.size else 0.0
+
+    def last_price(self) -> Optional[float]:
+        return float(self.price[(self.start + self.size - 1) % len(self.ts)]) if self.size else None
+
+    def bars(self, interval: int) -> List[Dict]:
+        """OHLCV bars aligned to ``interval`` seconds. Volume is the rise in cumulative day volume per bar."""
+        ts, price, volume = self.arrays()
+        if not len(ts):
+            return []
+        buckets = (ts // interval).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(ts)] - 1
+        highs = np.maximum.reduceat(price, starts)
+        lows = np.minimum.reduceat(price, starts)
+        closing_volume = volume[ends]
+        bar_volume = np.maximum(np.diff(np.r_[volume[0], closing_volume]), 0)
+        return [
+            {
+                "time": int(buckets[s] * interval),
+                "open": round(float(price[s]), 2),
+                "high": round(float(h), 2),
+                "low": round(float(lo), 2),
+                "close": round(float(price[e]), 2),
+                "volume": int(v),
+            }
+            for s, e, h, lo, v in zip(starts, ends, highs, lows, bar_volume)
+        ]
+
+
+class IntradayRecorder:
+    """Per-symbol tick rings for the current session, mirrored to Redis streams.
+
+    Rings exist only for symbols with ticks today — recorded here or found in their
+    stream — and are dropped when the day rolls over, so reads of arbitrary symbols
+    never allocate.
+    """
+
+    def __init__(self, capacity: int = TICK_CAPACITY):
+        self.capacity = capacity
+        self._rings: Dict[str, TickRing] = {}
+        self._day: Optional[date] = None
+        self._absent = LocalCache(maxsize=1024, ttl=CATCHUP_INTERVAL)  # Symbols whose stream was empty
+
+    def _ring(self, symbol: str, day: date) -> TickRing:
+        if day != self._day:  # New session: yesterday's symbols may not be recorded today
+            self._rings.clear()
+            self._day = day
+        ring = self._rings.get(symbol)
+        if ring is None:
+            ring = self._rings[symbol] = TickRing(self.capacity)
+            ring.reset(day)
+        return ring
+
+    async def record(self, quotes: Dict[str, Dict], now: Optional[float] = None) -> None:
+        """Append one tick per quote and mirror the batch to Redis in a single pipeline.
+
+        Ticks carry the quote's ``fetched_at``; a cached quote that is no newer than the
+        ring's last tick, or is from an earlier day, is skipped rather than re-recorded.
+        """
+        now = now or time.time()
+        day = _day(now)
+        rows = []
+        for symbol, quote in quotes.items():
+            price = quote.get("current_price")
+            ts = quote.get("fetched_at")
+            if not price or not ts or _day(ts) != day:
+                continue
+            ring = self._ring(symbol, day)
+            if ts <= ring.last_ts():
+                continue
+            volume = float(quote.get("volume") or 0)
+            ring.append(ts, price, volume)
+            ring.synced_at = now
+            rows.append((symbol, ts, price, volume))
+        if not rows:
+            return
+
+        async def _mirror(r) -> List[str]:
+            pipe = r.pipeline(transaction=False)
+            for symbol, ts, price, volume in rows:
+                key = _stream_key(day, symbol)
+                pipe.xadd(key, {"t": ts, "p": price, "v": volume}, maxlen=self.capacity, approximate=True)
+                pipe.expire(key, STREAM_TTL)
+            return (await pipe.execute())[::2]
+
+        # While Redis is down the ticks stay in this worker's rings only
+        for (symbol, *_), stream_id in zip(rows, await redis_call("tick stream write", _mirror, list)):
+            self._rings[symbol].last_id = stream_id
+
+    async def _current(self, symbol: str) -> Optional[TickRing]:
+        """Ring for today, topped up from the Redis stream when this worker isn't the one recording.
+
+        None when the symbol has no ticks today; no ring is allocated for it.
+        """
+        now = time.time()
+        day = _day(now)
+        ring = self._rings.get(symbol) if day == self._day else None
+        if ring is None and self._absent.get(symbol):
+            return None
+        if ring is not None:
+            if now - ring.synced_at < CATCHUP_INTERVAL:
+                return ring
+            ring.synced_at = now
+        last_id = ring.last_id if ring is not None else "0-0"
+        lower = "-" if last_id == "0-0" else f"({last_id}"
+        entries = await redis_call(
+            "tick stream read", lambda r: r.xrange(_stream_key(day, symbol), min=lower, count=self.capacity), list
+        )
+        if ring is None:
+            if not entries:
+                self._absent.set(symbol, True)
+                return None
+            ring = self._ring(symbol, day)
+            ring.synced_at = now
+        last_ts = ring.last_ts()
+        for stream_id, fields in entries:
+            ts = float(fields["t"])
+            if ts > last_ts:  # An equal timestamp is a tick the ring already holds
+                ring.append(ts, float(fields["p"]), float(fields["v"]))
+                last_ts = ts
+            ring.last_id = stream_id
+        return ring
+
+    async def bars(self, symbol: str, interval: int = 60, full_session: bool = False) -> List[Dict]:
+        """Today's bars for ``symbol``. With ``full_session``, empty unless the ticks reach back to the open."""
+        ring = await self._current(symbol)
+        if ring is None or not len(ring):
+            return []
+        if full_session and ring.first_ts() > _session_open(ring.day) + interval:
+            return []
+        return ring.bars(interval)
+
+    async def ticks(self, symbol: str) -> List[Dict]:
+        """Raw ``{time, price}`` points for sparklines."""
+        ring = await self._current(symbol)
+        if ring is None:
+            return []
+        ts, price, _ = ring.arrays()
+        return [{"time": int(t), "price": round(float(p), 2)} for t, p in zip(ts, price)]
+
+    async def last_price(self, symbol: str) -> Optional[float]:
+        ring = await self._current(symbol)
+        return ring.last_price() if ring is not None else None
+
+
+intraday_recorder = IntradayRecorder()
@@ -1,22 +1,23 @@
-import asyncio
 import re
-import time
-from datetime import datetime
 from typing import Dict, List, Optional
 
 import httpx
 
-from ...core.constants import YAHOO_CHART_URL, YAHOO_SEARCH_URL
+from ...core.constants import YAHOO_SEARCH_URL
 from ...utils.logger import logger
-from ..cache import cache_get, cache_mget, cache_mset, cache_set
-
-# Rate limiter: max 10 requests/sec
-_last_request_time = 0
-_rate_lock = asyncio.Lock()
+from ..cache import cache_get, cache_set
+from ..http_client import get_http_client
+from ..market_calendar import market_open
+from ..mf.nav_store import get_navs, resolve_schemes
+from ..symbols.search import search_symbols
+from .candles import PERIOD_DAYS, fetch_yahoo_candles, get_candles
+from .provider import quote_provider
+from .sources import rate_limited_get
 
 # Input validation pattern - alphanumeric, dash, ampersand only
 SYMBOL_PATTERN = re.compile(r"^[A-Z0-9&-]{1,20}$")
-CACHE_PREFIX = "price:"
+SEARCH_CACHE_TTL = 86400  # Yahoo fallback results for symbols outside the local index
+SEARCH_LIMIT = 10
 
 
 def sanitize_symbol(symbol: str) -> Optional[str]:
@@ -32,156 +33,7 @@ def sanitize_symbol(symbol: str) -> Optional[str]:
 
 def is_market_open() -> bool:
     """Check if Indian stock market is open (NSE/BSE)"""
-    now = datetime.now()
-    if now.weekday() >= 5:
-        return False
-    market_start = now.replace(hour=9, minute=15, second=0, microsecond=0)
-    market_end = now.replace(hour=15, minute=30, second=0, microsecond=0)
-    return market_start <= now <= market_end
-
-
-def get_cache_ttl() -> int:
-    return 60 if is_market_open() else 3600
-
-
-async def _rate_limited_get(client: httpx.AsyncClient, url: str) -> httpx.Response:
-    global _last_request_time
-    async with _rate_lock:
-        wait = max(0, 0.1 - (time.time() - _last_request_time))
-        if wait:
-            await asyncio.sleep(wait)
-        _last_request_time = time.time()
-    return await client.get(url, headers={"User-Agent": "Mozilla/5.0"})
-
-
-# Symbols where NSE trading symbol differs from Yahoo ticker
-YAHOO_SYMBOL_MAP = {
-    "KOTAKALPHA": "ALPHA",
-}
-
-
-async def _fetch_yahoo(symbol: str, exchange: str) -> Optional[Dict]:
-    try:
-        async with httpx.AsyncClient(timeout=8) as client:
-            yahoo_sym = YAHOO_SYMBOL_MAP.get(symbol, symbol)
-            ticker = f"{yahoo_sym}.NS" if exchange == "NSE" else f"{yahoo_sym}.BO"
-            resp = await _rate_limited_get(client, f"{YAHOO_CHART_URL}/{ticker}")
-            if resp.status_code == 200:
-                meta = resp.json().get("chart", {}).get("result", [{}])[0].get("meta", {})
-                if meta.get("regularMarketPrice"):
-                    current = meta["regularMarketPrice"]
-                    prev = meta.get("previousClose", current)
-                    return {
-                        "symbol": symbol,
-                        "name": meta.get("shortName", symbol),
-                        "exchange": exchange,
-                        "current_price": current,
-                        "previous_close": prev,
-                        "day_open": meta.get("regularMarketOpen"),
-                        "day_high": meta.get("regularMarketDayHigh"),
-                        "day_low": meta.get("regularMarketDayLow"),
-                        "day_change": round(current - prev, 2),
-                        "day_change_pct": round((current - prev) / prev * 100, 2) if prev else 0,
-                        "volume": meta.get("regularMarketVolume"),
-                        "source": "yahoo",
-                    }
-    except (httpx.HTTPError, KeyError, ValueError) as e:
-        logger.debug(f"Yahoo failed for {symbol}: {e}")
-    return None
-
-
-async def _fetch_moneycontrol(symbol: str) -> Optional[Dict]:
-    MC_CODES = {
-        "RELIANCE": "RI",
-        "TCS": "TCS",
-        "HDFCBANK": "HDF01",
-        "INFY": "IT",
-        "ICICIBANK": "ICI02",
-        "SBIN": "SBI",
-        "BHARTIARTL": "BA08",
-        "ITC": "ITC",
-        "KOTAKBANK": "KMB",
-        "LT": "LT",
-        "AXISBANK": "AB16",
-        "HINDUNILVR": "HU",
-        "BAJFINANCE": "BAF",
-        "MARUTI": "MS24",
-        "TITAN": "TI01",
-        "SUNPHARMA": "SU12",
-        "WIPRO": "W",
-        "HCLTECH": "HCL02",
-        "NTPC": "NTP",
-        "POWERGRID": "PGC",
-        "ONGC": "ONG",
-        "TATASTEEL": "TIS",
-        "TATAMOTORS": "TM03",
-        "COALINDIA": "CI11",
-        "ASIANPAINT": "AP31",
-        "ULTRACEMCO": "UC",
-        "TECHM": "TM4",
-        "DRREDDY": "DRR",
-        "CIPLA": "C",
-        "DIVISLAB": "DL03",
-        "BRITANNIA": "BI01",
-        "NESTLEIND": "NI15",
-    }
-    mc_code = MC_CODES.get(symbol.upper())
-    if not mc_code:
-        return None
-    try:
-        async with httpx.AsyncClient(timeout=8) as client:
-            resp = await client.get(f"https://priceapi.moneycontrol.com/pricefeed/nse/equitycash/{mc_code}")
-            if resp.status_code == 200:
-                d = resp.json().get("data", {})
-                if d.get("pricecurrent"):
-                    current = float(d["pricecurrent"])
-                    prev = float(d.get("priceclose", current))
-                    return {
-                        "symbol": symbol,
-                        "name": d.get("SC_FULLNM", symbol),
-                        "exchange": "NSE",
-                        "current_price": current,
-                        "previous_close": prev,
-                        "day_open": float(d["priceopen"]) if d.get("priceopen") else None,
-                        "day_high": float(d["pricehigh"]) if d.get("pricehigh") else None,
-                        "day_low": float(d["pricelow"]) if d.get("pricelow") else None,
-                        "day_change": round(current - prev, 2),
-                        "day_change_pct": round((current - prev) / prev * 100, 2) if prev else 0,
-                        "volume": int(d["VOL"]) if d.get("VOL") else None,
-                        "source": "moneycontrol",
-                    }
-    except (httpx.HTTPError, KeyError, ValueError) as e:
-        logger.debug(f"MoneyControl failed for {symbol}: {e}")
-    return None
-
-
-async def _fetch_google(symbol: str) -> Optional[Dict]:
-    try:
-        async with httpx.AsyncClient(timeout=8) as client:
-            google_sym = YAHOO_SYMBOL_MAP.get(symbol, symbol)
-            resp = await client.get(
-                f"https://www.google.com/finance/quote/{google_sym}:NSE",
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
-            if resp.status_code == 200:
-                price_match = re.search(r'data-last-price="([\d.]+)"', resp.text)
-                prev_match = re.search(r'data-previous-close="([\d.]+)"', resp.text)
-                if price_match:
-                    current = float(price_match.group(1))
-                    prev = float(prev_match.group(1)) if prev_match else current
-                    return {
-                        "symbol": symbol,
-                        "name": symbol,
-                        "exchange": "NSE",
-                        "current_price": current,
-                        "previous_close": prev,
-                        "day_change": round(current - prev, 2),
-                        "day_change_pct": round((current - prev) / prev * 100, 2) if prev else 0,
-                        "source": "google",
-                    }
-    except (httpx.HTTPError, KeyError, ValueError) as e:
-        logger.debug(f"Google failed for {symbol}: {e}")
-    return None
+    return market_open()
 
 
 async def get_stock_price(symbol: str, exchange: str = "NSE") -> Optional[Dict]:
@@ -189,176 +41,84 @@ async def get_stock_price(symbol: str, exchange: str = "NSE") -> Optional[Dict]:
     symbol = sanitize_symbol(symbol)
     if not symbol:
         return None
-
-    cache_key = f"{CACHE_PREFIX}{symbol}:{exchange}"
-    cache_ttl = get_cache_ttl()
-
-    # Check Redis cache
-    cached = await cache_get(cache_key)
-    if cached:
-        return cached
-
-    # Try sources in order: Yahoo -> MoneyControl -> Google
-    data = await _fetch_yahoo(symbol, exchange)
-    if not data:
-        data = await _fetch_moneycontrol(symbol)
-    if not data:
-        data = await _fetch_google(symbol)
-
-    if data:
-        await cache_set(cache_key, data, cache_ttl)
-        return data
-
-    logger.warning(f"All sources failed for {symbol}")
-    return None
+    return await quote_provider.get(symbol, exchange)
 
 
 async def get_bulk_prices(symbols: List[str], exchange: str = "NSE") -> Dict[str, Dict]:
     """Fetch prices for multiple symbols with Redis caching."""
-    symbols = [s for s in (sanitize_symbol(s) for s in symbols) if s]
-    if not symbols:
-        return {}
-
-    cache_ttl = get_cache_ttl()
-    cache_keys = [f"{CACHE_PREFIX}{s}:{exchange}" for s in symbols]
+    symbols = list(dict.fromkeys(s for s in (sanitize_symbol(s) for s in symbols) if s))
+    return await quote_provider.get_many(symbols, exchange)
 
-    # Batch get from Redis
-    cached = await cache_mget(cache_keys)
-    prices = {}
-    uncached = []
 
-    for symbol, key in zip(symbols, cache_keys):
-        if cached.get(key):
-            prices[symbol] = cached[key]
-        else:
-            uncached.append(symbol)
-
-    if not uncached:
-        return prices
-
-    # Fetch uncached symbols concurrently
-    tasks = [get_stock_price(s, exchange) for s in uncached]
-    results = await asyncio.gather(*tasks)
-
-    # Batch set to Redis
-    to_cache = {}
-    for symbol, data in zip(uncached, results):
-        if data:
-            prices[symbol] = data
-            to_cache[f"{CACHE_PREFIX}{symbol}:{exchange}"] = data
+async def search_stock(query: str) -> List[Dict]:
+    """Search stocks - local symbol index first, merged with Yahoo unless it matched exactly or filled the page.
 
-    if to_cache:
-        await cache_mset(to_cache, cache_ttl)
+    The index covers only the symbol master, so partial or fuzzy local hits are
+    topped up from Yahoo: prefix matches first, then Yahoo, then fuzzy matches.
+    """
+    matched = search_symbols(query, SEARCH_LIMIT, fuzzy=False)
+    exact = query.strip().upper().replace(" ", "")
+    if len(matched) >= SEARCH_LIMIT or any(r["symbol"] == exact for r in matched):
+        return matched
 
-    return prices
+    merged: Dict[tuple, Dict] = {}
+    for r in matched + await _search_yahoo(query) + search_symbols(query, SEARCH_LIMIT):
+        merged.setdefault((r["symbol"], r["exchange"]), r)
+    return list(merged.values())[:SEARCH_LIMIT]
 
 
-async def search_stock(query: str) -> List[Dict]:
-    """Search stocks - filters out MF codes, prioritizes NSE"""
+async def _search_yahoo(query: str) -> List[Dict]:
+    cache_key = f"search:{query.strip().upper()}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            url = f"{YAHOO_SEARCH_URL}?q={query}&quotesCount=20"
-            resp = await _rate_limited_get(client, url)
-            if resp.status_code == 200:
-                data = resp.json()
-                nse_results = []
-                bse_results = []
-                for q in data.get("quotes", []):
-                    symbol = q.get("symbol", "")
-                    name = q.get("shortname") or q.get("longname") or symbol
-                    # Skip MF codes (start with 0P or contain only alphanumeric gibberish)
-                    base_symbol = symbol.replace(".NS", "").replace(".BO", "")
-                    if base_symbol.startswith("0P") or not any(c.isalpha() for c in base_symbol[:3]):
-                        continue
-                    if ".NS" in symbol:
-                        nse_results.append({"symbol": base_symbol, "name": name, "exchange": "NSE"})
-                    elif ".BO" in symbol:
-                        bse_results.append({"symbol": base_symbol, "name": name, "exchange": "BSE"})
-                # Prioritize NSE, then BSE
-                return (nse_results + bse_results)[:10]
+        client = await get_http_client()
+        url = f"{YAHOO_SEARCH_URL}?q={query}&quotesCount=20"
+        resp = await rate_limited_get(client, url, timeout=10)
+        if resp.status_code == 200:
+            data = resp.json()
+            nse_results = []
+            bse_results = []
+            for q in data.get("quotes", []):
+                symbol = q.get("symbol", "")
+                name = q.get("shortname") or q.get("longname") or symbol
+                # Skip MF codes (start with 0P or contain only alphanumeric gibberish)
+                base_symbol = symbol.replace(".NS", "").replace(".BO", "")
+                if base_symbol.startswith("0P") or not any(c.isalpha() for c in base_symbol[:3]):
+                    continue
+                if ".NS" in symbol:
+                    nse_results.append({"symbol": base_symbol, "name": name, "exchange": "NSE"})
+                elif ".BO" in symbol:
+                    bse_results.append({"symbol": base_symbol, "name": name, "exchange": "BSE"})
+            # Prioritize NSE, then BSE
+            results = (nse_results + bse_results)[:SEARCH_LIMIT]
+            await cache_set(cache_key, results, SEARCH_CACHE_TTL)
+            return results
     except (httpx.HTTPError, KeyError, ValueError) as e:
         logger.error(f"Error searching {query}: {e}")
     return []
 
 
 async def get_historical_data(symbol: str, exchange: str = "NSE", period: str = "1y") -> List[Dict]:
-    """Fetch historical OHLCV data from Yahoo Finance."""
+    """Daily OHLCV history — from the candle store, or Yahoo directly for ranges deeper than it keeps."""
     symbol = sanitize_symbol(symbol)
     if not symbol:
         return []
+    if period in PERIOD_DAYS:
+        return await get_candles(symbol, exchange, days=PERIOD_DAYS[period])
+    return await fetch_yahoo_candles(symbol, exchange, range=period) or []
 
-    try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            ticker = f"{symbol}.NS" if exchange == "NSE" else f"{symbol}.BO"
-            resp = await _rate_limited_get(client, f"{YAHOO_CHART_URL}/{ticker}?interval=1d&range={period}")
-            if resp.status_code == 200:
-                result = resp.json().get("chart", {}).get("result", [{}])[0]
-                timestamps = result.get("timestamp", [])
-                quote = result.get("indicators", {}).get("quote", [{}])[0]
-                return [
-                    {
-                        "date": datetime.fromtimestamp(ts).strftime("%Y-%m-%d"),
-                        "open": round(quote["open"][i], 2) if quote["open"][i] else None,
-                        "high": round(quote["high"][i], 2) if quote["high"][i] else None,
-                        "low": round(quote["low"][i], 2) if quote["low"][i] else None,
-                        "close": round(quote["close"][i], 2) if quote["close"][i] else None,
-                        "volume": quote["volume"][i] or 0,
-                    }
-                    for i, ts in enumerate(timestamps)
-                    if quote.get("close") and quote["close"][i]
-                ]
-    except (httpx.HTTPError, KeyError, ValueError, IndexError) as e:
-        logger.error(f"Historical data error for {symbol}: {e}")
-    return []
-
-
-# AMFI NAV data for Mutual Funds
-AMFI_NAV_URL = "https://www.amfiindia.com/spages/NAVAll.txt"
-
-# Map custom MF symbols to AMFI scheme codes
-MF_SCHEME_CODES = {
-    "PPFAS": "122639",  # Parag Parikh Flexi Cap Fund Direct Growth
-    "BANDHAN-SC": "145455",  # Bandhan Small Cap Fund Direct Growth
-    "KOTAK-LM": "120503",  # Kotak Large & Midcap Fund Direct Growth
-    "HDFC-MC": "101762",  # HDFC Mid Cap Fund Direct Growth
-    "AXIS-LIQ": "119064",  # Axis Liquid Direct Fund Growth
-    "MOTILAL-MC": "147622",  # Motilal Oswal Midcap Fund Direct Growth
-    "PGIM-USD": "149295",  # PGIM India Ultra Short Duration Direct Growth
-}
 
+async def get_bulk_mf_nav(symbols: List[str], names: Optional[Dict[str, str]] = None) -> Dict[str, Dict]:
+    """Get NAV for multiple mutual funds from AMFI.
 
-async def get_bulk_mf_nav(symbols: List[str]) -> Dict[str, Dict]:
-    """Get NAV for multiple mutual funds from AMFI."""
+    Symbols that are scheme codes or ISINs resolve directly; anything else goes
+    through the scheme-name index, using ``names`` (symbol -> scheme name) when given.
+    """
     if not symbols:
         return {}
-
-    # Check Redis cache for all NAVs
-    cache_key = "amfi:navs"
-    cached = await cache_get(cache_key)
-
-    if not cached:
-        # Fetch from AMFI
-        try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(AMFI_NAV_URL)
-                if resp.status_code == 200:
-                    cached = {}
-                    for line in resp.text.split("\n"):
-                        parts = line.strip().split(";")
-                        if len(parts) >= 5 and parts[0].isdigit():
-                            cached[parts[0]] = float(parts[4]) if parts[4] else 0
-                    await cache_set(cache_key, cached, 3600)  # Cache 1 hour
-        except Exception as e:
-            logger.error(f"AMFI NAV fetch error: {e}")
-            return {}
-
-    if not cached:
-        return {}
-
-    # Map symbols to NAVs
-    results = {}
-    for symbol in symbols:
-        scheme_code = MF_SCHEME_CODES.get(symbol.upper())
-        if scheme_code and scheme_code in cached:
-            results[symbol] = {"nav": cached[scheme_code]}
-    return results
+    names = names or {}
+    codes = await resolve_schemes({s: names.get(s) or s for s in symbols})
+    navs = await get_navs(list(codes.values()))
+    return {symbol: navs[code] for symbol, code in codes.items() if code in navs}
@@ -0,0 +1,311 @@
+"""QuoteProvider — the single path for live quotes.
+
+Walks a chain of source adapters over the shared pooled HTTP client — ordered by
+observed latency and error rate, with a hedged request when one runs slow — and
+caches normalized quotes under ``price:{symbol}:{exchange}`` in two tiers: a small
+in-process LRU in front of Redis. Stale quotes are served immediately and refreshed
+in the background. True misses go through batch sources first (many tickers per
+request), then the per-symbol chain, and are single-flighted so concurrent callers
+and workers share one upstream request per symbol. Reads are counted so a periodic
+job can refresh hot symbols before they go stale (see ``refresh_hot``).
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from ...utils.logger import logger
+from ..cache import cache_mget, cache_mset, market_ttl
+from ..http_client import get_http_client
+from ..local_cache import LocalCache
+from ..market_calendar import last_close
+from ..singleflight import SingleFlight, claim, release, wait_for_peers
+from .access_tracker import AccessTracker
+from .source_stats import SourceStats
+from .sources import BatchQuoteSource, QuoteSource, default_batch_sources, default_sources
+
+CACHE_PREFIX = "price:"
+FETCH_LOCK_TTL = 15  # Seconds a worker may hold the upstream claim for a symbol
+PEER_WAIT_TIMEOUT = 5.0  # How long to wait for another worker's result before fetching ourselves
+STALE_GRACE = 300  # Redis keeps quotes this long past freshness so stale hits can be served while refreshing
+LOCAL_TTL = 5  # In-process tier TTL — short so workers converge on the Redis value quickly
+LOCAL_MAXSIZE = 2048
+HEDGE_DELAY = 1.0  # Hedge after this long while the running source has no latency history
+MIN_HEDGE_DELAY = 0.1  # Never hedge sooner, however fast a source's p95
+MAX_IN_FLIGHT = 2  # Primary plus one hedge
+HOT_LIMIT = 500  # Most keys refresh_hot will keep warm
+HOT_MIN_SCORE = 2.0  # Decayed read count that makes a key hot
+PREFETCH_BATCH = 100  # Symbols per upstream round in prefetch — keeps one warmup from saturating the limiter
+
+
+def quote_cache_key(symbol: str, exchange: str = "NSE") -> str:
+    return f"{CACHE_PREFIX}{symbol}:{exchange}"
+
+
+def quote_ttl() -> int:
+    """How long a quote counts as fresh: short while the market is open, until the next open when closed."""
+    return market_ttl(60, None)
+
+
+def fresh_until(quote: Dict) -> float:
+    """When a quote stops counting as fresh — a stamped ``fresh_until`` (warmed entries), else by ``quote_ttl``."""
+    return quote.get("fresh_until") or quote.get("fetched_at", 0) + quote_ttl()
+
+
+def is_stale(quote: Dict) -> bool:
+    """Past its freshness window — still servable, but due for a background refresh.
+
+    A quote taken before the latest session close is always stale so the closing
+    print replaces it, however long the market then stays shut.
+    """
+    return quote.get("fetched_at", 0) < last_close() or time.time() > fresh_until(quote)
+
+
+class QuoteProvider:
+    """Cache-fronted quote fetching over pluggable source adapters."""
+
+    def __init__(
+        self,
+        sources: Optional[List[QuoteSource]] = None,
+        batch_sources: Optional[List[BatchQuoteSource]] = None,
+    ):
+        self.sources = sources if sources is not None else default_sources()
+        self.batch_sources = batch_sources if batch_sources is not None else default_batch_sources()
+        self._flight = SingleFlight()
+        self._local = LocalCache(maxsize=LOCAL_MAXSIZE, ttl=LOCAL_TTL)
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self.access = AccessTracker()
+        self.stats = SourceStats()
+
+    async def fetch(self, symbol: str, exchange: str = "NSE") -> Optional[Dict]:
+        """Fetch from upstream (no cache) over the sources, cheapest first by observed latency and errors.
+
+        A failed source hands over to the next at once; one still running past its
+        p95 gets a hedged request to the next source. At most ``MAX_IN_FLIGHT`` run
+        together, the first good answer wins and the rest are cancelled.
+        """
+        queue = self.stats.order([s for s in self.sources if s.supports(symbol, exchange)])
+        client = await get_http_client()
+        pending: Dict[asyncio.Task, QuoteSource] = {}
+
+        def launch() -> QuoteSource:
+            source = queue.pop(0)
+            pending[asyncio.create_task(self._timed_fetch(source, client, symbol, exchange))] = source
+            return source
+
+        try:
+            latest = launch() if queue else None
+            while pending:
+                can_hedge = queue and len(pending) < MAX_IN_FLIGHT
+                timeout = self._hedge_delay(latest) if can_hedge else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    latest = launch()
+                    continue
+                for task in done:
+                    pending.pop(task)
+                    if data := task.result():
+                        return data
+                if queue and len(pending) < MAX_IN_FLIGHT:
+                    latest = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        logger.warning(f"All sources failed for {symbol}")
+        return None
+
+    def _hedge_delay(self, source: QuoteSource) -> float:
+        p95 = self.stats.percentile(source.name, 0.95)
+        return max(p95 if p95 is not None else HEDGE_DELAY, MIN_HEDGE_DELAY)
+
+    async def _timed_fetch(self, source: QuoteSource, client, symbol: str, exchange: str) -> Optional[Dict]:
+        start = time.perf_counter()
+        try:
+            data = await source.fetch(client, symbol, exchange)
+        except asyncio.CancelledError:
+            self.stats.observe(source.name, time.perf_counter() - start, None)
+            raise
+        except Exception as e:
+            logger.debug(f"{source.name} raised for {symbol}: {e}")
+            data = None
+        self.stats.observe(source.name, time.perf_counter() - start, data is not None)
+        return data
+
+    async def fetch_many(self, symbols: List[str], exchange: str = "NSE") -> Dict[str, Dict]:
+        """Fetch many symbols from upstream (no cache): chunked batch requests, then per-symbol fallback."""
+        if not symbols:
+            return {}
+        client = await get_http_client()
+        results: Dict[str, Dict] = {}
+        for source in self.batch_sources:
+            remaining = [s for s in symbols if s not in results]
+            if not remaining:
+                break
+            size = source.batch_size
+            chunks = [remaining[i : i + size] for i in range(0, len(remaining), size)]
+            for chunk_result in await asyncio.gather(*[source.fetch_many(client, c, exchange) for c in chunks]):
+                results.update(chunk_result)
+
+        misses = [s for s in symbols if s not in results]
+        if misses:
+            fetched = await asyncio.gather(*[self.fetch(s, exchange) for s in misses])
+            results.update({s: data for s, data in zip(misses, fetched) if data})
+        return results
+
+    async def get(self, symbol: str, exchange: str = "NSE") -> Optional[Dict]:
+        """Cached quote for one symbol."""
+        return (await self.get_many([symbol], exchange)).get(symbol)
+
+    async def get_many(self, symbols: List[str], exchange: str = "NSE") -> Dict[str, Dict]:
+        """Cached quotes for many symbols.
+
+        Reads the in-process LRU first, then one MGET for the rest. Stale hits are
+        served as-is and refreshed in the background; only true misses block on the
+        coalesced upstream fetch.
+        """
+        if not symbols:
+            return {}
+
+        keys = {quote_cache_key(s, exchange): s for s in symbols}
+        self.access.record(keys)
+        found: Dict[str, Dict] = {}
+        remote = []
+        for key in keys:
+            local = self._local.get(key)
+            if local:
+                found[key] = local
+            else:
+                remote.append(key)
+
+        if remote:
+            cached = await cache_mget(remote)
+            for key in remote:
+                if cached.get(key):
+                    found[key] = cached[key]
+                    self._local.set(key, cached[key])
+
+        stale = [k for k, data in found.items() if is_stale(data)]
+        if stale:
+            self._revalidate({k: keys[k] for k in stale}, exchange)
+
+        prices = {keys[k]: data for k, data in found.items()}
+        missed = [k for k in keys if k not in found]
+        if not missed:
+            return prices
+
+        async def _load(owned: List[str]) -> Dict[str, Dict]:
+            return await self._load_shared({k: keys[k] for k in owned}, exchange)
+
+        loaded = await self._flight.do_many(missed, _load)
+        for key, data in loaded.items():
+            if data:
+                prices[keys[key]] = data
+        return prices
+
+    def _revalidate(self, keys: Dict[str, str], exchange: str) -> None:
+        """Refresh stale keys in the background; callers keep the stale quote meanwhile."""
+        fresh_keys = [k for k in keys if k not in self._refreshing]
+        if not fresh_keys:
+            return
+
+        async def _load(owned: List[str]) -> Dict[str, Dict]:
+            return await self._load_shared({k: keys[k] for k in owned}, exchange, wait=False)
+
+        async def _run():
+            try:
+                await self._flight.do_many(fresh_keys, _load)
+            except Exception as e:
+                logger.debug(f"Background quote refresh failed: {e}")
+            finally:
+                self._refreshing.difference_update(fresh_keys)
+
+        self._refreshing.update(fresh_keys)
+        task = asyncio.create_task(_run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load_shared(self, keys: Dict[str, str], exchange: str, wait: bool = True) -> Dict[str, Dict]:
+        """Cross-worker leg: fetch the keys we claim, wait for peers to publish the rest.
+
+        ``wait=False`` is for background refreshes — a peer already holding the claim
+        is refreshing that key, so there is nothing left for us to do.
+        """
+        owned = await claim(list(keys), FETCH_LOCK_TTL)
+        results: Dict[str, Dict] = {}
+        try:
+            results.update(await self._fetch_and_store({k: keys[k] for k in owned}, exchange))
+        finally:
+            await release(owned)
+
+        pending = [k for k in keys if k not in owned]
+        if pending and wait:
+            results.update(await wait_for_peers(pending, cache_mget, timeout=PEER_WAIT_TIMEOUT))
+            # Peer died or failed — fetch the leftovers ourselves rather than return nothing
+            leftover = {k: keys[k] for k in pending if k not in results}
+            if leftover:
+                results.update(await self._fetch_and_store(leftover, exchange))
+        return results
+
+    async def prefetch(
+        self, symbols: List[str], exchange: str = "NSE", ttl: Optional[int] = None, batch_size: int = PREFETCH_BATCH
+    ) -> int:
+        """Fetch ``symbols`` from upstream in batches and overwrite their cached quotes.
+
+        ``ttl`` replaces the freshness window: entries are stamped ``fresh_until`` now + ttl
+        and stored for that long, so quotes warmed before the open stay fresh through the
+        opening bell until the hot-key refresh replaces them. Returns how many were stored.
+        """
+        stored = 0
+        for i in range(0, len(symbols), batch_size):
+            batch = symbols[i : i + batch_size]
+            stored += len(await self._fetch_and_store({quote_cache_key(s, exchange): s for s in batch}, exchange, ttl))
+        return stored
+
+    async def refresh_hot(self, lead: float, limit: int = HOT_LIMIT, min_score: float = HOT_MIN_SCORE) -> int:
+        """Refresh frequently read keys that are missing or go stale within ``lead`` seconds.
+
+        Cold keys are left to lapse. Claims are shared with on-demand loads, so a key
+        another worker is already fetching is skipped. Returns how many were refreshed.
+        """
+        await self.access.flush()
+        await self.access.decay()
+        hot = await self.access.hot(min_score, limit)
+        if not hot:
+            return 0
+        cached = await cache_mget(hot)
+        horizon, close = time.time() + lead, last_close()
+        due: Dict[str, Dict[str, str]] = {}
+        for key in hot:
+            quote = cached.get(key) or {}
+            if quote.get("fetched_at", 0) > close and fresh_until(quote) > horizon:
+                continue
+            _, symbol, exchange = key.split(":", 2)
+            due.setdefault(exchange, {})[key] = symbol
+
+        refreshed = 0
+        for exchange, keys in due.items():
+
+            async def _load(owned: List[str], keys=keys, exchange=exchange) -> Dict[str, Dict]:
+                return await self._load_shared({k: keys[k] for k in owned}, exchange, wait=False)
+
+            loaded = await self._flight.do_many(list(keys), _load)
+            refreshed += sum(1 for data in loaded.values() if data)
+        return refreshed
+
+    async def _fetch_and_store(self, keys: Dict[str, str], exchange: str, ttl: Optional[int] = None) -> Dict[str, Dict]:
+        if not keys:
+            return {}
+        fetched = await self.fetch_many(list(keys.values()), exchange)
+        results = {key: fetched[symbol] for key, symbol in keys.items() if symbol in fetched}
+        if ttl:
+            for data in results.values():
+                data["fresh_until"] = round(time.time() + ttl, 3)
+        if results:
+            await cache_mset(results, (ttl or quote_ttl()) + STALE_GRACE)
+            for key, data in results.items():
+                self._local.set(key, data)
+        return results
+
+
+quote_provider = QuoteProvider()
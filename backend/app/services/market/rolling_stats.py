@@ -0,0 +1,147 @@
+"""Rolling statistics — 52w range, 20d average volume, SMA20/50/200 and ATR14 per symbol.
+
+Recomputed from the candle store once per completed session (after the close) and kept
+in the ``rolling_stats`` collection, so alerts, screeners and signals read a few floats
+per symbol instead of scanning a year of bars on every call. Values are as of the last
+completed session; callers combine them with the live quote.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from pymongo import UpdateOne
+
+from ...models.documents import RollingStats
+from ...utils.logger import logger
+from ..local_cache import LocalCache
+from ..market_calendar import last_complete_session
+from .candles import get_candles, get_candles_bulk
+
+LOOKBACK_DAYS = 400  # Calendar days of bars needed for a 200-session SMA
+YEAR_SESSIONS = 252
+STAT_FIELDS = ("high_52w", "low_52w", "avg_volume_20d", "sma_20", "sma_50", "sma_200", "atr_14")
+
+_local = LocalCache(maxsize=4096, ttl=3600)
+# "session:symbol" keys recomputed on read, so halted or candle-less symbols whose rows can't
+# reach the session are retried once per session rather than on every read
+_attempted = LocalCache(maxsize=4096, ttl=86400)
+
+
+def _mean_tail(values: np.ndarray, n: int) -> Optional[float]:
+    return round(float(values[-n:].mean()), 2) if len(values) >= n else None
+
+
+def compute_stats(candles: List[Dict]) -> Optional[Dict]:
+    """Stats over completed daily bars (oldest first). None when there are no bars."""
+    bars = [c for c in candles if c.get("close")]
+    if not bars:
+        return None
+    close = np.array([c["close"] for c in bars], dtype=float)
+    high = np.array([c["high"] or c["close"] for c in bars], dtype=float)
+    low = np.array([c["low"] or c["close"] for c in bars], dtype=float)
+    volume = np.array([c["volume"] or 0 for c in bars], dtype=float)
+
+    year_high, year_low = high[-YEAR_SESSIONS:], low[-YEAR_SESSIONS:]
+    prev_close = np.r_[close[0], close[:-1]]
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return {
+        "as_of": bars[-1]["date"],
+        "last_close": float(close[-1]),
+        "high_52w": round(float(year_high.max()), 2),
+        "low_52w": round(float(year_low.min()), 2),
+        "avg_volume_20d": _mean_tail(volume, 20),
+        "sma_20": _mean_tail(close, 20),
+        "sma_50": _mean_tail(close, 50),
+        "sma_200": _mean_tail(close, 200),
+        "atr_14": _mean_tail(true_range[1:], 14),
+    }
+
+
+def _upsert(symbol: str, stats: Dict, now: datetime) -> UpdateOne:
+    return UpdateOne(
+        {"symbol": symbol},
+        {"$set": {**stats, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+        upsert=True,
+    )
+
+
+async def refresh_rolling_stats(symbols: List[str]) -> int:
+    """Recompute stats for symbols whose stored row predates the last completed session."""
+    session = last_complete_session()
+    current = {
+        d["symbol"]
+        async for d in RollingStats.get_motor_collection().find(
+            {"symbol": {"$in": symbols}, "as_of": {"$gte": session}}, {"_id": 0, "symbol": 1}
+        )
+    }
+    pending = [s for s in symbols if s not in current]
+    if not pending:
+        return 0
+    history = await get_candles_bulk(pending, days=LOOKBACK_DAYS)
+    now = datetime.now(timezone.utc)
+    ops = []
+    for symbol, candles in history.items():
+        stats = compute_stats(candles)
+        if stats:
+            ops.append(_upsert(symbol, stats, now))
+            _local.set(symbol, {"symbol": symbol, **stats})
+    if ops:
+        await RollingStats.get_motor_collection().bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def _compute_and_store(symbol: str) -> Optional[Dict]:
+    stats = compute_stats(await get_candles(symbol, days=LOOKBACK_DAYS))
+    if stats is None:
+        return None
+    try:
+        await RollingStats.get_motor_collection().bulk_write([_upsert(symbol, stats, datetime.now(timezone.utc))])
+    except Exception as e:
+        logger.warning(f"Rolling stats write failed for {symbol}: {e}")
+    return {"symbol": symbol, **stats}
+
+
+async def get_rolling_stats(symbols: List[str], compute_missing: bool = True) -> Dict[str, Dict]:
+    """Stats for each symbol from memory, then one ``$in`` read; rows missing from the table or
+    older than the last completed session are computed from candles and written back unless
+    ``compute_missing`` is False (a stale row is then returned as-is). Each symbol is
+    computed at most once per session, even if its row still can't reach it."""
+    session = last_complete_session()
+    found: Dict[str, Dict] = {}
+    missing = []
+    for s in dict.fromkeys(symbols):
+        stats = _local.get(s)
+        if stats is not None and (stats.get("as_of", "") >= session or _attempted.get(f"{session}:{s}")):
+            found[s] = stats
+        else:
+            missing.append(s)
+    if not missing:
+        return found
+
+    try:
+        cursor = RollingStats.get_motor_collection().find(
+            {"symbol": {"$in": missing}}, {"_id": 0, "created_at": 0, "updated_at": 0}
+        )
+        stored = {d["symbol"]: d async for d in cursor}
+    except Exception as e:
+        logger.warning(f"Rolling stats read failed: {e}")
+        stored = {}
+    # The nightly job only covers held and master symbols; anything else is refreshed here on read
+    due = [
+        s
+        for s in missing
+        if (s not in stored or stored[s].get("as_of", "") < session) and not _attempted.get(f"{session}:{s}")
+    ]
+    if not compute_missing:
+        due = []
+    for s in due:
+        _attempted.set(f"{session}:{s}", True)
+    for s, stats in zip(due, await asyncio.gather(*[_compute_and_store(s) for s in due])):
+        if stats:
+            stored[s] = stats
+    for s, stats in stored.items():
+        _local.set(s, stats)
+        found[s] = stats
+    return found
@@ -0,0 +1,182 @@
+"""Universe screener — NumPy columns of fundamentals, rolling stats and latest prices for every symbol.
+
+Filters are evaluated as vectorized boolean masks over the whole universe and results
+are ranked with a partial sort, so a screen is a handful of array operations instead of
+a fetch per candidate. The frame is rebuilt from the quote cache, the fundamentals store
+and the rolling-stats table at most once per ``market_ttl`` window; missing values are
+NaN and never match.
+"""
+
+import operator
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from ...models.documents import RollingStats, StockFundamentals
+from ...utils.logger import logger
+from ..cache import market_ttl
+from ..local_cache import LocalCache
+from ..singleflight import SingleFlight
+from ..symbols import get_symbol_master
+from .price_service import get_bulk_prices
+
+FUNDAMENTAL_COLUMNS = ("market_cap", "pe", "pb", "roe", "roce", "debt_equity", "dividend_yield", "high_52w", "low_52w")
+STAT_COLUMNS = ("avg_volume_20d", "sma_20", "sma_50", "sma_200", "atr_14")
+QUOTE_COLUMNS = ("price", "change_pct", "volume")
+DERIVED_COLUMNS = ("pct_of_high", "pct_above_low", "volume_ratio")
+STORED_COLUMNS = FUNDAMENTAL_COLUMNS + STAT_COLUMNS
+COLUMNS = QUOTE_COLUMNS + STORED_COLUMNS + DERIVED_COLUMNS
+STORED_TTL = 3600
+
+OPS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+_FILTER_RE = re.compile(r"^\s*([a-z_0-9]+)\s*(<=|>=|==|!=|<|>)\s*(-?\d+(?:\.\d+)?)\s*$")
+
+_local = LocalCache(maxsize=2, ttl=STORED_TTL)
+_flight = SingleFlight()
+
+
+class Filter(NamedTuple):
+    column: str
+    op: str
+    value: float
+
+
+class Screen(NamedTuple):
+    filters: List[Filter]
+    sort_by: str
+    descending: bool = True
+
+
+# Predefined screens served by /screener/run/{screen_id}
+SCREENS: Dict[str, Screen] = {
+    "gainers": Screen([Filter("change_pct", ">", 0)], "change_pct"),
+    "losers": Screen([Filter("change_pct", "<", 0)], "change_pct", descending=False),
+    "52w_high": Screen([Filter("pct_of_high", ">=", 95)], "pct_of_high"),
+    "52w_low": Screen([Filter("pct_above_low", "<=", 105)], "pct_above_low", descending=False),
+    "high_volume": Screen([Filter("volume_ratio", ">=", 1.5)], "volume_ratio"),
+}
+
+
+def parse_filters(expr: str) -> List[Filter]:
+    """``"pe<=20, roe>15"`` → filters. Raises ValueError on unknown columns or malformed terms."""
+    filters = []
+    for term in filter(str.strip, expr.lower().split(",")):
+        match = _FILTER_RE.match(term)
+        if not match:
+            raise ValueError(f"Invalid filter: {term.strip()}")
+        column, op, value = match.groups()
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown screener column: {column}")
+        filters.append(Filter(column, op, float(value)))
+    return filters
+
+
+class ScreenerFrame:
+    """Column-oriented snapshot of the universe: one float64 array per column, NaN for missing."""
+
+    def __init__(self, symbols: List[str], columns: Dict[str, np.ndarray]):
+        self.symbols = symbols
+        self.columns = columns
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.columns["pct_of_high"] = columns["price"] / columns["high_52w"] * 100
+            self.columns["pct_above_low"] = columns["price"] / columns["low_52w"] * 100
+            self.columns["volume_ratio"] = columns["volume"] / columns["avg_volume_20d"]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def mask(self, filters: List[Filter]) -> np.ndarray:
+        mask = np.ones(len(self.symbols), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for f in filters:
+                mask &= OPS[f.op](self.columns[f.column], f.value)
+        return mask
+
+    def screen(
+        self, filters: List[Filter], sort_by: Optional[str] = None, descending: bool = True, limit: int = 50
+    ) -> List[Dict]:
+        """Rows matching every filter, ranked by ``sort_by`` (missing values last), top ``limit`` only."""
+        limit = max(1, limit)
+        idx = np.flatnonzero(self.mask(filters))
+        if sort_by and len(idx):
+            keys = self.columns[sort_by][idx]
+            keys = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+            if limit < len(idx):
+                top = np.argpartition(keys, limit - 1)[:limit]
+                idx = idx[top[np.argsort(keys[top], kind="stable")]]
+            else:
+                idx = idx[np.argsort(keys, kind="stable")]
+        return [self._row(i) for i in idx[:limit]]
+
+    def _row(self, i: int) -> Dict:
+        master = get_symbol_master()
+        row = {"symbol": self.symbols[i], "name": master.name(self.symbols[i])}
+        for name in COLUMNS:
+            value = self.columns[name][i]
+            row[name] = None if np.isnan(value) else round(float(value), 2)
+        return row
+
+
+async def _load_columns(collection, symbols: List[str], names: tuple, columns: Dict[str, np.ndarray]) -> None:
+    position = {s: i for i, s in enumerate(symbols)}
+    cursor = collection.find({"symbol": {"$in": symbols}}, {"_id": 0, "symbol": 1, **{c: 1 for c in names}})
+    async for doc in cursor:
+        i = position[doc["symbol"]]
+        for name in names:
+            if doc.get(name) is not None:
+                columns[name][i] = doc[name]
+
+
+async def _stored_columns(symbols: List[str]) -> Dict[str, np.ndarray]:
+    """Fundamentals and rolling-stats columns; the candle-derived 52w range overrides Screener's."""
+    cached = _local.get("stored")
+    if cached is not None and cached[0] == symbols:
+        return cached[1]
+    columns = {name: np.full(len(symbols), np.nan) for name in STORED_COLUMNS}
+    try:
+        await _load_columns(StockFundamentals.get_motor_collection(), symbols, FUNDAMENTAL_COLUMNS, columns)
+        await _load_columns(
+            RollingStats.get_motor_collection(), symbols, STAT_COLUMNS + ("high_52w", "low_52w"), columns
+        )
+    except Exception as e:
+        logger.warning(f"Screener column load failed: {e}")
+        return columns
+    _local.set("stored", (symbols, columns))
+    return columns
+
+
+async def _build_frame() -> ScreenerFrame:
+    symbols = get_symbol_master().symbols()
+    stored = await _stored_columns(symbols)
+    quotes = await get_bulk_prices(symbols)
+    columns = {name: np.full(len(symbols), np.nan) for name in QUOTE_COLUMNS}
+    for i, s in enumerate(symbols):
+        quote = quotes.get(s)
+        if quote and quote.get("current_price"):
+            columns["price"][i] = quote["current_price"]
+            columns["change_pct"][i] = quote.get("day_change_pct") or 0.0
+            columns["volume"][i] = quote.get("volume") or np.nan
+    return ScreenerFrame(symbols, {**columns, **{k: v.copy() for k, v in stored.items()}})
+
+
+async def get_frame() -> ScreenerFrame:
+    """Current universe frame — rebuilt at most once per quote TTL, shared by concurrent callers."""
+    frame = _local.get("frame")
+    if frame is None:
+        frame = await _flight.do("screener:frame", _build_frame)
+        _local.set("frame", frame, ttl=market_ttl(60, 3600))
+    return frame
+
+
+async def run_screen(
+    filters: List[Filter], sort_by: Optional[str] = None, descending: bool = True, limit: int = 50
+) -> List[Dict]:
+    return (await get_frame()).screen(filters, sort_by, descending, limit)
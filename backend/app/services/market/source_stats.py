@@ -0,0 +1,67 @@
+"""Per-source latency and error tracking for the quote fallback chain.
+
+Each source keeps a rolling window of recent call latencies and outcomes. The
+provider orders sources by expected cost (median latency inflated by the error
+rate) and uses a source's p95 as the point to hedge with the next one. Sources
+with too few samples keep their configured position until they have history.
+"""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, TypeVar
+
+from ...middleware.metrics import QUOTE_SOURCE_LATENCY
+
+WINDOW = 200  # Recent calls kept per source
+MIN_SAMPLES = 20  # Calls before a source's percentiles are trusted
+PRIOR_COST = 1.0  # Assumed cost (seconds) of a source without enough history
+MIN_SUCCESS = 0.05  # Floor on success rate so a dead source sorts last rather than dividing by zero
+
+T = TypeVar("T")
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class SourceStats:
+    """Rolling latency/outcome windows keyed by source name."""
+
+    def __init__(self, window: int = WINDOW, min_samples: int = MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._latency: Dict[str, Deque[float]] = {}
+        self._outcomes: Dict[str, Deque[bool]] = {}
+
+    def observe(self, name: str, seconds: float, ok: Optional[bool]) -> None:
+        """Record one call. ``ok=None`` is a hedge loser cut short — its latency is only a lower bound,
+        so it goes to the metric but not the window (it would drag down the p95 that triggers hedging)."""
+        result = "cancelled" if ok is None else "ok" if ok else "error"
+        QUOTE_SOURCE_LATENCY.labels(name, result).observe(seconds)
+        if ok is None:
+            return
+        self._latency.setdefault(name, deque(maxlen=self.window)).append(seconds)
+        self._outcomes.setdefault(name, deque(maxlen=self.window)).append(ok)
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        samples = self._latency.get(name)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return _percentile(samples, q)
+
+    def error_rate(self, name: str) -> float:
+        outcomes = self._outcomes.get(name)
+        if not outcomes:
+            return 0.0
+        return 1 - sum(outcomes) / len(outcomes)
+
+    def cost(self, name: str) -> float:
+        """Expected seconds to a good answer: median latency over success rate."""
+        p50 = self.percentile(name, 0.5)
+        if p50 is None:
+            return PRIOR_COST
+        return p50 / max(1 - self.error_rate(name), MIN_SUCCESS)
+
+    def order(self, sources: List[T]) -> List[T]:
+        """Sources cheapest first; ties (e.g. no history yet) keep their configured order."""
+        return sorted(sources, key=lambda s: self.cost(s.name))
@@ -0,0 +1,255 @@
+"""Quote source adapters — one class per upstream, all sharing the pooled HTTP client.
+
+Every adapter returns quotes in the normalized schema built by ``make_quote`` so
+callers never have to care which upstream answered.
+"""
+
+import re
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from ...core.constants import YAHOO_CHART_URL, YAHOO_SPARK_URL
+from ...utils.logger import logger
+from ..symbols import get_symbol_master
+from ..upstream_limiter import throttle
+
+BROWSER_HEADERS = {"User-Agent": "Mozilla/5.0"}
+NSE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "application/json",
+}
+
+
+async def rate_limited_get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """GET after taking a token from the upstream host's shared bucket."""
+    await throttle(url)
+    kwargs.setdefault("headers", BROWSER_HEADERS)
+    return await client.get(url, **kwargs)
+
+
+def yahoo_ticker(symbol: str, exchange: str = "NSE") -> str:
+    """Map an NSE/BSE trading symbol to its Yahoo Finance ticker."""
+    return get_symbol_master().yahoo_ticker(symbol, exchange)
+
+
+def _float(value) -> Optional[float]:
+    return float(value) if value else None
+
+
+def make_quote(
+    symbol: str,
+    exchange: str,
+    current: float,
+    previous_close: Optional[float] = None,
+    source: str = "",
+    name: Optional[str] = None,
+    day_open: Optional[float] = None,
+    day_high: Optional[float] = None,
+    day_low: Optional[float] = None,
+    volume: Optional[int] = None,
+) -> Dict:
+    """Build a quote in the normalized schema shared by every source and caller."""
+    prev = previous_close or current
+    return {
+        "symbol": symbol,
+        "name": name or symbol,
+        "exchange": exchange,
+        "current_price": current,
+        "previous_close": prev,
+        "day_open": day_open,
+        "day_high": day_high,
+        "day_low": day_low,
+        "day_change": round(current - prev, 2),
+        "day_change_pct": round((current - prev) / prev * 100, 2) if prev else 0,
+        "volume": volume,
+        "source": source,
+        "fetched_at": round(time.time(), 3),
+    }
+
+
+def _quote_from_meta(symbol: str, exchange: str, meta: Dict, source: str) -> Optional[Dict]:
+    """Quote from a Yahoo chart ``meta`` block (shared by the chart and spark endpoints)."""
+    if not meta.get("regularMarketPrice"):
+        return None
+    return make_quote(
+        symbol,
+        exchange,
+        meta["regularMarketPrice"],
+        meta.get("previousClose") or meta.get("chartPreviousClose"),
+        source=source,
+        name=meta.get("shortName"),
+        day_open=meta.get("regularMarketOpen"),
+        day_high=meta.get("regularMarketDayHigh"),
+        day_low=meta.get("regularMarketDayLow"),
+        volume=meta.get("regularMarketVolume"),
+    )
+
+
+class QuoteSource:
+    """Base adapter: fetch a single symbol from one upstream."""
+
+    name = ""
+
+    def supports(self, symbol: str, exchange: str) -> bool:
+        return True
+
+    async def fetch(self, client: httpx.AsyncClient, symbol: str, exchange: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+
+class YahooChartSource(QuoteSource):
+    """Yahoo Finance v8 chart API (quote taken from the ``meta`` block)."""
+
+    name = "yahoo"
+
+    async def fetch(self, client: httpx.AsyncClient, symbol: str, exchange: str) -> Optional[Dict]:
+        try:
+            resp = await rate_limited_get(client, f"{YAHOO_CHART_URL}/{yahoo_ticker(symbol, exchange)}")
+            if resp.status_code == 200:
+                meta = resp.json().get("chart", {}).get("result", [{}])[0].get("meta", {})
+                return _quote_from_meta(symbol, exchange, meta, self.name)
+        except (httpx.HTTPError, KeyError, ValueError, IndexError) as e:
+            logger.debug(f"Yahoo failed for {symbol}: {e}")
+        return None
+
+
+class MoneyControlSource(QuoteSource):
+    """MoneyControl price feed — only for symbols with a known MC code."""
+
+    name = "moneycontrol"
+
+    def supports(self, symbol: str, exchange: str) -> bool:
+        return get_symbol_master().mc_code(symbol) is not None
+
+    async def fetch(self, client: httpx.AsyncClient, symbol: str, exchange: str) -> Optional[Dict]:
+        try:
+            mc_code = get_symbol_master().mc_code(symbol)
+            resp = await rate_limited_get(client, f"https://priceapi.moneycontrol.com/pricefeed/nse/equitycash/{mc_code}")
+            if resp.status_code == 200:
+                d = resp.json().get("data", {})
+                if d.get("pricecurrent"):
+                    current = float(d["pricecurrent"])
+                    return make_quote(
+                        symbol,
+                        "NSE",
+                        current,
+                        _float(d.get("priceclose")),
+                        source=self.name,
+                        name=d.get("SC_FULLNM"),
+                        day_open=_float(d.get("priceopen")),
+                        day_high=_float(d.get("pricehigh")),
+                        day_low=_float(d.get("pricelow")),
+                        volume=int(d["VOL"]) if d.get("VOL") else None,
+                    )
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            logger.debug(f"MoneyControl failed for {symbol}: {e}")
+        return None
+
+
+class GoogleFinanceSource(QuoteSource):
+    """Google Finance quote page (scraped ``data-last-price`` attribute)."""
+
+    name = "google"
+
+    async def fetch(self, client: httpx.AsyncClient, symbol: str, exchange: str) -> Optional[Dict]:
+        try:
+            info = get_symbol_master().get(symbol)
+            google_sym = info.yahoo if info else symbol
+            resp = await rate_limited_get(client, f"https://www.google.com/finance/quote/{google_sym}:NSE")
+            if resp.status_code == 200:
+                price_match = re.search(r'data-last-price="([\d.]+)"', resp.text)
+                prev_match = re.search(r'data-previous-close="([\d.]+)"', resp.text)
+                if price_match:
+                    return make_quote(
+                        symbol,
+                        "NSE",
+                        float(price_match.group(1)),
+                        float(prev_match.group(1)) if prev_match else None,
+                        source=self.name,
+                    )
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            logger.debug(f"Google failed for {symbol}: {e}")
+        return None
+
+
+class NSESource(QuoteSource):
+    """NSE India quote API — needs session cookies from the homepage first."""
+
+    name = "nse"
+
+    def supports(self, symbol: str, exchange: str) -> bool:
+        return exchange == "NSE"
+
+    async def fetch(self, client: httpx.AsyncClient, symbol: str, exchange: str) -> Optional[Dict]:
+        try:
+            if "nsit" not in client.cookies:
+                await rate_limited_get(client, "https://www.nseindia.com", headers=NSE_HEADERS)
+            url = f"https://www.nseindia.com/api/quote-equity?symbol={symbol}"
+            resp = await rate_limited_get(client, url, headers=NSE_HEADERS)
+            if resp.status_code == 200:
+                body = resp.json()
+                info = body.get("priceInfo", {})
+                if info.get("lastPrice"):
+                    return make_quote(
+                        symbol,
+                        "NSE",
+                        info["lastPrice"],
+                        info.get("previousClose"),
+                        source=self.name,
+                        name=body.get("info", {}).get("companyName"),
+                        day_open=info.get("open"),
+                        day_high=info.get("intraDayHighLow", {}).get("max"),
+                        day_low=info.get("intraDayHighLow", {}).get("min"),
+                        volume=info.get("totalTradedVolume"),
+                    )
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            logger.debug(f"NSE direct failed for {symbol}: {e}")
+        return None
+
+
+class BatchQuoteSource:
+    """Base adapter: fetch up to ``batch_size`` symbols in a single upstream request."""
+
+    name = ""
+    batch_size = 20
+
+    async def fetch_many(self, client: httpx.AsyncClient, symbols: List[str], exchange: str) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+
+class YahooSparkSource(BatchQuoteSource):
+    """Yahoo Finance v7 spark API — many tickers per request, one rate-limiter slot per chunk."""
+
+    name = "yahoo"
+    batch_size = 20
+
+    async def fetch_many(self, client: httpx.AsyncClient, symbols: List[str], exchange: str) -> Dict[str, Dict]:
+        tickers = {yahoo_ticker(s, exchange): s for s in symbols}
+        results: Dict[str, Dict] = {}
+        try:
+            url = f"{YAHOO_SPARK_URL}?symbols={','.join(tickers)}&range=1d&interval=1d"
+            resp = await rate_limited_get(client, url)
+            if resp.status_code == 200:
+                for item in resp.json().get("spark", {}).get("result") or []:
+                    symbol = tickers.get(item.get("symbol"))
+                    response = item.get("response") or [{}]
+                    if not symbol:
+                        continue
+                    quote = _quote_from_meta(symbol, exchange, response[0].get("meta", {}), self.name)
+                    if quote:
+                        results[symbol] = quote
+        except (httpx.HTTPError, KeyError, ValueError, TypeError) as e:
+            logger.debug(f"Yahoo spark failed for {len(symbols)} symbols: {e}")
+        return results
+
+
+def default_sources() -> list[QuoteSource]:
+    """Fallback chain in priority order."""
+    return [YahooChartSource(), MoneyControlSource(), GoogleFinanceSource(), NSESource()]
+
+
+def default_batch_sources() -> list[BatchQuoteSource]:
+    """Multi-symbol sources tried before the per-symbol chain."""
+    return [YahooSparkSource()]
@@ -0,0 +1,158 @@
+"""NSE market calendar — trading sessions, holidays and time-to-open/close (IST).
+
+Session open/close instants are precomputed per year as sorted epoch lists, so every
+check is a bisect. This is the single source of truth for "is the market open";
+cache TTLs and scheduled jobs are driven from here.
+"""
+
+import bisect
+import functools
+import math
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as dtime
+from typing import FrozenSet, List, Optional, Tuple
+
+import pytz
+
+from ..utils.logger import logger
+
+IST = pytz.timezone("Asia/Kolkata")
+SESSION_OPEN = dtime(9, 15)
+SESSION_CLOSE = dtime(15, 30)
+
+# NSE trading holidays by year (update annually — check the NSE circular each December).
+# Years missing here fall back to weekdays-only sessions.
+NSE_HOLIDAYS: dict[int, FrozenSet[Tuple[int, int]]] = {
+    2024: frozenset(
+        {
+            (1, 22),
+            (1, 26),
+            (3, 8),
+            (3, 25),
+            (3, 29),
+            (4, 11),
+            (4, 17),
+            (5, 1),
+            (5, 20),
+            (6, 17),
+            (7, 17),
+            (8, 15),
+            (10, 2),
+            (11, 1),
+            (11, 15),
+            (11, 20),
+            (12, 25),
+        }
+    ),
+    2025: frozenset(
+        {
+            (2, 26),
+            (3, 14),
+            (3, 31),
+            (4, 10),
+            (4, 14),
+            (4, 18),
+            (5, 1),
+            (8, 15),
+            (8, 27),
+            (10, 2),
+            (10, 21),
+            (10, 22),
+            (11, 5),
+            (12, 25),
+        }
+    ),
+    2026: frozenset(
+        {
+            (1, 26),
+            (3, 10),
+            (3, 31),
+            (4, 1),
+            (4, 14),
+            (4, 18),
+            (5, 1),
+            (6, 26),
+            (7, 17),
+            (8, 15),
+            (8, 27),
+            (10, 2),
+            (10, 20),
+            (10, 21),
+            (11, 5),
+            (11, 26),
+            (12, 25),
+        }
+    ),
+}
+
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and (day.month, day.day) not in NSE_HOLIDAYS.get(day.year, ())
+
+
+@functools.lru_cache(maxsize=8)
+def _sessions(year: int) -> Tuple[List[float], List[float]]:
+    """Sorted (opens, closes) epoch seconds for every session in ``year``."""
+    if year not in NSE_HOLIDAYS:
+        logger.warning(f"No NSE holiday table for {year} — treating every weekday as a session")
+    opens, closes = [], []
+    day = date(year, 1, 1)
+    while day.year == year:
+        if is_trading_day(day):
+            opens.append(IST.localize(datetime.combine(day, SESSION_OPEN)).timestamp())
+            closes.append(IST.localize(datetime.combine(day, SESSION_CLOSE)).timestamp())
+        day += timedelta(days=1)
+    return opens, closes
+
+
+def _ts(now: Optional[datetime]) -> float:
+    return now.timestamp() if now else time.time()
+
+
+def _year(ts: float) -> int:
+    return datetime.fromtimestamp(ts, IST).year
+
+
+def market_open(now: Optional[datetime] = None) -> bool:
+    """True while an NSE session is in progress."""
+    ts = _ts(now)
+    opens, closes = _sessions(_year(ts))
+    i = bisect.bisect_right(opens, ts) - 1
+    return i >= 0 and ts < closes[i]
+
+
+def next_open(now: Optional[datetime] = None) -> float:
+    """Epoch seconds of the next session open strictly after ``now``."""
+    ts = _ts(now)
+    year = _year(ts)
+    for y in range(year, year + 3):
+        opens, _ = _sessions(y)
+        i = bisect.bisect_right(opens, ts)
+        if i < len(opens):
+            return opens[i]
+    raise ValueError(f"No NSE session found after {year}")
+
+
+def last_close(now: Optional[datetime] = None) -> float:
+    """Epoch seconds of the most recent session close at or before ``now``."""
+    ts = _ts(now)
+    year = _year(ts)
+    for y in range(year, year - 3, -1):
+        _, closes = _sessions(y)
+        i = bisect.bisect_right(closes, ts) - 1
+        if i >= 0:
+            return closes[i]
+    raise ValueError(f"No NSE session found before {year}")
+
+
+def seconds_until_next_open(now: Optional[datetime] = None) -> int:
+    """0 while the market is open, otherwise whole seconds until the next session starts."""
+    if market_open(now):
+        return 0
+    return math.ceil(next_open(now) - _ts(now))
+
+
+def last_complete_session(now: Optional[datetime] = None) -> str:
+    """Most recent session that has closed, as YYYY-MM-DD (IST)."""
+    return datetime.fromtimestamp(last_close(now), IST).date().isoformat()
@@ -1,3 +1,4 @@
+from .nav_store import get_navs, normalize_scheme_name, resolve_schemes
 from .service import fetch_mf_holdings
 
-__all__ = ["fetch_mf_holdings"]
+__all__ = ["fetch_mf_holdings", "get_navs", "normalize_scheme_name", "resolve_schemes"]
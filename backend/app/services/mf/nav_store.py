@@ -0,0 +1,255 @@
+"""AMFI NAV store — NAVAll.txt streamed into Redis hashes, read back with HMGET.
+
+``amfi:nav`` maps scheme code → ``"nav;date"``; ``amfi:isin`` and ``amfi:name`` map
+ISINs and normalized scheme names to scheme codes. Lookups fetch only the codes
+they need instead of deserializing the whole ~15k-scheme table.
+"""
+
+import re
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from ...utils.logger import logger
+from ..cache import get_redis, redis_call
+from ..http_cache import conditional_headers, record, remember, response_validators
+from ..http_client import get_http_client
+from ..local_cache import LocalCache
+from ..singleflight import SingleFlight, claim, release
+
+AMFI_NAV_URL = "https://www.amfiindia.com/spages/NAVAll.txt"
+NAV_KEY = "amfi:nav"
+ISIN_KEY = "amfi:isin"
+NAME_KEY = "amfi:name"
+SYNC_KEY = "amfi:synced"
+SYNC_TTL = 3600  # AMFI publishes once a day; re-ingest at most hourly
+FAIL_KEY = "amfi:sync_failed"
+FAIL_TTL = 300  # Back-off after a failed download before any worker retries it
+CHUNK = 1000  # Hash fields per pipelined HSET
+HTTP_NAMESPACE = "amfi"
+
+# Legacy custom MF symbols from before name/ISIN resolution, kept so existing holdings still price
+SCHEME_ALIASES = {
+    "PPFAS": "122639",  # Parag Parikh Flexi Cap Fund Direct Growth
+    "BANDHAN-SC": "145455",  # Bandhan Small Cap Fund Direct Growth
+    "KOTAK-LM": "120503",  # Kotak Large & Midcap Fund Direct Growth
+    "HDFC-MC": "101762",  # HDFC Mid Cap Fund Direct Growth
+    "AXIS-LIQ": "119064",  # Axis Liquid Direct Fund Growth
+    "MOTILAL-MC": "147622",  # Motilal Oswal Midcap Fund Direct Growth
+    "PGIM-USD": "149295",  # PGIM India Ultra Short Duration Direct Growth
+}
+
+ISIN_RE = re.compile(r"^IN[A-Z0-9]{10}$")
+_NAME_NOISE = {"fund", "plan", "option", "scheme", "the", "of"}
+
+_flight = SingleFlight()
+# Used only when Redis is unreachable: (navs, isins, names) from an in-memory parse
+_fallback = LocalCache(maxsize=1, ttl=SYNC_TTL)
+
+
+def normalize_scheme_name(name: str) -> str:
+    """Order-preserving token key, so 'Fund - Direct Plan - Growth' and 'Fund Direct Growth' match."""
+    tokens = re.findall(r"[a-z0-9&]+", name.lower())
+    return " ".join(t for t in tokens if t not in _NAME_NOISE)
+
+
+def parse_nav_line(line: str) -> Optional[Tuple[str, List[str], str, str, str]]:
+    """``code;isin_growth;isin_reinvest;name;nav;date`` → (code, isins, name, nav, date); None for headers."""
+    parts = line.strip().split(";")
+    if len(parts) < 6 or not parts[0].isdigit():
+        return None
+    code, isin_a, isin_b, name, nav, day = parts[:6]
+    isins = [i for i in (isin_a.strip(), isin_b.strip()) if ISIN_RE.match(i)]
+    return code, isins, name.strip(), nav.strip(), day.strip()
+
+
+class NotModified(Exception):
+    """AMFI answered 304 — the file is unchanged since the last ingest."""
+
+
+async def _stream_schemes(
+    headers: Optional[Dict[str, str]] = None, validators: Optional[Dict[str, str]] = None
+) -> AsyncIterator[Tuple[str, str, List[str], str]]:
+    """Yield (code, "nav;date", isins, name key) per scheme without buffering the whole file.
+
+    ``headers`` may make the request conditional; a 304 raises ``NotModified``. The
+    response's validators are copied into ``validators`` for the caller to remember.
+    """
+    client = await get_http_client()
+    async with client.stream("GET", AMFI_NAV_URL, timeout=30, headers=headers) as resp:
+        if resp.status_code == 304:
+            raise NotModified
+        resp.raise_for_status()
+        if validators is not None:
+            validators.update(response_validators(resp))
+        async for line in resp.aiter_lines():
+            parsed = parse_nav_line(line)
+            if parsed:
+                code, isins, name, nav, day = parsed
+                yield code, f"{nav};{day}", isins, normalize_scheme_name(name)
+
+
+async def ingest_navs() -> Optional[int]:
+    """Stream NAVAll.txt into fresh hashes and swap them in atomically. Returns schemes written.
+
+    The download is conditional while the hashes exist; None means AMFI reported the
+    file unchanged, so the stored hashes are kept and only the sync marker is renewed.
+    """
+    r = await get_redis()
+    headers = await conditional_headers(HTTP_NAMESPACE, AMFI_NAV_URL) if await r.exists(NAV_KEY) else {}
+    validators: Dict[str, str] = {}
+    tmp = {key: f"{key}:tmp" for key in (NAV_KEY, ISIN_KEY, NAME_KEY)}
+    navs: Dict[str, str] = {}
+    isins: Dict[str, str] = {}
+    names: Dict[str, str] = {}
+    count = 0
+
+    async def flush():
+        pipe = r.pipeline(transaction=False)
+        for key, data in ((NAV_KEY, navs), (ISIN_KEY, isins), (NAME_KEY, names)):
+            if data:
+                pipe.hset(tmp[key], mapping=data)
+        await pipe.execute()
+        navs.clear()
+        isins.clear()
+        names.clear()
+
+    await r.delete(*tmp.values())
+    try:
+        async for code, nav, scheme_isins, name in _stream_schemes(headers, validators):
+            navs[code] = nav
+            isins.update({i: code for i in scheme_isins})
+            names[name] = code
+            count += 1
+            if len(navs) >= CHUNK:
+                await flush()
+    except NotModified:
+        record("not_modified")
+        await r.set(SYNC_KEY, "1", ex=SYNC_TTL)
+        return None
+    await flush()
+
+    if count:
+        pipe = r.pipeline(transaction=True)
+        for key, tmp_key in tmp.items():
+            pipe.rename(tmp_key, key)
+        pipe.set(SYNC_KEY, "1", ex=SYNC_TTL)
+        await pipe.execute()
+        record("fetched")
+        await remember(HTTP_NAMESPACE, AMFI_NAV_URL, validators)
+    return count
+
+
+async def _parse_in_memory() -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    navs: Dict[str, str] = {}
+    isins: Dict[str, str] = {}
+    names: Dict[str, str] = {}
+    async for code, nav, scheme_isins, name in _stream_schemes():
+        navs[code] = nav
+        isins.update({i: code for i in scheme_isins})
+        names[name] = code
+    return navs, isins, names
+
+
+async def _ensure_fresh() -> bool:
+    """Re-ingest when the hourly marker has lapsed. False if the hashes can't be used.
+
+    A failed download sets a short-lived marker so lookups don't retry it back to back;
+    meanwhile the existing hashes are served, or the in-memory fallback if there are none.
+    """
+    synced = await redis_call("amfi sync check", lambda r: r.exists(SYNC_KEY), lambda: None)
+    if synced is None:  # Redis unavailable — serve from the in-memory parse
+        return False
+    if synced:
+        return True
+
+    async def _state(r):
+        return await r.exists(FAIL_KEY), await r.exists(NAV_KEY)
+
+    state = await redis_call("amfi sync check", _state, lambda: None)
+    if state is None:
+        return False
+    failed, filled = state
+    if failed:
+        return bool(filled)
+
+    async def _ingest():
+        owned = await claim([SYNC_KEY], ttl=120)
+        if not owned:  # Another worker is ingesting; serve the current hashes meanwhile
+            return bool(filled)
+        try:
+            count = await ingest_navs()
+            if count is None:
+                logger.debug("AMFI NAV file unchanged")
+            else:
+                logger.info(f"AMFI NAV store refreshed: {count} schemes")
+        except (httpx.HTTPError, OSError) as e:
+            logger.error(f"AMFI NAV fetch error: {e}")
+            await redis_call("amfi sync backoff", lambda r: r.set(FAIL_KEY, "1", ex=FAIL_TTL), lambda: None)
+            return bool(filled)
+        except Exception as e:
+            logger.debug(f"AMFI store unavailable: {e}")
+            return False
+        finally:
+            await release(owned)
+        return True
+
+    return await _flight.do(SYNC_KEY, _ingest)
+
+
+async def _fallback_tables() -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    tables = _fallback.get("amfi")
+    if tables is None:
+        try:
+            tables = await _flight.do("amfi:fallback", _parse_in_memory)
+        except (httpx.HTTPError, OSError) as e:
+            logger.error(f"AMFI NAV fetch error: {e}")
+            tables = {}, {}, {}
+            _fallback.set("amfi", tables, ttl=FAIL_TTL)  # Back off before downloading again
+            return tables
+        _fallback.set("amfi", tables)
+    return tables
+
+
+async def _hmget(key: str, fields: List[str]) -> Dict[str, str]:
+    if not fields:
+        return {}
+    if await _ensure_fresh():
+        values = await redis_call("amfi read", lambda r: r.hmget(key, fields), lambda: None)
+        if values is not None:
+            return {f: v for f, v in zip(fields, values) if v}
+    navs, isins, names = await _fallback_tables()
+    table = {NAV_KEY: navs, ISIN_KEY: isins, NAME_KEY: names}[key]
+    return {f: table[f] for f in fields if f in table}
+
+
+async def get_navs(codes: List[str]) -> Dict[str, Dict]:
+    """Latest NAV for each scheme code: ``{code: {"nav": float, "date": "DD-Mon-YYYY"}}``."""
+    results = {}
+    for code, raw in (await _hmget(NAV_KEY, list(dict.fromkeys(codes)))).items():
+        nav, _, day = raw.partition(";")
+        try:
+            results[code] = {"nav": float(nav), "date": day}
+        except ValueError:
+            continue  # AMFI publishes "N.A." for suspended schemes
+    return results
+
+
+async def resolve_schemes(queries: Dict[str, str]) -> Dict[str, str]:
+    """Map each key to a scheme code, given a scheme code, ISIN or scheme name as its query.
+
+    Anything still unresolved falls back to ``SCHEME_ALIASES`` on the query, then on the key.
+    """
+    codes = {k: q for k, q in queries.items() if q.isdigit()}
+    by_isin = {k: q.upper() for k, q in queries.items() if k not in codes and ISIN_RE.match(q.upper())}
+    by_name = {k: normalize_scheme_name(q) for k, q in queries.items() if k not in codes and k not in by_isin}
+
+    isin_hits = await _hmget(ISIN_KEY, list(set(by_isin.values())))
+    name_hits = await _hmget(NAME_KEY, list(set(by_name.values())))
+    codes.update({k: isin_hits[i] for k, i in by_isin.items() if i in isin_hits})
+    codes.update({k: name_hits[n] for k, n in by_name.items() if n in name_hits})
+    for k, q in queries.items():
+        alias = SCHEME_ALIASES.get(q.upper()) or SCHEME_ALIASES.get(k.upper())
+        if k not in codes and alias:
+            codes[k] = alias
+    return codes
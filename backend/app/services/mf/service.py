@@ -2,7 +2,7 @@
 
 import httpx
 
-from ..cache import cache_get, cache_set
+from ..cache_aside import cached
 
 
 async def fetch_mf_holdings(scheme_name: str) -> list:
@@ -16,10 +16,10 @@ async def fetch_mf_holdings(scheme_name: str) -> list:
     """
     # Use full name hash to avoid collisions
     cache_key = f"mf_holdings:{hash(scheme_name) % 10**8}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return cached
+    return await cached(cache_key, lambda: _load_mf_holdings(scheme_name), ttl=86400)  # 24hr cache
 
+
+async def _load_mf_holdings(scheme_name: str) -> list:
     try:
         async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
             # Search for scheme on Groww
@@ -53,9 +53,6 @@ async def fetch_mf_holdings(scheme_name: str) -> list:
                 if h.get("corpus_per", 0) > 0:
                     name = h.get("company_name", "").upper().replace(" LTD", "").replace(" LIMITED", "")
                     result.append((name.split()[0], h.get("corpus_per", 0)))
-
-            if result:
-                await cache_set(cache_key, result, ttl=86400)  # 24hr cache
             return result
     except Exception:
         return []
@@ -4,7 +4,7 @@ import xml.etree.ElementTree as ET
 
 import httpx
 
-from ...core.constants import COMPANY_NAMES
+from ..symbols import get_symbol_master
 
 
 async def fetch_stock_news(symbol: str, client: httpx.AsyncClient | None = None, limit: int = 3) -> list:
@@ -18,7 +18,7 @@ async def fetch_stock_news(symbol: str, client: httpx.AsyncClient | None = None,
     Returns:
         List of dicts with title, publisher, link keys
     """
-    company = COMPANY_NAMES.get(symbol, symbol)
+    company = get_symbol_master().name(symbol)
     url = f"https://news.google.com/rss/search?q={company}+stock+NSE&hl=en-IN&gl=IN&ceid=IN:en"
 
     async def _fetch(c: httpx.AsyncClient) -> list:
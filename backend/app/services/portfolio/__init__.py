@@ -1,5 +1,6 @@
 """Portfolio service - holdings, transactions management"""
 
+from .dashboard import get_dashboard_data
 from .service import get_prices_for_holdings, get_user_holdings
 
-__all__ = ["get_user_holdings", "get_prices_for_holdings"]
+__all__ = ["get_user_holdings", "get_prices_for_holdings", "get_dashboard_data"]
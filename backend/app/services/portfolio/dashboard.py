@@ -0,0 +1,136 @@
+"""Portfolio dashboard - holdings, sectors, XIRR and transactions for one user"""
+
+from ..cache import market_ttl
+from ..cache_aside import cache_aside
+from ..symbols import get_symbol_master
+from .service import get_prices_for_holdings, get_user_holdings
+
+
+@cache_aside("dashboard", ttl=lambda: market_ttl(120, 3600))
+async def get_dashboard_data(user_id: str) -> dict:
+    """Holdings with live prices, sector split, XIRR and recent transactions — cached per user data version."""
+    holdings = await get_user_holdings(user_id)
+    if not holdings:
+        return {
+            "holdings": [],
+            "sectors": [],
+            "xirr": None,
+            "transactions": [],
+            "summary": {"invested": 0, "current": 0, "pnl": 0, "pnl_pct": 0},
+        }
+
+    prices = await get_prices_for_holdings(holdings) or {}
+    holdings_list: list = []
+    txns: list = []
+    total_inv = total_val = 0.0
+    sector_values: dict[str, float] = {}
+
+    for h in holdings:
+        p = prices.get(h.symbol, {})
+        curr_price = p.get("current_price") or h.current_price or h.avg_price
+        inv = h.quantity * h.avg_price
+        val = h.quantity * curr_price
+        total_inv += inv
+        total_val += val
+        sector = get_symbol_master().sector(h.symbol) if h.holding_type != "MF" else h.name
+        sector_values[sector] = sector_values.get(sector, 0) + val
+
+        holdings_list.append(
+            {
+                "_id": str(h.id),
+                "symbol": h.symbol,
+                "name": h.name,
+                "holding_type": h.holding_type,
+                "quantity": h.quantity,
+                "avg_price": h.avg_price,
+                "current_price": round(curr_price, 2),
+                "day_change_pct": p.get("day_change_pct", 0),
+                "current_value": round(val, 2),
+                "total_investment": round(inv, 2),
+                "pnl": round(val - inv, 2),
+                "pnl_pct": round(((val - inv) / inv * 100) if inv > 0 else 0, 2),
+                "sector": sector,
+            }
+        )
+        for i, t in enumerate(h.transactions):
+            txns.append({"symbol": h.symbol, "holding_id": str(h.id), "index": i, **t.model_dump()})
+
+    txns.sort(key=lambda x: x.get("date", ""), reverse=True)
+    sectors = [
+        {"sector": s, "value": round(v, 2), "percentage": round(v / total_val * 100, 1) if total_val > 0 else 0}
+        for s, v in sorted(sector_values.items(), key=lambda x: x[1], reverse=True)
+    ]
+
+    result = {
+        "holdings": holdings_list,
+        "sectors": sectors,
+        "xirr": _calc_xirr(holdings, total_val),
+        "xirr_stocks": _calc_xirr(
+            [h for h in holdings if h.holding_type != "MF"],
+            sum(hl["current_value"] for hl in holdings_list if hl["holding_type"] != "MF"),
+        ),
+        "xirr_mf": _calc_xirr(
+            [h for h in holdings if h.holding_type == "MF"],
+            sum(hl["current_value"] for hl in holdings_list if hl["holding_type"] == "MF"),
+        ),
+        "transactions": txns[:50],
+        "summary": {
+            "invested": round(total_inv, 2),
+            "current": round(total_val, 2),
+            "pnl": round(total_val - total_inv, 2),
+            "pnl_pct": round(((total_val - total_inv) / total_inv * 100) if total_inv > 0 else 0, 2),
+        },
+    }
+    return result
+
+
+def _calc_xirr(holdings, current_value):
+    """Calculate XIRR from transaction history using Newton's method."""
+    from datetime import datetime
+
+    cashflows = []  # (date, amount) — negative for outflows, positive for inflows
+    for h in holdings:
+        for t in h.transactions:
+            try:
+                dt = datetime.strptime(t.date, "%Y-%m-%d")
+                amt = t.quantity * t.price
+                cashflows.append((dt, -amt if t.type == "BUY" else amt))
+            except (ValueError, TypeError):
+                continue
+
+    if not cashflows:
+        return None
+
+    # Add current portfolio value as final inflow
+    cashflows.append((datetime.now(), current_value))
+    cashflows.sort(key=lambda x: x[0])
+
+    if len(cashflows) < 2:
+        return None
+
+    # Newton's method for XIRR
+    d0 = cashflows[0][0]
+    days = [(cf[0] - d0).days / 365.0 for cf in cashflows]
+    amounts = [cf[1] for cf in cashflows]
+
+    def npv(rate):
+        return sum(a / (1 + rate) ** d for a, d in zip(amounts, days))
+
+    def dnpv(rate):
+        return sum(-d * a / (1 + rate) ** (d + 1) for a, d in zip(amounts, days))
+
+    rate = 0.1  # initial guess 10%
+    for _ in range(100):
+        n = npv(rate)
+        dn = dnpv(rate)
+        if abs(dn) < 1e-12:
+            break
+        new_rate = rate - n / dn
+        if abs(new_rate - rate) < 1e-7:
+            rate = new_rate
+            break
+        rate = new_rate
+        if rate < -0.99 or rate > 10:
+            return None
+
+    return round(rate * 100, 2) if -1 < rate < 10 else None
@@ -7,11 +7,11 @@ Routes should only call methods here and return the result.
 
 from beanie import PydanticObjectId
 
-from ...core.constants import SECTOR_MAP
+from ..symbols import get_symbol_master
 from ...models.documents import Holding
 from ...models.documents.holding import EmbeddedTransaction
 from ..base import BaseService
-from ..cache import cache_get, cache_set, market_ttl
+from ..cache import market_ttl
 from . import get_prices_for_holdings, get_user_holdings
 
 
@@ -55,10 +55,9 @@ class PortfolioService(BaseService):
         }
 
     async def get_holdings_with_prices(self) -> list[dict]:
-        ck = self._cache_key("holdings")
-        cached = await cache_get(ck)
-        if cached:
-            return cached
+        return await self._cached("holdings", self._load_holdings_with_prices)
+
+    async def _load_holdings_with_prices(self) -> list[dict]:
         holdings = await get_user_holdings(str(self.user_id))
         prices = await get_prices_for_holdings(holdings) or {}
         result = []
@@ -84,14 +83,12 @@ class PortfolioService(BaseService):
                     "pnl_pct": round((pnl / inv * 100) if inv > 0 else 0, 2),
                 }
             )
-        await cache_set(ck, result, ttl=market_ttl())
         return result
 
     async def get_sectors(self) -> dict:
-        ck = self._cache_key("sectors")
-        cached = await cache_get(ck)
-        if cached:
-            return cached
+        return await self._cached("sectors", self._load_sectors, ttl=lambda: market_ttl(300, 3600))
+
+    async def _load_sectors(self) -> dict:
         holdings = await get_user_holdings(str(self.user_id))
         if not holdings:
             return {"sectors": [], "total_value": 0}
@@ -102,14 +99,13 @@ class PortfolioService(BaseService):
             curr = prices.get(h.symbol, {}).get("current_price") or h.current_price or h.avg_price
             val = h.quantity * curr
             total += val
-            sector = SECTOR_MAP.get(h.symbol, "Others")
+            sector = get_symbol_master().sector(h.symbol)
             sector_values[sector] = sector_values.get(sector, 0) + val
         sectors = [
             {"sector": s, "value": round(v, 2), "percentage": round(v / total * 100, 1) if total > 0 else 0}
             for s, v in sorted(sector_values.items(), key=lambda x: x[1], reverse=True)
         ]
         result = {"sectors": sectors, "total_value": round(total, 2)}
-        await cache_set(ck, result, ttl=market_ttl(300, 3600))
         return result
 
     async def add_holding(
@@ -128,7 +124,7 @@ class PortfolioService(BaseService):
             avg_price=avg_price,
         )
         await doc.insert()
-        await self._invalidate("holdings", "sectors", "dashboard", "analytics")
+        await self._invalidate()
         return str(doc.id)
 
     async def update_holding(self, holding_id: str, quantity: float = None, avg_price: float = None) -> None:
@@ -142,7 +138,7 @@ class PortfolioService(BaseService):
         if avg_price is not None:
             h.avg_price = avg_price
         await h.save()
-        await self._invalidate("holdings", "sectors", "dashboard", "analytics")
+        await self._invalidate()
 
     async def delete_holding(self, holding_id: str) -> None:
         if not PydanticObjectId.is_valid(holding_id):
@@ -151,7 +147,7 @@ class PortfolioService(BaseService):
         if not h:
             raise LookupError("Holding not found")
         await h.delete()
-        await self._invalidate("holdings", "sectors", "dashboard", "analytics")
+        await self._invalidate()
 
     async def get_transactions(self, page: int = 1, limit: int = 50) -> dict:
         page = max(1, page)
@@ -204,7 +200,7 @@ class PortfolioService(BaseService):
                 transactions=[txn_doc],
             )
             await holding.insert()
-            await self._invalidate("holdings", "sectors", "dashboard", "analytics")
+            await self._invalidate()
             return {"holding_id": str(holding.id)}
 
         old_qty, old_avg = holding.quantity, holding.avg_price
@@ -219,14 +215,14 @@ class PortfolioService(BaseService):
 
         if new_qty == 0:
             await holding.delete()
-            await self._invalidate("holdings", "sectors", "dashboard", "analytics")
+            await self._invalidate()
             return {"sold_completely": True}
 
         holding.quantity = new_qty
         holding.avg_price = round(new_avg, 4)
         holding.transactions.append(txn_doc)
         await holding.save()
-        await self._invalidate("holdings", "sectors", "dashboard", "analytics")
+        await self._invalidate()
         return {"new_quantity": new_qty, "new_avg_price": round(new_avg, 2)}
 
     async def delete_transaction(self, holding_id: str, index: int) -> None:
@@ -247,4 +243,4 @@ class PortfolioService(BaseService):
             holding.avg_price = round(cost / qty, 4) if qty > 0 else holding.avg_price
             holding.quantity = round(qty, 4) if qty > 0 else holding.quantity
         await holding.save()
-        await self._invalidate("holdings", "sectors", "dashboard", "analytics")
+        await self._invalidate()
@@ -2,16 +2,16 @@
 Enhanced Signal Engine - Fundamentals + Technicals + Portfolio Context + LLM Insights
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
 from typing import Optional
 
 import httpx
-from bs4 import BeautifulSoup
 
 from ...core.config import settings
-from ...core.constants import SECTOR_MAP
 from ...utils.logger import logger
+from ..fundamentals import get_fundamentals
+from ..symbols import get_symbol_master
 
 
 class Confidence(str, Enum):
@@ -76,7 +76,6 @@ class SignalEngine:
 
     def __init__(self):
         self._nifty_cache: dict = {}
-        self._fundamentals_cache: dict = {}
 
     async def get_market_regime(self) -> tuple[MarketRegime, float]:
         """Detect current market regime from Nifty 50"""
@@ -106,71 +105,11 @@ class SignalEngine:
         return MarketRegime.NEUTRAL, 0.0
 
     async def get_fundamentals(self, symbol: str) -> Fundamentals:
-        """Fetch fundamentals from Screener.in with caching"""
-        if symbol in self._fundamentals_cache:
-            return self._fundamentals_cache[symbol]
-
-        fundamentals = Fundamentals()
-        try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                resp = await client.get(
-                    f"https://www.screener.in/company/{symbol}/consolidated/",
-                    headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
-                )
-                if resp.status_code != 200:
-                    # Try standalone
-                    resp = await client.get(
-                        f"https://www.screener.in/company/{symbol}/",
-                        headers={"User-Agent": "Mozilla/5.0"},
-                    )
-
-                if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, "lxml")
-                    ratios = {}
-
-                    # Extract from ratio list
-                    for li in soup.find_all("li", class_="flex flex-space-between"):
-                        name = li.find("span", class_="name")
-                        value = li.find("span", class_="number")
-                        if name and value:
-                            ratios[name.text.strip().lower()] = value.text.strip()
-
-                    def parse_num(val: str) -> Optional[float]:
-                        try:
-                            return float(val.replace(",", "").replace("%", ""))
-                        except (ValueError, AttributeError):
-                            return None
-
-                    fundamentals.pe = parse_num(ratios.get("stock p/e", ""))
-                    fundamentals.pb = parse_num(ratios.get("price to book value", ""))
-                    fundamentals.roe = parse_num(ratios.get("roe", ""))
-                    fundamentals.roce = parse_num(ratios.get("roce", ""))
-                    fundamentals.debt_equity = parse_num(ratios.get("debt to equity", ""))
-
-                    # Try to get profit growth from quarters section
-                    profit_growth = soup.find("span", string=lambda t: t and "Profit growth" in t if t else False)
-                    if profit_growth:
-                        parent = profit_growth.find_parent("li")
-                        if parent:
-                            num = parent.find("span", class_="number")
-                            if num:
-                                fundamentals.profit_growth_3yr = parse_num(num.text)
-
-                    # Shareholding
-                    for row in soup.find_all("tr"):
-                        cells = row.find_all("td")
-                        if len(cells) >= 2:
-                            label = cells[0].text.strip().lower()
-                            if "promoter" in label and "pledge" not in label:
-                                fundamentals.promoter_holding = parse_num(cells[-1].text)
-                            elif "pledge" in label:
-                                fundamentals.promoter_pledge = parse_num(cells[-1].text)
-
-        except Exception as e:
-            logger.debug(f"Fundamentals fetch failed for {symbol}: {e}")
-
-        self._fundamentals_cache[symbol] = fundamentals
-        return fundamentals
+        """Fundamentals from the shared store (crawled nightly from Screener.in)"""
+        record = await get_fundamentals(symbol)
+        if record is None:
+            return Fundamentals()
+        return Fundamentals(**{f.name: getattr(record, f.name) for f in fields(Fundamentals)})
 
     def calculate_sector_concentration(self, holdings: list, current_symbol: str) -> tuple[str, float]:
         """Calculate sector concentration for a symbol"""
@@ -185,7 +124,7 @@ class SignalEngine:
         elif "MOM" in symbol_upper or "ALPHA" in symbol_upper or "FACTOR" in symbol_upper:
             sector = "Factor ETF"
         else:
-            sector = SECTOR_MAP.get(current_symbol, "Others")
+            sector = get_symbol_master().sector(current_symbol)
 
         sector_value = 0
         total_value = 0
@@ -193,7 +132,7 @@ class SignalEngine:
         for h in holdings:
             value = h.quantity * (h.current_price or h.avg_price)
             total_value += value
-            h_sector = SECTOR_MAP.get(h.symbol, "Others")
+            h_sector = get_symbol_master().sector(h.symbol)
             # Apply same ETF logic
             h_upper = h.symbol.upper()
             if "GOLD" in h_upper:
@@ -620,11 +559,12 @@ class SignalEngine:
             return {}
 
         current = data.get("current_price", closes[-1])
+        stats = data.get("stats") or {}
 
-        # SMAs
-        sma_20 = sum(closes[-20:]) / 20
-        sma_50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else sma_20
-        sma_200 = sum(closes[-200:]) / 200 if len(closes) >= 200 else None
+        # SMAs - from the rolling-stats table when available (as of the last close)
+        sma_20 = stats.get("sma_20") or sum(closes[-20:]) / 20
+        sma_50 = stats.get("sma_50") or (sum(closes[-50:]) / 50 if len(closes) >= 50 else sma_20)
+        sma_200 = stats.get("sma_200") or (sum(closes[-200:]) / 200 if len(closes) >= 200 else None)
 
         # RSI
         gains, losses = [], []
@@ -636,11 +576,15 @@ class SignalEngine:
         avg_loss = sum(losses) / 14 if losses else 0.001
         rsi = 100 - (100 / (1 + avg_gain / avg_loss))
 
-        # 52W range
-        highs = data.get("highs", closes)
-        lows = data.get("lows", closes)
-        high_52w = max(highs[-252:]) if len(highs) >= 252 else max(highs)
-        low_52w = min(lows[-252:]) if len(lows) >= 252 else min(lows)
+        # 52W range - stored range widened by today's price
+        if stats.get("high_52w") and stats.get("low_52w"):
+            high_52w = max(stats["high_52w"], current)
+            low_52w = min(stats["low_52w"], current)
+        else:
+            highs = data.get("highs", closes)
+            lows = data.get("lows", closes)
+            high_52w = max(highs[-252:]) if len(highs) >= 252 else max(highs)
+            low_52w = min(lows[-252:]) if len(lows) >= 252 else min(lows)
         range_position = ((current - low_52w) / (high_52w - low_52w) * 100) if high_52w != low_52w else 50
 
         return {
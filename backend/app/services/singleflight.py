@@ -0,0 +1,130 @@
+"""Single-flight request coalescing — in-process futures plus cross-worker Redis claims.
+
+Concurrent loads of the same key share one in-flight call inside a worker; across
+workers, whoever claims the Redis lock fetches while the others wait for its cache write.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+from ..utils.logger import logger
+from .cache import redis_call
+
+LOCK_PREFIX = "lock:flight:"
+
+
+class _Abandoned(Exception):
+    """Set on shared futures when their owner is cancelled, so waiters retry instead of cancelling."""
+
+
+class SingleFlight:
+    """Coalesce concurrent loads of the same keys into one in-flight call."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``loader`` once for ``key``; concurrent callers await the same result."""
+
+        async def _load_one(_keys: List[str]) -> Dict[str, Any]:
+            return {key: await loader()}
+
+        return (await self.do_many([key], _load_one)).get(key)
+
+    async def do_many(
+        self, keys: Iterable[str], loader: Callable[[List[str]], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Load many keys: ``loader`` receives only keys not already in flight.
+
+        Keys another caller is loading are awaited instead, so overlapping batches
+        never fetch the same key twice. If that caller is cancelled mid-load, its
+        waiters load the keys themselves rather than sharing the cancellation.
+        """
+        loop = asyncio.get_running_loop()
+        waiting: Dict[str, asyncio.Future] = {}
+        owned: Dict[str, asyncio.Future] = {}
+        for key in dict.fromkeys(keys):
+            if key in self._inflight:
+                waiting[key] = self._inflight[key]
+            else:
+                owned[key] = self._inflight[key] = loop.create_future()
+
+        results: Dict[str, Any] = {}
+        if owned:
+            try:
+                loaded = await loader(list(owned))
+            except asyncio.CancelledError:
+                for fut in owned.values():
+                    fut.set_exception(_Abandoned())
+                    fut.exception()
+                raise
+            except Exception as e:
+                for fut in owned.values():
+                    fut.set_exception(e)
+                    fut.exception()  # mark retrieved when nobody else is waiting
+                raise
+            finally:
+                for key in owned:
+                    self._inflight.pop(key, None)
+            for key, fut in owned.items():
+                results[key] = loaded.get(key)
+                fut.set_result(results[key])
+
+        abandoned: List[str] = []
+        for key, fut in waiting.items():
+            try:
+                results[key] = await asyncio.shield(fut)
+            except _Abandoned:
+                abandoned.append(key)
+            except Exception as e:
+                logger.debug(f"Shared load failed for {key}: {e}")
+                results[key] = None
+        if abandoned:
+            results.update(await self.do_many(abandoned, loader))
+        return results
+
+
+async def claim(keys: List[str], ttl: int = 15) -> List[str]:
+    """Take the cross-worker fetch lock for each key; return the keys this worker owns."""
+    if not keys:
+        return []
+
+    async def _claim(r) -> List[str]:
+        pipe = r.pipeline()
+        for key in keys:
+            pipe.set(f"{LOCK_PREFIX}{key}", "1", nx=True, ex=ttl)
+        acquired = await pipe.execute()
+        return [k for k, ok in zip(keys, acquired) if ok]
+
+    return await redis_call("claim", _claim, lambda: list(keys))  # Fail open while Redis is unavailable
+
+
+async def release(keys: List[str]) -> None:
+    """Drop cross-worker fetch locks."""
+    if not keys:
+        return
+    await redis_call("release", lambda r: r.delete(*[f"{LOCK_PREFIX}{k}" for k in keys]), lambda: None)
+
+
+async def wait_for_peers(
+    keys: List[str],
+    read: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+    timeout: float = 5.0,
+    interval: float = 0.1,
+) -> Dict[str, Any]:
+    """Poll ``read`` until a peer worker has published every key or ``timeout`` elapses."""
+    found: Dict[str, Any] = {}
+    pending = list(keys)
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        values = await read(pending)
+        for key in pending:
+            if values.get(key):
+                found[key] = values[key]
+        pending = [k for k in pending if k not in found]
+    return found
@@ -0,0 +1,4 @@
+from .master import SymbolInfo, SymbolMaster, get_symbol_master
+from .search import SearchIndex, get_search_index, search_symbols
+
+__all__ = ["SymbolInfo", "SymbolMaster", "get_symbol_master", "SearchIndex", "get_search_index", "search_symbols"]
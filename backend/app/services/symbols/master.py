@@ -0,0 +1,130 @@
+"""Symbol master — one table for symbol metadata, loaded once from the bundled equity list.
+
+Rows live in parallel column arrays (names, ISINs, tickers) with sectors interned into
+a small table referenced by an ``array('H')`` of ids, so ~2k symbols cost a few
+hundred KB. A single dict maps symbol → row for O(1) lookups.
+"""
+
+import csv
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from ...utils.logger import logger
+
+EQUITY_LIST = Path(__file__).with_name("equity_list.csv")
+DEFAULT_SECTOR = "Others"
+
+
+class SymbolInfo(NamedTuple):
+    symbol: str
+    isin: Optional[str]
+    name: str
+    sector: str
+    yahoo: str
+    mc_code: Optional[str]
+
+
+class SymbolMaster:
+    """Array-backed symbol table with O(1) lookups by symbol and ISIN."""
+
+    def __init__(self, rows: List[Dict[str, str]]):
+        self._symbols: List[str] = []
+        self._isins: List[str] = []
+        self._names: List[str] = []
+        self._yahoo: List[str] = []
+        self._mc_codes: List[str] = []
+        self._sectors: List[str] = [DEFAULT_SECTOR]
+        self._sector_ids = array("H")
+        self._index: Dict[str, int] = {}
+        self._isin_index: Dict[str, int] = {}
+
+        sector_ids = {DEFAULT_SECTOR: 0}
+        for row in rows:
+            symbol = row["symbol"].strip().upper()
+            if not symbol or symbol in self._index:
+                continue
+            sector = row.get("sector", "").strip() or DEFAULT_SECTOR
+            if sector not in sector_ids:
+                sector_ids[sector] = len(self._sectors)
+                self._sectors.append(sector)
+            i = len(self._symbols)
+            self._index[symbol] = i
+            self._symbols.append(symbol)
+            self._isins.append(row.get("isin", "").strip())
+            self._names.append(row.get("name", "").strip())
+            self._yahoo.append(row.get("yahoo", "").strip())
+            self._mc_codes.append(row.get("mc_code", "").strip())
+            self._sector_ids.append(sector_ids[sector])
+            if self._isins[i]:
+                self._isin_index[self._isins[i]] = i
+
+    @classmethod
+    def from_csv(cls, path: Path = EQUITY_LIST) -> "SymbolMaster":
+        with open(path, newline="", encoding="utf-8") as f:
+            master = cls(list(csv.DictReader(f)))
+        logger.info(f"Symbol master loaded: {len(master)} symbols, {len(master._sectors)} sectors")
+        return master
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        i = self._index.get(symbol)
+        return None if i is None else self._row(i)
+
+    def by_isin(self, isin: str) -> Optional[SymbolInfo]:
+        i = self._isin_index.get(isin)
+        return None if i is None else self._row(i)
+
+    def sector(self, symbol: str, default: str = DEFAULT_SECTOR) -> str:
+        i = self._index.get(symbol)
+        if i is None or self._sector_ids[i] == 0:
+            return default
+        return self._sectors[self._sector_ids[i]]
+
+    def name(self, symbol: str) -> str:
+        """Readable company name, falling back to the symbol itself."""
+        i = self._index.get(symbol)
+        return (self._names[i] if i is not None else "") or symbol
+
+    def isin(self, symbol: str) -> Optional[str]:
+        i = self._index.get(symbol)
+        return (self._isins[i] if i is not None else "") or None
+
+    def mc_code(self, symbol: str) -> Optional[str]:
+        i = self._index.get(symbol)
+        return (self._mc_codes[i] if i is not None else "") or None
+
+    def yahoo_ticker(self, symbol: str, exchange: str = "NSE") -> str:
+        """Yahoo Finance ticker — trading symbols that differ on Yahoo are mapped."""
+        i = self._index.get(symbol)
+        base = (self._yahoo[i] if i is not None else "") or symbol
+        return f"{base}.NS" if exchange == "NSE" else f"{base}.BO"
+
+    def _row(self, i: int) -> SymbolInfo:
+        return SymbolInfo(
+            symbol=self._symbols[i],
+            isin=self._isins[i] or None,
+            name=self._names[i] or self._symbols[i],
+            sector=self._sectors[self._sector_ids[i]],
+            yahoo=self._yahoo[i] or self._symbols[i],
+            mc_code=self._mc_codes[i] or None,
+        )
+
+
+_master: Optional[SymbolMaster] = None
+
+
+def get_symbol_master() -> SymbolMaster:
+    """Process-wide symbol master, loaded on first use (warmed at startup)."""
+    global _master
+    if _master is None:
+        _master = SymbolMaster.from_csv()
+    return _master
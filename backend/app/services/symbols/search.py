@@ -0,0 +1,141 @@
+"""Local symbol search — prefix tries over symbols and name words, trigrams for typos.
+
+Entries are ranked once at build time (NSE first, then shorter symbols), and every
+trie node keeps the best ``NODE_CAP`` entry ids beneath it, so a prefix query is a
+walk of ``len(query)`` nodes with no sorting at query time.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .master import get_symbol_master
+
+NODE_CAP = 32
+FUZZY_THRESHOLD = 0.5  # Share of the query's trigrams a name must contain
+EXCHANGE_RANK = {"NSE": 0, "BSE": 1}
+
+_WORD_RE = re.compile(r"[A-Z0-9&]+")
+
+# (symbol, name, exchange), optionally with a caller payload returned alongside each hit
+Entry = Union[Tuple[str, str, str], Tuple[str, str, str, Any]]
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.upper())
+
+
+def _trigrams(text: str) -> Set[str]:
+    s = f"  {' '.join(_words(text))} "
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+class _Trie:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_Trie"] = {}
+        self.ids: List[int] = []
+
+    def insert(self, key: str, entry_id: int) -> None:
+        node = self
+        for ch in key:
+            node = node.children.setdefault(ch, _Trie())
+            if len(node.ids) < NODE_CAP and (not node.ids or node.ids[-1] != entry_id):
+                node.ids.append(entry_id)
+
+    def find(self, prefix: str) -> List[int]:
+        node = self
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.ids
+
+
+class SearchIndex:
+    """In-memory search over (symbol, name, exchange[, payload]) entries.
+
+    A payload, when given, comes back as each hit's ``payload`` field — callers can
+    carry their own data (e.g. a holding's type) through the search.
+    """
+
+    def __init__(self, entries: Iterable[Entry]):
+        self.entries = sorted(entries, key=lambda e: (EXCHANGE_RANK.get(e[2], 2), len(e[0]), e[0]))
+        self._symbols = _Trie()
+        self._words = _Trie()
+        self._grams: Dict[str, List[int]] = {}
+        self._exact: Dict[str, int] = {}
+        for i, (symbol, name, *_) in enumerate(self.entries):
+            self._exact.setdefault(symbol, i)
+            self._symbols.insert(symbol, i)
+            for word in _words(name):
+                self._words.insert(word, i)
+            for gram in _trigrams(f"{symbol} {name}"):
+                self._grams.setdefault(gram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True) -> List[Dict]:
+        """Exact symbol, then symbol prefix, then name-word prefixes, then (if ``fuzzy``) fuzzy name matches."""
+        q = query.strip().upper()
+        if not q:
+            return []
+        ranked: Dict[int, None] = {}
+
+        def add(ids: Iterable[int]) -> bool:
+            for i in ids:
+                ranked.setdefault(i)
+                if len(ranked) >= limit:
+                    return True
+            return False
+
+        if q in self._exact and add([self._exact[q]]):
+            return self._render(ranked)
+        if add(self._symbols.find(q.replace(" ", ""))):
+            return self._render(ranked)
+        words = _words(q)
+        if words:
+            matches = [self._words.find(w) for w in words]
+            common = set(matches[0]).intersection(*matches[1:])
+            if add(i for i in matches[0] if i in common):
+                return self._render(ranked)
+        if fuzzy and len(q) >= 3:
+            add(self._fuzzy(q, exclude=ranked))
+        return self._render(ranked)
+
+    def _fuzzy(self, q: str, exclude: Dict[int, None]) -> List[int]:
+        grams = _trigrams(q)
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            for i in self._grams.get(gram, ()):
+                counts[i] = counts.get(i, 0) + 1
+        need = len(grams) * FUZZY_THRESHOLD
+        hits = [i for i, n in counts.items() if n >= need and i not in exclude]
+        return sorted(hits, key=lambda i: (-counts[i], i))
+
+    def _render(self, ranked: Dict[int, None]) -> List[Dict]:
+        rows = []
+        for i in ranked:
+            symbol, name, exchange, *payload = self.entries[i]
+            row = {"symbol": symbol, "name": name, "exchange": exchange}
+            if payload:
+                row["payload"] = payload[0]
+            rows.append(row)
+        return rows
+
+
+_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> SearchIndex:
+    """Search index over the symbol master, built on first use."""
+    global _index
+    if _index is None:
+        master = get_symbol_master()
+        _index = SearchIndex((s, master.name(s), "NSE") for s in master.symbols())
+    return _index
+
+
+def search_symbols(query: str, limit: int = 10, fuzzy: bool = True) -> List[Dict]:
+    return get_search_index().search(query, limit, fuzzy)
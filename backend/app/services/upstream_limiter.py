@@ -0,0 +1,178 @@
+"""Upstream rate limiting — per-host token buckets shared across workers through Redis.
+
+Each upstream host gets a bucket (``rate`` tokens/second, ``burst`` capacity) that a
+Lua script refills and drains atomically, so all workers together stay under the
+host's limit. Within a worker, callers queue by lane: interactive requests are
+always granted before batch ones, and the batch lane leaves a reserve of tokens in
+the shared bucket so scheduled jobs on other workers cannot starve user requests.
+"""
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..middleware.metrics import UPSTREAM_QUEUE_DEPTH, UPSTREAM_WAIT
+from .cache import redis_call
+
+KEY_PREFIX = "rl:host:"
+BATCH_RESERVE = 0.5  # Fraction of the burst the batch lane must leave in the bucket
+MAX_POLL = 0.1  # Re-check the queue head at least this often so new interactive callers jump ahead
+
+# host -> (tokens per second, burst)
+HOST_LIMITS: Dict[str, Tuple[float, int]] = {
+    "query1.finance.yahoo.com": (10, 10),
+    "query2.finance.yahoo.com": (10, 10),
+    "priceapi.moneycontrol.com": (5, 5),
+    "www.google.com": (2, 4),
+    "www.nseindia.com": (3, 3),
+    "www.screener.in": (2, 4),
+}
+DEFAULT_LIMIT = (5, 5)
+
+# Atomic refill-and-take. Returns 0 when a token was taken, else milliseconds until one is available
+# above ``floor``. Uses the Redis clock so workers with skewed clocks agree on refill.
+_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local floor = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+local wait = 0
+if tokens >= floor + 1 then
+  tokens = tokens - 1
+else
+  wait = math.ceil((floor + 1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class Lane(IntEnum):
+    """Priority lanes — lower value is served first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_lane: contextvars.ContextVar[Lane] = contextvars.ContextVar("upstream_lane", default=Lane.INTERACTIVE)
+
+
+def current_lane() -> Lane:
+    return _lane.get()
+
+
+def in_batch_lane(func):
+    """Decorator: upstream calls made by ``func`` (and tasks it spawns) queue in the batch lane."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _lane.set(Lane.BATCH)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _lane.reset(token)
+
+    return wrapper
+
+
+class HostLimiter:
+    """Token bucket for one upstream host with an in-process priority queue in front of it."""
+
+    def __init__(self, host: str, rate: float, burst: int):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self._key = f"{KEY_PREFIX}{host}"
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._pump: Optional[asyncio.Task] = None
+        # Per-process fallback bucket used while Redis is unreachable
+        self._local_tokens = float(burst)
+        self._local_ts = time.monotonic()
+
+    def depth(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, lane: Lane = Lane.INTERACTIVE) -> float:
+        """Wait for a token in ``lane``; returns the seconds spent waiting."""
+        loop = asyncio.get_running_loop()
+        if self._pump is not None and self._pump.get_loop() is not loop:
+            self._pump, self._waiters = None, []
+
+        fut = loop.create_future()
+        heapq.heappush(self._waiters, (lane, next(self._seq), fut))
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.create_task(self._run())
+
+        labels = (self.host, lane.name.lower())
+        UPSTREAM_QUEUE_DEPTH.labels(*labels).inc()
+        start = time.monotonic()
+        try:
+            await fut
+        finally:
+            UPSTREAM_QUEUE_DEPTH.labels(*labels).dec()
+        waited = time.monotonic() - start
+        UPSTREAM_WAIT.labels(*labels).observe(waited)
+        return waited
+
+    async def _run(self) -> None:
+        """Grant tokens to the queue head, highest-priority lane first, until the queue drains."""
+        while self._waiters:
+            lane, _, fut = self._waiters[0]
+            if fut.done():  # Caller gave up
+                heapq.heappop(self._waiters)
+                continue
+            wait = await self._take(lane)
+            if wait:
+                await asyncio.sleep(min(wait, MAX_POLL))
+                continue
+            # The head may have changed while we were talking to Redis — grant whoever is first now
+            while self._waiters:
+                _, _, fut = heapq.heappop(self._waiters)
+                if not fut.done():
+                    fut.set_result(None)
+                    break
+
+    async def _take(self, lane: Lane) -> float:
+        floor = self.burst * BATCH_RESERVE if lane == Lane.BATCH else 0
+        wait_ms = await redis_call(
+            f"limiter {self.host}",
+            lambda r: r.eval(_BUCKET_SCRIPT, 1, self._key, self.rate, self.burst, floor),
+            lambda: None,
+        )
+        return self._take_local(floor) if wait_ms is None else int(wait_ms) / 1000
+
+    def _take_local(self, floor: float) -> float:
+        now = time.monotonic()
+        self._local_tokens = min(self.burst, self._local_tokens + (now - self._local_ts) * self.rate)
+        self._local_ts = now
+        if self._local_tokens >= floor + 1:
+            self._local_tokens -= 1
+            return 0
+        return (floor + 1 - self._local_tokens) / self.rate
+
+
+_limiters: Dict[str, HostLimiter] = {}
+
+
+def limiter_for(host: str) -> HostLimiter:
+    if host not in _limiters:
+        _limiters[host] = HostLimiter(host, *HOST_LIMITS.get(host, DEFAULT_LIMIT))
+    return _limiters[host]
+
+
+async def throttle(url: str, lane: Optional[Lane] = None) -> float:
+    """Wait for a token for ``url``'s host in ``lane`` (defaults to the caller's context lane)."""
+    return await limiter_for(urlsplit(url).hostname or "").acquire(current_lane() if lane is None else lane)
@@ -1,36 +1,14 @@
 from datetime import datetime, timezone
 
-import httpx
-
 from ..models.documents import Alert, Holding, User
-from ..services.cache import cache_get, cache_set, get_redis
+from ..services.cache import cache_get, cache_set, get_redis, user_cache_key
 from ..services.market.price_service import get_bulk_prices
+from ..services.market.rolling_stats import get_rolling_stats
+from ..services.market_calendar import market_open
 from ..services.notification.service import send_alert_notification
 from ..utils.logger import logger
 
 
-async def get_52week_data(symbol: str):
-    try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(
-                f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.NS?interval=1d&range=1y",
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
-            if resp.status_code == 200:
-                result = resp.json()["chart"]["result"][0]
-                highs = [h for h in result["indicators"]["quote"][0]["high"] if h]
-                lows = [low for low in result["indicators"]["quote"][0]["low"] if low]
-                volumes = [v for v in result["indicators"]["quote"][0]["volume"] if v]
-                return {
-                    "high_52w": max(highs) if highs else None,
-                    "low_52w": min(lows) if lows else None,
-                    "avg_volume": sum(volumes[-20:]) / 20 if len(volumes) >= 20 else None,
-                }
-    except (httpx.HTTPError, KeyError, ValueError) as e:
-        logger.debug(f"52week data error for {symbol}: {e}")
-    return {}
-
-
 async def check_alerts():
     redis = await get_redis()
     if redis:
@@ -49,10 +27,9 @@ async def check_alerts():
     symbols = list(set(a.symbol for a in alerts))
     prices = await get_bulk_prices(symbols)
 
-    week52_data = {}
-    for a in alerts:
-        if a.alert_type in ["WEEK_52_HIGH", "WEEK_52_LOW", "VOLUME_SPIKE"] and a.symbol not in week52_data:
-            week52_data[a.symbol] = await get_52week_data(a.symbol)
+    week52_data = await get_rolling_stats(
+        [a.symbol for a in alerts if a.alert_type in ["WEEK_52_HIGH", "WEEK_52_LOW", "VOLUME_SPIKE"]]
+    )
 
     for alert in alerts:
         price_data = prices.get(alert.symbol, {})
@@ -81,7 +58,7 @@ async def check_alerts():
         elif alert.alert_type == "VOLUME_SPIKE":
             w52 = week52_data.get(alert.symbol, {})
             curr_vol = price_data.get("volume", 0)
-            avg_vol = w52.get("avg_volume", 0)
+            avg_vol = w52.get("avg_volume_20d", 0)
             if avg_vol and curr_vol >= avg_vol * (alert.target_value / 100 + 1):
                 triggered = True
 
@@ -103,6 +80,9 @@ async def check_alerts():
 
 async def check_stop_losses():
     """Check if any holding breached its signal engine stop_loss."""
+    if not market_open():
+        return
+
     redis = await get_redis()
     if redis:
         acquired = await redis.set("lock:check_stop_losses", "1", ex=280, nx=True)
@@ -125,9 +105,9 @@ async def _check_user_stop_losses(user):
         return
 
     # Get cached signals (from hourly update or signals page)
-    sig_map = await cache_get(f"hourly_signals:{user.id}")
+    sig_map = await cache_get(await user_cache_key("hourly_signals", user.id))
     if not sig_map:
-        sig_map = await cache_get(f"daily_signals:{user.id}")
+        sig_map = await cache_get(await user_cache_key("daily_signals", user.id))
     if not sig_map:
         return
 
@@ -0,0 +1,77 @@
+"""Market-open warmup — refill quote and dashboard caches just before the session starts.
+
+Overnight, quotes and dashboards are cached until the next open, so without this
+every key expires at 09:15 and the first wave of users all miss at once. The job
+fetches quotes for every held, watched and alerted symbol in batches, stamped fresh
+until just past the open, then rebuilds dashboards for the most active recent users.
+"""
+
+import asyncio
+import time
+from datetime import date, datetime
+from typing import List
+
+from ..models.documents import Alert, WatchlistItem
+from ..services.cache import redis_call
+from ..services.cache_aside import jittered
+from ..services.market import quote_provider
+from ..services.market_calendar import IST, is_trading_day, seconds_until_next_open
+from ..services.portfolio import get_dashboard_data
+from ..utils.logger import logger
+from .price_updater import tradable_symbols
+
+ACTIVE_DAYS = 3  # Look-back over the daily-active-user sets
+MAX_USERS = 200
+DASHBOARD_CONCURRENCY = 4
+QUOTE_TTL = 60  # In-session freshness, matching quote_ttl() while the market is open
+DASHBOARD_TTL = 120  # In-session dashboard TTL, matching get_dashboard_data's market_ttl(120, ...)
+
+
+async def warm_symbols() -> List[str]:
+    """Union of held, watchlisted and actively alerted symbols."""
+    watched = await WatchlistItem.get_motor_collection().distinct("symbol")
+    alerted = await Alert.get_motor_collection().distinct("symbol", {"is_active": True})
+    return sorted(set(await tradable_symbols()) | set(watched) | set(alerted))
+
+
+async def active_users(days: int = ACTIVE_DAYS, limit: int = MAX_USERS) -> List[str]:
+    """Users seen in the last ``days`` daily-active sets, most days active first (none while Redis is down)."""
+    today = time.time()
+    keys = [f"analytics:dau:{time.strftime('%Y-%m-%d', time.localtime(today - d * 86400))}" for d in range(days)]
+
+    async def _members(r) -> list:
+        pipe = r.pipeline(transaction=False)
+        for key in keys:
+            pipe.smembers(key)
+        return await pipe.execute()
+
+    seen: dict[str, int] = {}
+    for members in await redis_call("active users", _members, list):
+        for user_id in members or ():
+            seen[user_id] = seen.get(user_id, 0) + 1
+    return sorted(seen, key=lambda u: -seen[u])[:limit]
+
+
+async def warm_market_open(today: date | None = None) -> None:
+    today = today or datetime.now(IST).date()
+    if not is_trading_day(today):
+        return
+    until_open = seconds_until_next_open()
+
+    symbols = await warm_symbols()
+    quotes = await quote_provider.prefetch(symbols, ttl=jittered(until_open + QUOTE_TTL))
+
+    users = await active_users()
+    sem = asyncio.Semaphore(DASHBOARD_CONCURRENCY)
+
+    async def _one(user_id: str) -> bool:
+        async with sem:
+            try:
+                await get_dashboard_data.prime(user_id, ttl=until_open + DASHBOARD_TTL)
+                return True
+            except Exception as e:
+                logger.debug(f"Dashboard warmup failed for {user_id}: {e}")
+                return False
+
+    built = sum(await asyncio.gather(*[_one(u) for u in users]))
+    logger.info(f"Market-open warmup: {quotes}/{len(symbols)} quotes, {built}/{len(users)} dashboards")
@@ -0,0 +1,12 @@
+from ..services.market.corporate_actions import refresh_corporate_actions
+from ..utils.logger import logger
+from .price_updater import tradable_symbols
+
+
+async def refresh_all_corporate_actions():
+    """Nightly refresh of dividend/split events for every symbol anyone holds."""
+    symbols = await tradable_symbols()
+    if not symbols:
+        return
+    count = await refresh_corporate_actions(symbols)
+    logger.info(f"Corporate actions refreshed: {count} events across {len(symbols)} symbols")
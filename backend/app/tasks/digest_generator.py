@@ -5,7 +5,7 @@ import pytz
 
 from ..core.config import settings
 from ..models.documents import DailyDigest, Holding, User
-from ..services.cache import cache_get, cache_set, get_redis
+from ..services.cache import cache_get, cache_set, get_redis, user_cache_key
 from ..services.market.price_service import get_bulk_prices
 from ..services.notification.service import send_email
 from ..utils.logger import logger
@@ -46,7 +46,7 @@ async def _get_nifty_day_change() -> float:
 
 
 async def _get_signals(user_id: str, holdings: list) -> dict:
-    ck = f"daily_signals:{user_id}"
+    ck = await user_cache_key("daily_signals", user_id)
     cached = await cache_get(ck)
     if cached:
         return cached
@@ -3,33 +3,34 @@ from datetime import datetime, timezone
 import httpx
 
 from ..core.config import settings
-from ..models.documents import Alert, User
+from ..models.documents import Alert, User, WatchlistItem
+from ..services.market.earnings import find_upcoming_earnings, refresh_earnings
 from ..services.notification.service import send_email
 from ..utils.logger import logger
+from .price_updater import tradable_symbols
 
 
-async def get_earnings_date(symbol: str):
-    try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(
-                f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol}.NS?modules=calendarEvents",
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
-            if resp.status_code == 200:
-                data = resp.json()["quoteSummary"]["result"][0].get("calendarEvents", {})
-                earnings = data.get("earnings", {}).get("earningsDate", [])
-                if earnings:
-                    return datetime.fromtimestamp(earnings[0]["raw"], tz=timezone.utc)
-    except (httpx.HTTPError, KeyError, ValueError) as e:
-        logger.debug(f"Earnings date error for {symbol}: {e}")
-    return None
+async def refresh_all_earnings():
+    """Nightly refresh of next earnings dates for every symbol anyone holds, watches or has an earnings alert on."""
+    watched = await WatchlistItem.get_motor_collection().distinct("symbol")
+    alerted = await Alert.get_motor_collection().distinct("symbol", {"alert_type": "EARNINGS", "is_active": True})
+    symbols = sorted(set(await tradable_symbols()) | set(watched) | set(alerted))
+    if not symbols:
+        return
+    count = await refresh_earnings(symbols)
+    logger.info(f"Earnings dates refreshed: {count} of {len(symbols)} symbols have an upcoming date")
 
 
 async def check_earnings_alerts():
     alerts = await Alert.find(Alert.alert_type == "EARNINGS", Alert.is_active == True).to_list()  # noqa: E712
+    if not alerts:
+        return
+    horizon = max(int(a.target_value or 3) for a in alerts)
+    upcoming = await find_upcoming_earnings(list({a.symbol for a in alerts}), days=horizon)
+    dates = {e["symbol"]: e["earnings_date"].replace(tzinfo=timezone.utc) for e in upcoming}
 
     for alert in alerts:
-        earnings_date = await get_earnings_date(alert.symbol)
+        earnings_date = dates.get(alert.symbol)
         if not earnings_date:
             continue
 
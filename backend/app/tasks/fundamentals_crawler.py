@@ -0,0 +1,11 @@
+from ..services.fundamentals import refresh_fundamentals
+from ..services.symbols import get_symbol_master
+from ..utils.logger import logger
+from .price_updater import tradable_symbols
+
+
+async def crawl_fundamentals():
+    """Nightly Screener.in crawl for every held symbol plus the symbol master."""
+    symbols = list(dict.fromkeys(await tradable_symbols() + get_symbol_master().symbols()))
+    count = await refresh_fundamentals(symbols)
+    logger.info(f"Fundamentals refreshed: {count}/{len(symbols)} symbols")
@@ -5,8 +5,9 @@ import pytz
 
 from ..core.config import settings
 from ..models.documents import Holding, User
-from ..services.cache import cache_get, cache_set, get_redis
+from ..services.cache import cache_get, cache_set, get_redis, user_cache_key
 from ..services.market.price_service import get_bulk_prices
+from ..services.market_calendar import is_trading_day
 from ..services.notification.service import send_email
 from ..utils.logger import logger
 
@@ -14,6 +15,9 @@ IST = pytz.timezone("Asia/Kolkata")
 
 
 async def send_hourly_update():
+    if not is_trading_day(datetime.now(IST).date()):
+        return
+
     redis = await get_redis()
     if redis:
         acquired = await redis.set("lock:hourly_update", "1", ex=55, nx=True)
@@ -32,7 +36,7 @@ async def send_hourly_update():
 
 async def _get_signals_for_user(user_id: str, holdings: list) -> dict:
     """Get cached signals or generate fresh ones."""
-    ck = f"hourly_signals:{user_id}"
+    ck = await user_cache_key("hourly_signals", user_id)
     cached = await cache_get(ck)
     if cached:
         return cached
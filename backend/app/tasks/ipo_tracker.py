@@ -5,8 +5,11 @@ import httpx
 
 from ..core.config import settings
 from ..models.documents import IPO, User
+from ..services.http_cache import conditional_headers, record, remember, response_validators
 from ..utils.logger import logger
 
+IPOWATCH_URL = "https://ipowatch.in/ipo-grey-market-premium-latest-ipo-gmp/"
+
 
 async def parse_date_range(date_text) -> tuple[datetime | None, datetime | None]:
     """Parse date range like '13-16 Jan' into open/close dates"""
@@ -55,9 +58,14 @@ async def scrape_ipo_data() -> None:
 
     try:
         async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(
-                "https://ipowatch.in/ipo-grey-market-premium-latest-ipo-gmp/", headers={"User-Agent": "Mozilla/5.0"}
-            )
+            # Statuses depend on today's date, so validators only carry over within a day
+            namespace = f"ipo:{datetime.utcnow().date()}"
+            conditional = await conditional_headers(namespace, IPOWATCH_URL)
+            resp = await client.get(IPOWATCH_URL, headers={"User-Agent": "Mozilla/5.0", **conditional})
+
+            if resp.status_code == 304:  # Page unchanged since the last scrape — the IPO collection is current
+                record("not_modified")
+                return
 
             if resp.status_code == 200:
                 from bs4 import BeautifulSoup
@@ -142,6 +150,8 @@ async def scrape_ipo_data() -> None:
                                     created_at=datetime.utcnow(),
                                     updated_at=datetime.utcnow(),
                                 ).insert()
+                record("fetched")
+                await remember(namespace, IPOWATCH_URL, response_validators(resp), ttl=86400)
     except (httpx.HTTPError, KeyError, ValueError) as e:
         logger.error(f"IPO scrape error: {e}")
 
@@ -11,65 +11,31 @@ import httpx
 from ..core.config import settings
 from ..models.documents import IPO, AdvisorHistory, Holding, User
 from ..services.cache import get_redis
+from ..services.market.candles import get_candles, with_live_bar
+from ..services.market.price_service import get_stock_price
+from ..services.market.rolling_stats import get_rolling_stats
 from ..services.notification.service import send_email
 from ..utils.logger import logger
 
-# Cache for stock data (symbol -> (data, timestamp))
-_advisor_cache = {}
-_CACHE_TTL = 3600  # 1 hour
-_MAX_CACHE_SIZE = 500  # Prevent unbounded growth
-
 
 async def get_stock_data(symbol: str) -> dict | None:
-    """Fetch comprehensive stock data with caching"""
-    import time
-
-    # Check cache
-    if symbol in _advisor_cache:
-        data, ts = _advisor_cache[symbol]
-        if time.time() - ts < _CACHE_TTL:
-            return data
-
-    try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(
-                f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.NS?interval=1d&range=1y",
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
-            if resp.status_code != 200:
-                return None
-
-            result = resp.json()["chart"]["result"][0]
-            meta = result["meta"]
-            quotes = result["indicators"]["quote"][0]
-
-            closes = [c for c in quotes["close"] if c]
-            highs = [h for h in quotes["high"] if h]
-            lows = [low for low in quotes["low"] if low]
-            volumes = [v for v in quotes["volume"] if v]
-
-            if len(closes) < 50:
-                return None
-
-            data = {
-                "symbol": symbol,
-                "current_price": meta.get("regularMarketPrice", closes[-1]),
-                "prev_close": meta.get("previousClose", closes[-2]),
-                "closes": closes,
-                "highs": highs,
-                "lows": lows,
-                "volumes": volumes,
-            }
-            # Prevent unbounded cache growth
-            if len(_advisor_cache) >= _MAX_CACHE_SIZE:
-                oldest_key = min(_advisor_cache.keys(), key=lambda k: _advisor_cache[k][1])
-                del _advisor_cache[oldest_key]
-            _advisor_cache[symbol] = (data, time.time())
-            return data
-    except (httpx.HTTPError, KeyError, ValueError) as e:
-        logger.debug(f"Stock data error for {symbol}: {e}")
+    """Daily history from the candle store plus today's live bar."""
+    candles, quote = await asyncio.gather(get_candles(symbol, days=365), get_stock_price(symbol))
+    candles = with_live_bar(candles, quote)
+    closes = [c["close"] for c in candles]
+    if len(closes) < 50:
         return None
 
+    return {
+        "symbol": symbol,
+        "current_price": (quote or {}).get("current_price") or closes[-1],
+        "prev_close": (quote or {}).get("previous_close") or closes[-2],
+        "closes": closes,
+        "highs": [c["high"] for c in candles if c["high"]],
+        "lows": [c["low"] for c in candles if c["low"]],
+        "volumes": [c["volume"] for c in candles if c["volume"]],
+    }
+
 
 async def fetch_stock_news(symbol: str) -> list:
     """Fetch recent news for a stock via shared news service."""
@@ -79,9 +45,13 @@ async def fetch_stock_news(symbol: str) -> list:
 
 
 async def get_bulk_stock_data(symbols: list) -> dict:
-    """Fetch stock data for multiple symbols concurrently"""
+    """Fetch stock data for multiple symbols concurrently, with precomputed rolling stats attached"""
     results = await asyncio.gather(*[get_stock_data(s) for s in symbols], return_exceptions=True)
-    return {s: r for s, r in zip(symbols, results) if r and not isinstance(r, Exception)}
+    data = {s: r for s, r in zip(symbols, results) if r and not isinstance(r, Exception)}
+    stats = await get_rolling_stats(list(data))
+    for s, d in data.items():
+        d["stats"] = stats.get(s)
+    return data
 
 
 def calculate_indicators(data: dict):
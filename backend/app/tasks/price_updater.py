@@ -1,37 +1,79 @@
+import time
 from datetime import datetime, timezone
+from typing import Dict, List
 
+from pymongo import UpdateOne
+
+from ..middleware.metrics import PRICE_UPDATE_DURATION, PRICE_UPDATE_SYMBOLS
 from ..models.documents import Holding, PriceCache
 from ..services.market.price_service import get_bulk_prices
+from ..services.market.provider import quote_provider
+from ..services.market_calendar import last_close, market_open
+from ..utils.logger import logger
 
+POST_CLOSE_WINDOW = 900  # Keep refreshing briefly after the close to capture closing prices
+PREFETCH_INTERVAL = 20  # Seconds between hot-quote refresh runs
+PREFETCH_LEAD = 25  # Refresh hot quotes this long before they go stale — must exceed the interval
 
-async def update_all_prices():
-    holdings = await Holding.find().to_list()
-    # Skip MF symbols - they don't have Yahoo prices
-    symbols = list(set(h.symbol for h in holdings if h.holding_type != "MF"))
 
-    if not symbols:
-        return
+async def tradable_symbols() -> List[str]:
+    """Distinct tradable symbols across all holdings — MF schemes have no Yahoo prices."""
+    return await Holding.get_motor_collection().distinct("symbol", {"holding_type": {"$ne": "MF"}})
 
-    prices = await get_bulk_prices(symbols)
-    now = datetime.now(timezone.utc)
 
+def _upserts(prices: Dict[str, Dict], now: datetime) -> List[UpdateOne]:
+    ops = []
     for symbol, data in prices.items():
         if not data.get("current_price"):
             continue
+        volume = data.get("volume")
+        ops.append(
+            UpdateOne(
+                {"symbol": symbol},
+                {
+                    "$set": {
+                        "price": data["current_price"],
+                        "change": data.get("day_change"),
+                        "change_percent": data.get("day_change_pct"),
+                        "volume": int(volume) if volume is not None else None,
+                        "last_updated": now,
+                        "updated_at": now,
+                    },
+                    "$setOnInsert": {"created_at": now},
+                },
+                upsert=True,
+            )
+        )
+    return ops
+
+
+async def update_all_prices():
+    if not market_open() and time.time() - last_close() > POST_CLOSE_WINDOW:
+        return
 
-        # Map API response to PriceCache fields
-        cache_data = {
-            "price": data.get("current_price"),
-            "change": data.get("day_change"),
-            "change_percent": data.get("day_change_pct"),
-            "volume": data.get("volume"),
-            "last_updated": now,
-        }
-
-        cache = await PriceCache.find_one(PriceCache.symbol == symbol)
-        if cache:
-            for k, v in cache_data.items():
-                setattr(cache, k, v)
-            await cache.save()
-        else:
-            await PriceCache(symbol=symbol, **cache_data).insert()
+    with PRICE_UPDATE_DURATION.labels(stage="total").time():
+        with PRICE_UPDATE_DURATION.labels(stage="universe").time():
+            symbols = await tradable_symbols()
+        if not symbols:
+            return
+
+        with PRICE_UPDATE_DURATION.labels(stage="fetch").time():
+            prices = await get_bulk_prices(symbols)
+
+        ops = _upserts(prices, datetime.now(timezone.utc))
+        if ops:
+            with PRICE_UPDATE_DURATION.labels(stage="write").time():
+                await PriceCache.get_motor_collection().bulk_write(ops, ordered=False)
+
+    PRICE_UPDATE_SYMBOLS.labels(result="requested").set(len(symbols))
+    PRICE_UPDATE_SYMBOLS.labels(result="written").set(len(ops))
+    logger.debug(f"Price cache updated: {len(ops)}/{len(symbols)} symbols")
+
+
+async def refresh_hot_quotes():
+    """Keep frequently read quotes fresh during the session so interactive reads rarely miss."""
+    if not market_open():
+        return
+    refreshed = await quote_provider.refresh_hot(PREFETCH_LEAD)
+    if refreshed:
+        logger.debug(f"Prefetched {refreshed} hot quotes")
@@ -2,16 +2,21 @@ import os
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from ..services.upstream_limiter import in_batch_lane
 from ..utils.logger import logger
 from .alert_checker import check_alerts, check_stop_losses
+from .cache_warmup import warm_market_open
+from .corporate_actions import refresh_all_corporate_actions
 from .digest_generator import generate_daily_digest
 from .distributed_lock import with_lock
-from .earnings_checker import check_earnings_alerts
+from .earnings_checker import check_earnings_alerts, refresh_all_earnings
+from .fundamentals_crawler import crawl_fundamentals
 from .hourly_update import send_hourly_update
 from .ipo_tracker import check_ipo_alerts, scrape_ipo_data
 from .portfolio_advisor import run_portfolio_advisor
-from .price_updater import update_all_prices
+from .price_updater import PREFETCH_INTERVAL, refresh_hot_quotes, update_all_prices
 from .snapshot import take_daily_snapshot
+from .stats_updater import update_rolling_stats
 from .tax_harvest_alert import check_tax_harvesting
 from .weekly_report import send_weekly_report
 from .ws_broadcaster import broadcast_prices
@@ -32,18 +37,26 @@ def start_scheduler():
     if not _is_primary_worker():
         logger.info("Scheduler disabled for this worker")
         return
-    # WebSocket price broadcast (every 5 seconds during market hours)
+    # WebSocket price broadcast (every 5 seconds during market hours) — feeds live clients, so it
+    # stays in the interactive upstream lane; every other job queues behind user requests
     scheduler.add_job(broadcast_prices, "interval", seconds=5, id="ws_broadcast")
 
     # Price updates
-    scheduler.add_job(update_all_prices, "interval", minutes=5, id="price_update")
+    scheduler.add_job(in_batch_lane(update_all_prices), "interval", minutes=5, id="price_update")
+
+    # Hot-quote prefetch - refresh frequently read symbols before their cache entries go stale (locked)
+    @with_lock("job:quote_prefetch", ttl=PREFETCH_INTERVAL)
+    async def _locked_prefetch():
+        await refresh_hot_quotes()
+
+    scheduler.add_job(in_batch_lane(_locked_prefetch), "interval", seconds=PREFETCH_INTERVAL, id="quote_prefetch")
 
     # User-defined price alerts
-    scheduler.add_job(check_alerts, "interval", minutes=1, id="alert_check")
+    scheduler.add_job(in_batch_lane(check_alerts), "interval", minutes=1, id="alert_check")
 
     # Stop-loss breach monitoring (every 5 min during market hours)
     scheduler.add_job(
-        check_stop_losses,
+        in_batch_lane(check_stop_losses),
         "cron",
         day_of_week="mon-fri",
         hour="9-16",
@@ -52,39 +65,43 @@ def start_scheduler():
     )
 
     # Hourly portfolio update (market hours: 9 AM - 4 PM IST, weekdays only)
-    scheduler.add_job(send_hourly_update, "cron", day_of_week="mon-fri", hour="9-16", minute=0, id="hourly_update")
+    scheduler.add_job(
+        in_batch_lane(send_hourly_update), "cron", day_of_week="mon-fri", hour="9-16", minute=0, id="hourly_update"
+    )
 
     # Smart Portfolio Advisor - twice daily during market hours
-    scheduler.add_job(run_portfolio_advisor, "cron", hour=9, minute=30, id="advisor_morning")
-    scheduler.add_job(run_portfolio_advisor, "cron", hour=15, minute=0, id="advisor_afternoon")
+    scheduler.add_job(in_batch_lane(run_portfolio_advisor), "cron", hour=9, minute=30, id="advisor_morning")
+    scheduler.add_job(in_batch_lane(run_portfolio_advisor), "cron", hour=15, minute=0, id="advisor_afternoon")
 
     # Daily digest at 6 PM IST (locked — must not duplicate)
     @with_lock("job:daily_digest", ttl=300)
     async def _locked_digest():
         await generate_daily_digest()
 
-    scheduler.add_job(_locked_digest, "cron", hour=18, minute=0, id="daily_digest")
+    scheduler.add_job(in_batch_lane(_locked_digest), "cron", hour=18, minute=0, id="daily_digest")
 
     # Earnings reminders at 9 AM IST
-    scheduler.add_job(check_earnings_alerts, "cron", hour=9, minute=0, id="earnings_check")
+    scheduler.add_job(in_batch_lane(check_earnings_alerts), "cron", hour=9, minute=0, id="earnings_check")
 
     # IPO tracking
-    scheduler.add_job(scrape_ipo_data, "interval", hours=2, id="ipo_scrape")
-    scheduler.add_job(check_ipo_alerts, "cron", hour=9, minute=30, id="ipo_alerts")
+    scheduler.add_job(in_batch_lane(scrape_ipo_data), "interval", hours=2, id="ipo_scrape")
+    scheduler.add_job(in_batch_lane(check_ipo_alerts), "cron", hour=9, minute=30, id="ipo_alerts")
 
     # Weekly AI report - Saturday 10 AM IST (locked)
     @with_lock("job:weekly_report", ttl=600)
     async def _locked_weekly():
         await send_weekly_report()
 
-    scheduler.add_job(_locked_weekly, "cron", day_of_week="sat", hour=10, minute=0, id="weekly_report")
+    scheduler.add_job(in_batch_lane(_locked_weekly), "cron", day_of_week="sat", hour=10, minute=0, id="weekly_report")
 
     # Tax harvesting alerts - Monday 9 AM IST (locked)
     @with_lock("job:tax_harvest", ttl=300)
     async def _locked_tax_harvest():
         await check_tax_harvesting()
 
-    scheduler.add_job(_locked_tax_harvest, "cron", day_of_week="mon", hour=9, minute=0, id="tax_harvest_alert")
+    scheduler.add_job(
+        in_batch_lane(_locked_tax_harvest), "cron", day_of_week="mon", hour=9, minute=0, id="tax_harvest_alert"
+    )
 
     # Daily portfolio snapshot - 4 PM IST weekdays (locked)
     @with_lock("job:daily_snapshot", ttl=300)
@@ -92,7 +109,7 @@ def start_scheduler():
         await take_daily_snapshot()
 
     scheduler.add_job(
-        _locked_snapshot,
+        in_batch_lane(_locked_snapshot),
         "cron",
         day_of_week="mon-fri",
         hour=16,
@@ -100,5 +117,46 @@ def start_scheduler():
         id="daily_snapshot",
     )
 
+    # Rolling stats (52w range, avg volume, SMAs, ATR) from the day's candles - 4:15 PM IST weekdays (locked)
+    @with_lock("job:rolling_stats", ttl=900)
+    async def _locked_rolling_stats():
+        await update_rolling_stats()
+
+    scheduler.add_job(
+        in_batch_lane(_locked_rolling_stats), "cron", day_of_week="mon-fri", hour=16, minute=15, id="rolling_stats"
+    )
+
+    # Earnings dates for all held and watchlisted symbols - nightly 8 PM IST (locked)
+    @with_lock("job:earnings_refresh", ttl=900)
+    async def _locked_earnings():
+        await refresh_all_earnings()
+
+    scheduler.add_job(in_batch_lane(_locked_earnings), "cron", hour=20, minute=0, id="earnings_refresh")
+
+    # Corporate actions (dividends/splits) for all held symbols - nightly 8:30 PM IST (locked)
+    @with_lock("job:corporate_actions", ttl=900)
+    async def _locked_corporate_actions():
+        await refresh_all_corporate_actions()
+
+    scheduler.add_job(
+        in_batch_lane(_locked_corporate_actions), "cron", hour=20, minute=30, id="corporate_actions_refresh"
+    )
+
+    # Fundamentals crawl (Screener.in) - nightly 9 PM IST (locked)
+    @with_lock("job:fundamentals_crawl", ttl=1800)
+    async def _locked_fundamentals():
+        await crawl_fundamentals()
+
+    scheduler.add_job(in_batch_lane(_locked_fundamentals), "cron", hour=21, minute=0, id="fundamentals_crawl")
+
+    # Quote and dashboard cache warmup ahead of the open - weekdays 9:10 AM IST (locked)
+    @with_lock("job:market_open_warmup", ttl=300)
+    async def _locked_warmup():
+        await warm_market_open()
+
+    scheduler.add_job(
+        in_batch_lane(_locked_warmup), "cron", day_of_week="mon-fri", hour=9, minute=10, id="market_open_warmup"
+    )
+
     scheduler.start()
     logger.info("Scheduler started with all jobs (IST timezone)")
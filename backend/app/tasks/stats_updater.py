@@ -0,0 +1,13 @@
+from ..services.market.rolling_stats import refresh_rolling_stats
+from ..services.symbols import get_symbol_master
+from ..utils.logger import logger
+from .price_updater import tradable_symbols
+
+
+async def update_rolling_stats():
+    """Post-close recompute of rolling stats for held symbols and the symbol master.
+
+    Rows already at the last completed session are skipped, so holiday runs are no-ops."""
+    symbols = list(dict.fromkeys(await tradable_symbols() + get_symbol_master().symbols()))
+    count = await refresh_rolling_stats(symbols)
+    logger.info(f"Rolling stats updated: {count}/{len(symbols)} symbols")
@@ -1,13 +1,14 @@
 """WebSocket price broadcaster - pushes real-time updates to subscribed clients."""
 
-from ..services.cache import market_open
+from ..services.market.intraday import intraday_recorder
 from ..services.market.price_service import get_bulk_prices
+from ..services.market_calendar import market_open
 from ..services.websocket import ws_manager
 from ..utils.logger import logger
 
 
 async def broadcast_prices():
-    """Fetch prices for subscribed symbols and broadcast to WebSocket clients."""
+    """Fetch prices for subscribed symbols, record them as intraday ticks and broadcast to WebSocket clients."""
     if not market_open():
         return
 
@@ -16,6 +17,7 @@ async def broadcast_prices():
         return
 
     prices = await get_bulk_prices(symbols)
+    await intraday_recorder.record(prices)
     for symbol, data in prices.items():
         await ws_manager.broadcast_price(symbol, data)
 
@@ -122,3 +122,16 @@ def fy_boundary_dates():
         "last_day_curr_fy": date(2026, 3, 31),
         "first_day_next_fy": date(2026, 4, 1),
     }
+
+
+# ── Shared state ──
+
+
+@pytest.fixture(autouse=True)
+def closed_redis_breaker():
+    """Start every test with the Redis circuit closed, whatever earlier tests tripped."""
+    from app.services import cache
+
+    cache.redis_breaker.success()
+    yield
+    cache.redis_breaker.success()
@@ -0,0 +1,97 @@
+"""Unit tests for the cache-aside helpers."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.middleware.metrics import CACHE_HIT, CACHE_MISS
+from app.services import cache_aside
+from app.services.cache_aside import NEGATIVE_TTL, cache_aside as cache_aside_decorator, cached, jittered
+
+
+class FakeCache:
+    def __init__(self):
+        self.store, self.ttls = {}, {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ttl=60):
+        self.store[key], self.ttls[key] = value, ttl
+        return True
+
+
+@pytest.fixture
+def fake_cache():
+    fake = FakeCache()
+    with patch.object(cache_aside, "cache_get", fake.get), patch.object(cache_aside, "cache_set", fake.set):
+        yield fake
+
+
+def test_jitter_stays_within_spread():
+    ttls = {jittered(1000) for _ in range(200)}
+    assert min(ttls) >= 900 and max(ttls) <= 1100 and len(ttls) > 1
+
+
+@pytest.mark.asyncio
+async def test_miss_then_hit_counts_per_namespace(fake_cache):
+    loader = AsyncMock(return_value={"score": 80})
+    hits, misses = CACHE_HIT.labels("health_score")._value.get(), CACHE_MISS.labels("health_score")._value.get()
+    assert await cached("health_score:u1:v0", loader, ttl=300) == {"score": 80}
+    assert await cached("health_score:u1:v0", loader, ttl=300) == {"score": 80}
+    loader.assert_awaited_once()
+    assert 270 <= fake_cache.ttls["health_score:u1:v0"] <= 330
+    assert CACHE_HIT.labels("health_score")._value.get() == hits + 1
+    assert CACHE_MISS.labels("health_score")._value.get() == misses + 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(fake_cache):
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [1, 2]
+
+    results = await asyncio.gather(*[cached("k:1", slow, ttl=60) for _ in range(5)])
+    assert results == [[1, 2]] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_and_none_results_are_negative_cached(fake_cache):
+    none_loader = AsyncMock(return_value=None)
+    assert await cached("fii:x", none_loader, ttl=1800) is None
+    assert await cached("fii:x", none_loader, ttl=1800) is None
+    none_loader.assert_awaited_once()
+    assert fake_cache.ttls["fii:x"] == NEGATIVE_TTL
+
+    await cached("ins:x", AsyncMock(return_value={"insights": []}), ttl=1800, empty=lambda r: not r["insights"])
+    assert fake_cache.ttls["ins:x"] == NEGATIVE_TTL
+
+
+@pytest.mark.asyncio
+async def test_decorator_keys_by_user_version_and_args(fake_cache):
+    @cache_aside_decorator("snapshots", ttl=lambda: 100)
+    async def snapshots(user_id, range):
+        return {"user": user_id, "range": range}
+
+    with patch.object(cache_aside, "user_cache_key", AsyncMock(side_effect=lambda *p: ":".join(map(str, p)))):
+        assert await snapshots("u1", "3M") == {"user": "u1", "range": "3M"}
+    assert "snapshots:u1:3M" in fake_cache.store
+
+
+@pytest.mark.asyncio
+async def test_mf_holdings_load_once_under_existing_key(fake_cache):
+    from app.services.mf import service as mf_service
+
+    load = AsyncMock(return_value=[["TCS", 8.5]])
+    with patch.object(mf_service, "_load_mf_holdings", load):
+        assert await mf_service.fetch_mf_holdings("Parag Parikh Flexi Cap") == [["TCS", 8.5]]
+        assert await mf_service.fetch_mf_holdings("Parag Parikh Flexi Cap") == [["TCS", 8.5]]
+    load.assert_awaited_once()
+    (key,) = fake_cache.store
+    assert key.startswith("mf_holdings:") and 77760 <= fake_cache.ttls[key] <= 95040
@@ -0,0 +1,47 @@
+"""Unit tests for the cache value codec."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import cache, cache_codec
+from app.services.cache_codec import MAGIC, CacheCodec
+
+VALUE = {"holdings": [{"symbol": "TCS", "qty": 10, "avg": 3412.5}] * 200, "sectors": {"IT": 100.0}}
+
+
+def test_round_trip_small_value_is_uncompressed():
+    codec = CacheCodec(threshold=1 << 20)
+    data = codec.encode({"a": 1})
+    assert data[0] == MAGIC and data[1] & 0x0F == cache_codec.NONE
+    assert codec.decode(data) == {"a": 1}
+
+
+def test_large_value_compressed_when_library_available():
+    codec = CacheCodec(compressor="zstd", threshold=64)
+    data = codec.encode(VALUE)
+    assert codec.decode(data) == VALUE
+    if len(cache_codec._COMPRESSORS) > 1:
+        assert data[1] & 0x0F != cache_codec.NONE
+        assert len(data) < len(json.dumps(VALUE))
+
+
+def test_decodes_legacy_json_and_rejects_unknown_flags():
+    codec = CacheCodec()
+    assert codec.decode(b'{"legacy": true}') == {"legacy": True}
+    assert codec.decode(bytes((MAGIC, 0xF0)) + b"{}") is None
+    assert codec.decode(None) is None
+
+
+def test_unavailable_serializer_falls_back_to_json():
+    with patch.dict(cache_codec._SERIALIZERS, clear=False):
+        cache_codec._SERIALIZERS.pop(cache_codec.MSGPACK, None)
+        assert CacheCodec(serializer="msgpack").serializer == cache_codec.JSON
+
+
+@pytest.mark.asyncio
+async def test_mget_decodes_only_hits():
+    r = MagicMock(mget=AsyncMock(return_value=[cache.codec.encode({"p": 1}), None, b"\x01\xff"]))
+    with patch.object(cache, "get_redis_bytes", AsyncMock(return_value=r)):
+        assert await cache.cache_mget(["a", "b", "c"]) == {"a": {"p": 1}, "c": None}
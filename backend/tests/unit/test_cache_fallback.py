@@ -0,0 +1,125 @@
+"""Unit tests for the Redis circuit breaker and the local fallback cache tier."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import cache
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.singleflight import claim
+from app.services.upstream_limiter import HostLimiter, Lane
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(cache, "redis_breaker", CircuitBreaker(threshold=2, cooldown=10.0))
+    cache._fallback.clear()
+    cache._pending_bumps.clear()
+    cache._pending_deletes.clear()
+    yield
+    cache._fallback.clear()
+    cache._pending_bumps.clear()
+    cache._pending_deletes.clear()
+
+
+def _down():
+    return AsyncMock(side_effect=ConnectionError("Redis down"))
+
+
+def test_breaker_opens_then_probes_once_per_cooldown(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.services.circuit_breaker.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(threshold=2, cooldown=10.0)
+    breaker.failure()
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.is_open and not breaker.allow()
+    clock[0] += 11
+    assert breaker.allow()  # Probe
+    assert not breaker.allow()  # Others wait for the probe's cooldown
+    assert breaker.success() is True
+    assert not breaker.is_open and breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_degraded_mode_serves_locally_without_touching_redis():
+    get_bytes = _down()
+    with patch.object(cache, "get_redis_bytes", get_bytes):
+        await cache.cache_set("dashboard:u1:v0", {"a": 1}, ttl=60)
+        await cache.cache_set("dashboard:u2:v0", {"b": 2}, ttl=60)
+        assert cache.redis_breaker.is_open
+        calls = get_bytes.await_count
+        assert await cache.cache_get("dashboard:u1:v0") == {"a": 1}
+        assert await cache.cache_mget(["dashboard:u2:v0", "missing"]) == {"dashboard:u2:v0": {"b": 2}}
+        assert get_bytes.await_count == calls
+
+
+@pytest.mark.asyncio
+async def test_degraded_bumps_move_local_versions():
+    with patch.object(cache, "get_redis", _down()):
+        await cache.bump_data_version("u1")
+        await cache.bump_data_version("u1")
+        assert await cache.user_cache_key("dashboard", "u1") == "dashboard:u1:v2"
+    assert cache._pending_bumps == {"u1": 2}
+
+
+@pytest.mark.asyncio
+async def test_recovery_resyncs_values_and_bumps(monkeypatch):
+    with patch.object(cache, "get_redis_bytes", _down()):
+        await cache.cache_set("k1", {"v": 1}, ttl=60)
+        await cache.cache_set("k2", {"v": 2}, ttl=60)
+    cache._pending_bumps["u1"] = 1
+    monkeypatch.setattr(cache.redis_breaker, "opened_at", -1000.0)
+
+    pipe = MagicMock(execute=AsyncMock(return_value=[]))
+    r = MagicMock(get=AsyncMock(return_value=None), pipeline=MagicMock(return_value=pipe))
+    with patch.object(cache, "get_redis_bytes", AsyncMock(return_value=r)):
+        assert await cache.cache_get("k3") is None
+
+    assert not cache.redis_breaker.is_open
+    pipe.incrby.assert_called_once_with("data_version:u1", 1)
+    assert {c.args[0] for c in pipe.set.call_args_list} == {"k1", "k2"}
+    assert all(c.kwargs["nx"] for c in pipe.set.call_args_list)
+    assert len(cache._fallback) == 0 and not cache._pending_bumps
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_short_circuits_limiter_and_claim():
+    get_redis = _down()
+    limiter = HostLimiter("example.com", rate=1, burst=1)
+    with patch.object(cache, "get_redis", get_redis):
+        assert await claim(["price:TCS:NSE"]) == ["price:TCS:NSE"]  # Fails open
+        assert await limiter._take(Lane.INTERACTIVE) == 0  # Local bucket
+        assert cache.redis_breaker.is_open
+        get_redis.reset_mock()
+
+        assert await claim(["price:INFY:NSE"]) == ["price:INFY:NSE"]
+        assert await limiter._take(Lane.INTERACTIVE) > 0  # Local bucket now empty
+    get_redis.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_degraded_deletes_are_replayed_on_recovery(monkeypatch):
+    with patch.object(cache, "get_redis", _down()), patch.object(cache, "get_redis_bytes", _down()):
+        await cache.cache_set("ipo:upcoming", ["old"], ttl=60)
+        assert await cache.cache_delete("ipo:upcoming") is False
+    assert await cache.cache_get("ipo:upcoming") is None
+    monkeypatch.setattr(cache.redis_breaker, "opened_at", -1000.0)
+
+    pipe = MagicMock(execute=AsyncMock(return_value=[]))
+    r = MagicMock(get=AsyncMock(return_value=None), pipeline=MagicMock(return_value=pipe))
+    with patch.object(cache, "get_redis_bytes", AsyncMock(return_value=r)):
+        await cache.cache_get("k")
+    pipe.delete.assert_called_once_with("ipo:upcoming")
+    assert not cache._pending_deletes
+
+
+@pytest.mark.asyncio
+async def test_unencodable_mset_value_is_not_a_redis_failure():
+    pipe = MagicMock(execute=AsyncMock(return_value=[]))
+    r = MagicMock(pipeline=MagicMock(return_value=pipe))
+    with patch.object(cache, "get_redis_bytes", AsyncMock(return_value=r)):
+        for _ in range(3):
+            assert await cache.cache_mset({"ok": {"v": 1}, "bad": {"v": object()}}) is False
+    assert not cache.redis_breaker.is_open
+    assert {c.args[0] for c in pipe.setex.call_args_list} == {"ok"}
@@ -0,0 +1,98 @@
+"""Unit tests for the market-open cache warmup."""
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import cache, cache_aside
+from app.services.cache_aside import cache_aside as cache_aside_decorator
+from app.services.market import provider as provider_module
+from app.services.market.provider import STALE_GRACE, QuoteProvider, is_stale
+from app.services.market.sources import make_quote
+from app.tasks import cache_warmup
+
+
+@pytest.mark.asyncio
+async def test_prefetch_stores_batches_under_the_given_ttl():
+    provider = QuoteProvider([], batch_sources=[])
+    provider.fetch_many = AsyncMock(
+        side_effect=lambda symbols, exchange: {s: make_quote(s, exchange, 10.0) for s in symbols}
+    )
+    mset = AsyncMock()
+    with patch.object(provider_module, "cache_mset", mset):
+        assert await provider.prefetch(["TCS", "INFY", "ITC"], ttl=400, batch_size=2) == 3
+    assert [c.args[0] for c in provider.fetch_many.call_args_list] == [["TCS", "INFY"], ["ITC"]]
+    assert {c.args[1] for c in mset.call_args_list} == {400 + STALE_GRACE}
+
+
+@pytest.mark.asyncio
+async def test_warmed_quotes_stay_fresh_past_the_open():
+    provider = QuoteProvider([], batch_sources=[])
+    provider.fetch_many = AsyncMock(return_value={"TCS": make_quote("TCS", "NSE", 10.0)})
+    with patch.object(provider_module, "cache_mset", AsyncMock()) as mset:
+        await provider.prefetch(["TCS"], ttl=360)
+    quote = mset.call_args.args[0]["price:TCS:NSE"]
+    opened = quote["fetched_at"] + 300  # Market opens five minutes after the warmup
+    with (
+        patch.object(provider_module, "quote_ttl", return_value=60),
+        patch.object(provider_module, "last_close", return_value=quote["fetched_at"] - 3600),
+        patch.object(provider_module.time, "time", return_value=opened + 30),
+    ):
+        assert not is_stale(quote)
+        assert is_stale({**quote, "fresh_until": None})
+
+
+@pytest.mark.asyncio
+async def test_prime_overwrites_entry_with_override_ttl():
+    stored = {}
+
+    async def fake_set(key, value, ttl=60):
+        stored[key] = (value, ttl)
+
+    @cache_aside_decorator("dashboard", ttl=120)
+    async def dashboard(user_id):
+        return {"user": user_id}
+
+    with (
+        patch.object(cache_aside, "cache_set", fake_set),
+        patch.object(cache_aside, "user_cache_key", AsyncMock(return_value="dashboard:u1:v3")),
+    ):
+        assert await dashboard.prime("u1", ttl=1000) == {"user": "u1"}
+    value, ttl = stored["dashboard:u1:v3"]
+    assert value == {"user": "u1"} and 900 <= ttl <= 1100
+
+
+@pytest.mark.asyncio
+async def test_active_users_ranked_by_days_seen():
+    pipe = MagicMock(execute=AsyncMock(return_value=[{"a", "b"}, {"b"}, {"b", "c", "a"}]))
+    redis = MagicMock(pipeline=MagicMock(return_value=pipe))
+    with patch.object(cache, "get_redis", AsyncMock(return_value=redis)):
+        users = await cache_warmup.active_users(days=3, limit=2)
+    assert users == ["b", "a"]
+    assert pipe.smembers.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_warmup_prefetches_universe_and_primes_dashboards():
+    provider = MagicMock(prefetch=AsyncMock(return_value=2))
+    prime = AsyncMock(side_effect=[{}, RuntimeError("boom")])
+    with (
+        patch.object(cache_warmup, "warm_symbols", AsyncMock(return_value=["INFY", "TCS"])),
+        patch.object(cache_warmup, "active_users", AsyncMock(return_value=["u1", "u2"])),
+        patch.object(cache_warmup, "quote_provider", provider),
+        patch.object(cache_warmup, "seconds_until_next_open", return_value=300),
+        patch.object(cache_warmup.get_dashboard_data, "prime", prime),
+    ):
+        await cache_warmup.warm_market_open(date(2026, 10, 19))
+    assert provider.prefetch.call_args.args[0] == ["INFY", "TCS"]
+    assert 324 <= provider.prefetch.call_args.kwargs["ttl"] <= 396
+    assert prime.await_count == 2
+    assert prime.call_args.kwargs["ttl"] == 300 + cache_warmup.DASHBOARD_TTL
+
+
+@pytest.mark.asyncio
+async def test_warmup_skips_holidays():
+    with patch.object(cache_warmup, "warm_symbols", AsyncMock()) as symbols:
+        await cache_warmup.warm_market_open(date(2026, 10, 18))  # Sunday
+    symbols.assert_not_awaited()
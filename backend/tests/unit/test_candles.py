@@ -0,0 +1,65 @@
+"""Unit tests for the daily candle store."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.market import candles
+from app.services.market.candles import with_live_bar
+from app.services.market_calendar import last_complete_session
+
+
+class TestWithLiveBar:
+    BARS = [{"date": "2020-01-01", "open": 1, "high": 2, "low": 1, "close": 2, "volume": 10}]
+    QUOTE = {"current_price": 105.0, "day_open": 100.0, "day_high": 106.0, "day_low": 99.0, "volume": 500}
+
+    def test_appends_bar_while_open(self):
+        with patch.object(candles, "market_open", return_value=True):
+            result = with_live_bar(self.BARS, self.QUOTE)
+        assert len(result) == 2
+        assert result[-1]["close"] == 105.0
+        assert result[-1]["high"] == 106.0
+
+    def test_unchanged_when_closed(self):
+        with patch.object(candles, "market_open", return_value=False):
+            assert with_live_bar(self.BARS, self.QUOTE) == self.BARS
+
+
+class TestSync:
+    @pytest.mark.asyncio
+    async def test_skips_when_marker_current(self):
+        with (
+            patch.object(candles, "cache_get", AsyncMock(return_value=last_complete_session())),
+            patch.object(candles, "fetch_yahoo_candles", AsyncMock()) as fetch,
+        ):
+            assert await candles.sync_candles("TCS") == 0
+        fetch.assert_not_called()
+
+
+class TestChartRoute:
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_symbol_before_touching_the_store(self):
+        from fastapi import HTTPException
+
+        from app.api.v1.market import routes
+
+        with patch.object(routes, "get_candles", AsyncMock()) as get_candles:
+            with pytest.raises(HTTPException) as exc:
+                await routes.get_chart_data("../../etc", range="6mo", interval="1d")
+        assert exc.value.status_code == 400
+        get_candles.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_daily_chart_includes_todays_bar_during_session(self):
+        from app.api.v1.market import routes
+
+        stored = [{"date": "2020-01-01", "open": 1, "high": 2, "low": 1, "close": 2, "volume": 10}]
+        with (
+            patch.object(routes, "get_candles", AsyncMock(return_value=stored)) as get_candles,
+            patch.object(routes, "is_market_open", return_value=True),
+            patch.object(candles, "market_open", return_value=True),
+            patch.object(routes, "get_stock_price", AsyncMock(return_value=TestWithLiveBar.QUOTE)),
+        ):
+            resp = await routes.get_chart_data("tcs", range="6mo", interval="1d")
+        get_candles.assert_awaited_once_with("TCS", days=routes.PERIOD_DAYS["6mo"])
+        assert [c["close"] for c in resp.data["candles"]] == [2, 105.0]
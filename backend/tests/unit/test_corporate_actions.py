@@ -0,0 +1,39 @@
+"""Unit tests for the corporate actions store."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.market import corporate_actions
+from app.services.market.corporate_actions import describe_action, parse_chart_events, refresh_corporate_actions
+
+EVENTS = {
+    "dividends": {"1760500800": {"amount": 11.0, "date": 1760500800}, "1729000000": {"amount": 0}},
+    "splits": {"1729000000": {"date": 1729000000, "numerator": 2, "denominator": 1, "splitRatio": "2:1"}},
+}
+
+
+def test_parses_dividends_and_splits():
+    actions = parse_chart_events(EVENTS)
+    assert {"action_type": "DIVIDEND", "ex_date": "2025-10-15", "value": 11.0, "ratio": ""} in actions
+    assert {"action_type": "SPLIT", "ex_date": "2024-10-15", "value": 2.0, "ratio": "2:1"} in actions
+    assert len(actions) == 2
+
+
+def test_description_follows_action_type():
+    assert describe_action({"action_type": "DIVIDEND", "value": 12.5, "ratio": ""}) == "₹12.5 per share dividend"
+    assert describe_action({"action_type": "SPLIT", "value": 5.0, "ratio": "5:1"}) == "5:1 stock split"
+
+
+@pytest.mark.asyncio
+async def test_refresh_upserts_all_symbols_in_one_write():
+    collection = MagicMock(bulk_write=AsyncMock())
+    fetched = {"TCS": parse_chart_events(EVENTS), "INFY": None}
+    with (
+        patch.object(corporate_actions, "fetch_yahoo_events", AsyncMock(side_effect=lambda s: fetched[s])),
+        patch.object(corporate_actions.CorporateAction, "get_motor_collection", return_value=collection),
+    ):
+        assert await refresh_corporate_actions(["TCS", "INFY"]) == 2
+    ops = collection.bulk_write.call_args.args[0]
+    assert {op._filter["symbol"] for op in ops} == {"TCS"}
+    assert collection.bulk_write.call_args.kwargs == {"ordered": False}
@@ -0,0 +1,63 @@
+"""Unit tests for the earnings calendar store."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.market import earnings
+from app.services.market.earnings import find_upcoming_earnings, parse_screener_date, refresh_earnings
+from app.tasks import earnings_checker
+
+
+def test_parses_screener_results_date():
+    html = "<li>Board Meeting to consider Results on 12 Nov 2026</li><li>AGM 3 Aug 2026</li>"
+    assert parse_screener_date(html) == datetime(2026, 11, 12, tzinfo=timezone.utc)
+    assert parse_screener_date("<p>No announcements</p>") is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_upserts_only_symbols_with_a_date():
+    collection = MagicMock(bulk_write=AsyncMock())
+    dt = datetime.now(timezone.utc) + timedelta(days=5)
+    fetched = {"TCS": {"earnings_date": dt, "source": "yahoo"}, "INFY": None}
+    with (
+        patch.object(earnings, "fetch_earnings_date", AsyncMock(side_effect=lambda s: fetched[s])),
+        patch.object(earnings.EarningsEvent, "get_motor_collection", return_value=collection),
+    ):
+        assert await refresh_earnings(["TCS", "INFY"]) == 1
+    (op,) = collection.bulk_write.call_args.args[0]
+    assert op._filter == {"symbol": "TCS"}
+    assert op._doc["$set"]["earnings_date"] == dt
+
+
+@pytest.mark.asyncio
+async def test_find_upcoming_is_one_range_query():
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.__aiter__.return_value = iter(
+        [{"symbol": "TCS", "earnings_date": datetime(2026, 11, 12), "source": "yahoo"}]
+    )
+    collection = MagicMock(find=MagicMock(return_value=cursor))
+    with patch.object(earnings.EarningsEvent, "get_motor_collection", return_value=collection):
+        rows = await find_upcoming_earnings(["TCS", "INFY"], days=3)
+    assert [r["symbol"] for r in rows] == ["TCS"]
+    query = collection.find.call_args.args[0]
+    assert query["symbol"] == {"$in": ["TCS", "INFY"]}
+    assert query["earnings_date"]["$lt"] - query["earnings_date"]["$gte"] == timedelta(days=4)
+    assert await find_upcoming_earnings([]) == []
+
+
+@pytest.mark.asyncio
+async def test_nightly_refresh_covers_earnings_alert_symbols():
+    watchlist = MagicMock(distinct=AsyncMock(return_value=["INFY"]))
+    alerts = MagicMock(distinct=AsyncMock(return_value=["ITC"]))
+    with (
+        patch.object(earnings_checker, "tradable_symbols", AsyncMock(return_value=["TCS"])),
+        patch.object(earnings_checker.WatchlistItem, "get_motor_collection", return_value=watchlist),
+        patch.object(earnings_checker.Alert, "get_motor_collection", return_value=alerts),
+        patch.object(earnings_checker, "refresh_earnings", AsyncMock(return_value=3)) as refresh,
+    ):
+        await earnings_checker.refresh_all_earnings()
+    refresh.assert_awaited_once_with(["INFY", "ITC", "TCS"])
+    alerts.distinct.assert_awaited_once_with("symbol", {"alert_type": "EARNINGS", "is_active": True})
@@ -0,0 +1,74 @@
+"""Unit tests for the fundamentals parser and store."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.fundamentals import parse_screener_page, store
+
+PAGE = """
+<html><body>
+<h1>Tata Consultancy Services Ltd</h1>
+<ul id="top-ratios">
+  <li class="flex flex-space-between"><span class="name">Market Cap</span>
+    <span class="nowrap value">₹ <span class="number">14,52,310</span> Cr.</span></li>
+  <li class="flex flex-space-between"><span class="name">Current Price</span>
+    <span class="nowrap value">₹ <span class="number">4,012</span></span></li>
+  <li class="flex flex-space-between"><span class="name">High / Low</span>
+    <span class="nowrap value">₹ <span class="number">4,592</span> / <span class="number">3,056</span></span></li>
+  <li class="flex flex-space-between"><span class="name">Stock P/E</span>
+    <span class="nowrap value"><span class="number">30.4</span></span></li>
+  <li class="flex flex-space-between"><span class="name">Book Value</span>
+    <span class="nowrap value">₹ <span class="number">200</span></span></li>
+  <li class="flex flex-space-between"><span class="name">ROCE</span>
+    <span class="nowrap value"><span class="number">64.6</span> %</span></li>
+  <li class="flex flex-space-between"><span class="name">ROE</span>
+    <span class="nowrap value"><span class="number">51.5</span> %</span></li>
+</ul>
+<table class="ranges-table"><tr><th colspan="2">Compounded Profit Growth</th></tr>
+  <tr><td>10 Years:</td><td>11%</td></tr><tr><td>3 Years:</td><td>9%</td></tr></table>
+<section id="shareholding"><table>
+  <tr><td class="text"><button>Promoters&nbsp;<span>+</span></button></td><td>72.30%</td><td>71.77%</td></tr>
+  <tr><td class="text">FIIs</td><td>12.0%</td><td>12.4%</td></tr>
+</table></section>
+</body></html>
+"""
+
+
+class TestParser:
+    def test_extracts_typed_ratios(self):
+        data = parse_screener_page(PAGE)
+        assert data["company_name"] == "Tata Consultancy Services Ltd"
+        assert data["market_cap"] == 1452310
+        assert data["pe"] == 30.4
+        assert (data["roe"], data["roce"]) == (51.5, 64.6)
+        assert (data["high_52w"], data["low_52w"]) == (4592, 3056)
+        assert data["profit_growth_3yr"] == 9
+        assert data["promoter_holding"] == 71.77
+
+    def test_derives_pb_from_book_value(self):
+        assert parse_screener_page(PAGE)["pb"] == round(4012 / 200, 2)
+
+    def test_missing_ratios_left_out(self):
+        assert "debt_equity" not in parse_screener_page(PAGE)
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_scrapes_only_missing_or_stale():
+    now = datetime.now(timezone.utc)
+    fresh = MagicMock(symbol="TCS", fetched_at=now)
+    stale = MagicMock(symbol="INFY", fetched_at=now - timedelta(days=30))
+    query = MagicMock(to_list=AsyncMock(return_value=[fresh, stale]))
+    refetched = MagicMock(symbol="INFY", fetched_at=now)
+    store._local.clear()
+    with (
+        patch.object(store.StockFundamentals, "find", return_value=query),
+        patch.object(
+            store, "_fetch_and_store", AsyncMock(side_effect=lambda s: refetched if s == "INFY" else None)
+        ) as fetch,
+    ):
+        result = await store.get_fundamentals_bulk(["TCS", "INFY", "NOPE"])
+    assert result == {"TCS": fresh, "INFY": refetched}
+    assert sorted(c.args[0] for c in fetch.await_args_list) == ["INFY", "NOPE"]
+    store._local.clear()
@@ -0,0 +1,82 @@
+"""Unit tests for conditional GETs of scraped upstream pages."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.services import http_cache
+from app.services.http_cache import get_parsed
+from app.services.mf import nav_store
+
+URL = "https://www.screener.in/company/TCS/"
+
+
+@pytest.fixture
+def store():
+    data = {}
+
+    async def fake_get(key):
+        return data.get(key)
+
+    async def fake_set(key, value, ttl=60):
+        data[key] = value
+
+    with patch.object(http_cache, "cache_get", fake_get), patch.object(http_cache, "cache_set", fake_set):
+        yield data
+
+
+def _response(status, text="", headers=None):
+    return httpx.Response(status, text=text, headers=headers or {}, request=httpx.Request("GET", URL))
+
+
+@pytest.mark.asyncio
+async def test_not_modified_returns_last_parse_without_parsing(store):
+    parse = MagicMock(side_effect=lambda resp: {"pe": float(resp.text)})
+    get = AsyncMock(
+        side_effect=[
+            _response(200, "21.5", {"ETag": '"v1"', "Last-Modified": "Mon, 12 Oct 2026 10:00:00 GMT"}),
+            _response(304),
+        ]
+    )
+    with patch.object(http_cache, "rate_limited_get", get):
+        assert await get_parsed(MagicMock(), URL, parse, namespace="fundamentals") == {"pe": 21.5}
+        assert await get_parsed(MagicMock(), URL, parse, namespace="fundamentals") == {"pe": 21.5}
+
+    parse.assert_called_once()
+    assert "If-None-Match" not in get.call_args_list[0].kwargs["headers"]
+    second = get.call_args_list[1].kwargs["headers"]
+    assert second["If-None-Match"] == '"v1"'
+    assert second["If-Modified-Since"] == "Mon, 12 Oct 2026 10:00:00 GMT"
+
+
+@pytest.mark.asyncio
+async def test_namespaces_and_validatorless_pages_are_kept_apart(store):
+    get = AsyncMock(return_value=_response(200, "x", {"ETag": '"v1"'}))
+    with patch.object(http_cache, "rate_limited_get", get):
+        await get_parsed(MagicMock(), URL, lambda r: 1, namespace="fundamentals")
+        await get_parsed(MagicMock(), URL, lambda r: 2, namespace="earnings")
+    assert sorted(v["value"] for v in store.values()) == [1, 2]
+
+    store.clear()
+    with patch.object(http_cache, "rate_limited_get", AsyncMock(return_value=_response(200, "x"))):
+        assert await get_parsed(MagicMock(), URL, lambda r: 3, namespace="fundamentals") == 3
+    assert store == {}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_amfi_file_keeps_hashes_and_renews_marker():
+    redis = MagicMock(exists=AsyncMock(return_value=True), delete=AsyncMock(), set=AsyncMock())
+
+    async def not_modified(headers=None, validators=None):
+        raise nav_store.NotModified
+        yield  # pragma: no cover - makes this an async generator
+
+    with (
+        patch.object(nav_store, "get_redis", AsyncMock(return_value=redis)),
+        patch.object(nav_store, "conditional_headers", AsyncMock(return_value={"If-None-Match": '"v1"'})),
+        patch.object(nav_store, "_stream_schemes", not_modified),
+    ):
+        assert await nav_store.ingest_navs() is None
+    redis.set.assert_awaited_once_with(nav_store.SYNC_KEY, "1", ex=nav_store.SYNC_TTL)
+    redis.pipeline.assert_not_called()
@@ -0,0 +1,95 @@
+"""Unit tests for the intraday tick recorder."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import cache
+from app.services.market import intraday
+from app.services.market.intraday import IntradayRecorder, TickRing
+from app.services.market_calendar import IST
+
+OPEN = IST.localize(datetime(2026, 10, 16, 9, 15)).timestamp()
+
+
+class TestTickRing:
+    def test_wraps_and_keeps_order(self):
+        ring = TickRing(capacity=3)
+        for i in range(5):
+            ring.append(OPEN + i, 100 + i, 0)
+        ts, price, _ = ring.arrays()
+        assert list(price) == [102, 103, 104]
+        assert ring.first_ts() == OPEN + 2
+        assert ring.last_price() == 104
+
+    def test_rolls_ticks_into_bars(self):
+        ring = TickRing()
+        for offset, price, volume in [(0, 100, 1000), (20, 103, 1500), (50, 99, 1800), (65, 101, 2500)]:
+            ring.append(OPEN + offset, price, volume)
+        one_min = ring.bars(60)
+        assert [b["time"] for b in one_min] == [int(OPEN), int(OPEN) + 60]
+        assert one_min[0] == {"time": int(OPEN), "open": 100, "high": 103, "low": 99, "close": 99, "volume": 800}
+        assert one_min[1]["volume"] == 700
+        assert len(ring.bars(300)) == 1
+
+
+class TestRecorder:
+    @pytest.mark.asyncio
+    async def test_records_locally_and_mirrors_to_stream(self):
+        pipe = MagicMock(execute=AsyncMock(return_value=["1-0", True]))
+        redis = MagicMock(pipeline=MagicMock(return_value=pipe))
+        recorder = IntradayRecorder()
+        with patch.object(cache, "get_redis", AsyncMock(return_value=redis)):
+            await recorder.record(
+                {"TCS": {"current_price": 4000.0, "volume": 10, "fetched_at": OPEN}, "X": {}}, OPEN + 5
+            )
+        pipe.xadd.assert_called_once()
+        assert pipe.xadd.call_args.args[0] == "ticks:2026-10-16:TCS"
+        assert pipe.xadd.call_args.args[1]["t"] == OPEN
+        assert recorder._rings["TCS"].last_id == "1-0"
+        assert "X" not in recorder._rings
+
+    @pytest.mark.asyncio
+    async def test_reader_catches_up_from_stream(self):
+        now = OPEN + 120
+        entries = [
+            ("1-0", {"t": str(OPEN), "p": "100", "v": "0"}),
+            ("2-0", {"t": str(OPEN + 61), "p": "102", "v": "5"}),
+            ("3-0", {"t": str(OPEN + 61), "p": "102", "v": "5"}),  # Same timestamp again
+        ]
+        redis = MagicMock(xrange=AsyncMock(return_value=entries))
+        recorder = IntradayRecorder()
+        with (
+            patch.object(cache, "get_redis", AsyncMock(return_value=redis)),
+            patch.object(intraday.time, "time", return_value=now),
+        ):
+            bars = await recorder.bars("TCS", 60, full_session=True)
+        assert [b["close"] for b in bars] == [100, 102]
+        assert len(recorder._rings["TCS"]) == 2
+        assert recorder._rings["TCS"].last_id == "3-0"
+
+    @pytest.mark.asyncio
+    async def test_cached_and_previous_day_quotes_are_not_re_recorded(self):
+        pipe = MagicMock(execute=AsyncMock(return_value=["1-0", True]))
+        redis = MagicMock(pipeline=MagicMock(return_value=pipe))
+        recorder = IntradayRecorder()
+        quote = {"current_price": 4000.0, "fetched_at": OPEN + 10}
+        with patch.object(cache, "get_redis", AsyncMock(return_value=redis)):
+            await recorder.record({"TCS": quote}, OPEN + 15)
+            await recorder.record({"TCS": quote}, OPEN + 20)  # Same cached quote served again
+            await recorder.record({"INFY": {"current_price": 1500.0, "fetched_at": OPEN - 86400}}, OPEN + 25)
+        assert len(recorder._rings["TCS"]) == 1
+        assert "INFY" not in recorder._rings
+        assert pipe.xadd.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reads_of_unrecorded_symbols_allocate_nothing(self):
+        redis = MagicMock(xrange=AsyncMock(return_value=[]))
+        recorder = IntradayRecorder()
+        with patch.object(cache, "get_redis", AsyncMock(return_value=redis)):
+            assert await recorder.bars("NOPE", 60) == []
+            assert await recorder.ticks("NOPE") == []
+            assert await recorder.last_price("NOPE") is None
+        assert recorder._rings == {}
+        redis.xrange.assert_awaited_once()  # Empty stream remembered briefly
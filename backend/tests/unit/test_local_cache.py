@@ -0,0 +1,25 @@
+"""Unit tests for the in-process LRU cache tier."""
+
+import time
+
+from app.services.local_cache import LocalCache
+
+
+def test_evicts_least_recently_used():
+    cache = LocalCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = LocalCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    now = time.monotonic()
+    monkeypatch.setattr("app.services.local_cache.time.monotonic", lambda: now + 6)
+    assert cache.get("a") is None
+    assert len(cache) == 0
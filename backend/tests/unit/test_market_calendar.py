@@ -0,0 +1,68 @@
+"""Unit tests for the NSE market calendar."""
+
+from datetime import date, datetime
+
+import pytest
+
+from app.services.market_calendar import (
+    IST,
+    is_trading_day,
+    last_complete_session,
+    market_open,
+    next_open,
+    seconds_until_next_open,
+)
+
+
+def _at(*args) -> datetime:
+    return IST.localize(datetime(*args))
+
+
+class TestSessions:
+    def test_open_during_session(self):
+        assert market_open(_at(2026, 3, 11, 10, 0))
+
+    def test_closed_after_close(self):
+        assert not market_open(_at(2026, 3, 11, 15, 30))
+
+    def test_closed_on_holiday(self):
+        assert not is_trading_day(date(2026, 3, 10))
+        assert not market_open(_at(2026, 3, 10, 11, 0))
+
+    def test_closed_on_weekend(self):
+        assert not market_open(_at(2026, 3, 7, 11, 0))
+
+
+class TestNextOpen:
+    def test_zero_while_open(self):
+        assert seconds_until_next_open(_at(2026, 3, 11, 10, 0)) == 0
+
+    def test_friday_evening_waits_for_monday(self):
+        assert seconds_until_next_open(_at(2026, 3, 6, 15, 30)) == (2 * 24 * 60 + 17 * 60 + 45) * 60
+
+    def test_skips_holiday(self):
+        # Monday 9 Mar 2026 evening → Tuesday 10 Mar is a holiday → Wednesday open
+        assert next_open(_at(2026, 3, 9, 16, 0)) == _at(2026, 3, 11, 9, 15).timestamp()
+
+    def test_crosses_year_boundary(self):
+        assert next_open(_at(2025, 12, 31, 16, 0)) == _at(2026, 1, 1, 9, 15).timestamp()
+
+
+class TestLastCompleteSession:
+    def test_after_close_is_today(self):
+        assert last_complete_session(_at(2026, 3, 11, 16, 0)) == "2026-03-11"
+
+    def test_before_close_skips_holiday(self):
+        assert last_complete_session(_at(2026, 3, 11, 10, 0)) == "2026-03-09"
+
+    def test_monday_morning_rolls_back_to_friday(self):
+        assert last_complete_session(_at(2026, 3, 9, 9, 0)) == "2026-03-06"
+
+
+@pytest.mark.parametrize("closed, expected", [(3600, 3600), (None, 2 * 24 * 3600)])
+def test_market_ttl_caches_until_next_open(monkeypatch, closed, expected):
+    from app.services import cache
+
+    monkeypatch.setattr(cache, "market_open", lambda: False)
+    monkeypatch.setattr(cache, "seconds_until_next_open", lambda: 2 * 24 * 3600)
+    assert cache.market_ttl(60, closed) == expected
@@ -0,0 +1,95 @@
+"""Unit tests for the AMFI NAV store."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import cache
+from app.services.mf import nav_store
+from app.services.mf.nav_store import get_navs, normalize_scheme_name, parse_nav_line, resolve_schemes
+
+LINE = "122639;INF879O01027;-;Parag Parikh Flexi Cap Fund - Direct Plan - Growth;82.4512;10-Oct-2026"
+
+
+def _redis(hashes: dict):
+    r = MagicMock()
+    r.exists = AsyncMock(return_value=1)
+    r.hmget = AsyncMock(side_effect=lambda key, fields: [hashes.get(key, {}).get(f) for f in fields])
+    return AsyncMock(return_value=r)
+
+
+class TestParsing:
+    def test_parses_scheme_line(self):
+        code, isins, name, nav, day = parse_nav_line(LINE)
+        assert code == "122639"
+        assert isins == ["INF879O01027"]
+        assert nav == "82.4512"
+        assert day == "10-Oct-2026"
+
+    def test_skips_headers(self):
+        assert parse_nav_line("Open Ended Schemes(Equity Scheme - Flexi Cap Fund)") is None
+        assert parse_nav_line("Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;") is None
+
+    def test_name_key_ignores_plan_noise(self):
+        assert normalize_scheme_name("Parag Parikh Flexi Cap Fund - Direct Plan - Growth") == normalize_scheme_name(
+            "Parag Parikh Flexi Cap Fund Direct Growth"
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_navs_reads_only_requested_codes():
+    get_redis = _redis({nav_store.NAV_KEY: {"122639": "82.4512;10-Oct-2026", "100001": "N.A.;10-Oct-2026"}})
+    with patch.object(cache, "get_redis", get_redis):
+        navs = await get_navs(["122639", "100001", "999999"])
+    assert navs == {"122639": {"nav": 82.4512, "date": "10-Oct-2026"}}
+    r = await get_redis()
+    assert r.hmget.call_args.args == (nav_store.NAV_KEY, ["122639", "100001", "999999"])
+
+
+@pytest.mark.asyncio
+async def test_resolve_by_code_isin_and_name():
+    get_redis = _redis(
+        {
+            nav_store.ISIN_KEY: {"INF879O01027": "122639"},
+            nav_store.NAME_KEY: {normalize_scheme_name("HDFC Mid Cap Fund Direct Growth"): "118989"},
+        }
+    )
+    with patch.object(cache, "get_redis", get_redis):
+        codes = await resolve_schemes(
+            {"A": "145455", "B": "inf879o01027", "C": "HDFC Mid-Cap Fund - Direct Plan - Growth", "D": "UNKNOWN"}
+        )
+    assert codes == {"A": "145455", "B": "122639", "C": "118989"}
+
+
+@pytest.mark.asyncio
+async def test_legacy_aliases_resolve_when_lookups_miss():
+    get_redis = _redis({nav_store.NAME_KEY: {normalize_scheme_name("Axis Liquid Fund Direct Growth"): "119064"}})
+    with patch.object(cache, "get_redis", get_redis):
+        codes = await resolve_schemes(
+            {"PPFAS": "PPFAS", "hdfc-mc": "HDFC Mid Cap (old name)", "AXIS-LIQ": "Axis Liquid Fund Direct Growth"}
+        )
+    assert codes == {"PPFAS": "122639", "hdfc-mc": "101762", "AXIS-LIQ": "119064"}
+
+
+@pytest.mark.asyncio
+async def test_failed_first_sync_backs_off_and_serves_fallback():
+    keys = set()
+    r = MagicMock()
+    r.exists = AsyncMock(side_effect=lambda key: int(key in keys))
+    r.set = AsyncMock(side_effect=lambda key, value, ex=None: keys.add(key))
+    ingest = AsyncMock(side_effect=OSError("timed out"))
+    fallback = ({"122639": "82.4512;10-Oct-2026"}, {}, {})
+    nav_store._fallback.clear()
+    with (
+        patch.object(cache, "get_redis", AsyncMock(return_value=r)),
+        patch.object(nav_store, "claim", AsyncMock(side_effect=lambda k, ttl: k)),
+        patch.object(nav_store, "release", AsyncMock()),
+        patch.object(nav_store, "ingest_navs", ingest),
+        patch.object(nav_store, "_parse_in_memory", AsyncMock(return_value=fallback)),
+    ):
+        assert await get_navs(["122639"]) == {"122639": {"nav": 82.4512, "date": "10-Oct-2026"}}
+        assert await get_navs(["122639"]) == {"122639": {"nav": 82.4512, "date": "10-Oct-2026"}}
+    nav_store._fallback.clear()
+    ingest.assert_awaited_once()
+    assert r.set.call_args.args[0] == nav_store.FAIL_KEY
+    r.hmget.assert_not_called()
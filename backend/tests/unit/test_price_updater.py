@@ -0,0 +1,53 @@
+"""Unit tests for the price cache updater."""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.tasks import price_updater
+
+
+@pytest.mark.asyncio
+async def test_single_unordered_bulk_upsert():
+    collection = MagicMock(bulk_write=AsyncMock())
+    prices = {
+        "TCS": {"current_price": 4000.0, "day_change": 12.5, "day_change_pct": 0.31, "volume": 1200.0},
+        "INFY": {"current_price": None},
+    }
+    with (
+        patch.object(price_updater, "market_open", return_value=True),
+        patch.object(price_updater, "tradable_symbols", AsyncMock(return_value=["TCS", "INFY"])),
+        patch.object(price_updater, "get_bulk_prices", AsyncMock(return_value=prices)) as fetch,
+        patch.object(price_updater.PriceCache, "get_motor_collection", return_value=collection),
+    ):
+        await price_updater.update_all_prices()
+
+    fetch.assert_awaited_once_with(["TCS", "INFY"])
+    collection.bulk_write.assert_awaited_once()
+    ops = collection.bulk_write.call_args.args[0]
+    assert collection.bulk_write.call_args.kwargs == {"ordered": False}
+    assert len(ops) == 1
+    assert ops[0]._filter == {"symbol": "TCS"}
+    assert ops[0]._doc["$set"]["volume"] == 1200
+
+
+def test_skips_symbols_without_price():
+    assert price_updater._upserts({"X": {"current_price": 0}}, datetime.now(timezone.utc)) == []
+
+
+@pytest.mark.asyncio
+async def test_dedupe_keeps_the_newest_row_per_symbol():
+    from app.core.database import _dedupe_price_cache
+
+    async def groups():
+        yield {"_id": "TCS", "ids": ["new", "old", "older"], "n": 3}
+
+    database = MagicMock()
+    database.price_cache.aggregate = MagicMock(return_value=groups())
+    database.price_cache.delete_many = AsyncMock()
+    await _dedupe_price_cache(database)
+
+    pipeline = database.price_cache.aggregate.call_args.args[0]
+    assert pipeline[0] == {"$sort": {"last_updated": -1}}
+    database.price_cache.delete_many.assert_awaited_once_with({"_id": {"$in": ["old", "older"]}})
@@ -0,0 +1,67 @@
+"""Unit tests for access-driven quote prefetch."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import cache
+from app.services.market import provider as provider_module
+from app.services.market.access_tracker import AccessTracker
+from app.services.market.provider import QuoteProvider
+from app.tasks import price_updater
+
+
+@pytest.mark.asyncio
+async def test_reads_are_buffered_and_flushed_in_one_pipeline():
+    pipe = MagicMock(execute=AsyncMock())
+    redis = MagicMock(pipeline=MagicMock(return_value=pipe))
+    tracker = AccessTracker(flush_interval=3600)
+    tracker.record(["price:TCS:NSE", "price:INFY:NSE"])
+    tracker.record(["price:TCS:NSE"])
+    with patch.object(cache, "get_redis", AsyncMock(return_value=redis)):
+        await tracker.flush()
+        await tracker.flush()  # Nothing buffered — no round trip
+    pipe.zincrby.assert_any_call("quote:access", 2, "price:TCS:NSE")
+    pipe.zincrby.assert_any_call("quote:access", 1, "price:INFY:NSE")
+    pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_hot_fetches_only_missing_or_soon_stale_keys():
+    provider = QuoteProvider([], batch_sources=[])
+    provider.access = MagicMock(
+        flush=AsyncMock(),
+        decay=AsyncMock(),
+        hot=AsyncMock(return_value=["price:TCS:NSE", "price:INFY:NSE", "price:ITC:BSE", "price:SBIN:NSE"]),
+    )
+    now = time.time()
+    cached = {
+        "price:TCS:NSE": {"fetched_at": now - 50},
+        "price:INFY:NSE": {"fetched_at": now - 1},
+        "price:SBIN:NSE": None,  # Undecodable entry
+    }
+    provider._load_shared = AsyncMock(
+        side_effect=lambda keys, exchange, wait: {k: {"symbol": v} for k, v in keys.items()}
+    )
+    with (
+        patch.object(provider_module, "cache_mget", AsyncMock(return_value=cached)),
+        patch.object(provider_module, "quote_ttl", return_value=60),
+        patch.object(provider_module, "last_close", return_value=now - 3600),
+    ):
+        assert await provider.refresh_hot(lead=25) == 3
+
+    loads = {c.args[1]: c.args[0] for c in provider._load_shared.call_args_list}
+    assert loads == {"NSE": {"price:TCS:NSE": "TCS", "price:SBIN:NSE": "SBIN"}, "BSE": {"price:ITC:BSE": "ITC"}}
+    assert all(c.kwargs["wait"] is False for c in provider._load_shared.call_args_list)
+    provider.access.decay.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_job_idles_outside_market_hours():
+    with (
+        patch.object(price_updater, "market_open", return_value=False),
+        patch.object(price_updater.quote_provider, "refresh_hot", AsyncMock()) as refresh,
+    ):
+        await price_updater.refresh_hot_quotes()
+    refresh.assert_not_awaited()
@@ -0,0 +1,210 @@
+"""Unit tests for the unified QuoteProvider and its source adapters."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.services.market.provider import QuoteProvider, quote_cache_key
+from app.services.market.sources import BatchQuoteSource, QuoteSource, make_quote
+
+
+class FakeSource(QuoteSource):
+    def __init__(self, name, price=None, symbols=None):
+        self.name = name
+        self.price = price
+        self.symbols = symbols
+        self.calls = []
+
+    def supports(self, symbol, exchange):
+        return self.symbols is None or symbol in self.symbols
+
+    async def fetch(self, client, symbol, exchange):
+        self.calls.append(symbol)
+        return make_quote(symbol, exchange, self.price, self.price - 10, source=self.name) if self.price else None
+
+
+class FakeBatchSource(BatchQuoteSource):
+    batch_size = 2
+
+    def __init__(self, known):
+        self.known = known
+        self.chunks = []
+
+    async def fetch_many(self, client, symbols, exchange):
+        self.chunks.append(list(symbols))
+        return {s: make_quote(s, exchange, 100.0, source="batch") for s in symbols if s in self.known}
+
+
+def test_make_quote_normalizes_fields():
+    q = make_quote("TCS", "NSE", 110.0, 100.0, source="yahoo")
+    assert q["current_price"] == 110.0
+    assert q["previous_close"] == 100.0
+    assert q["day_change"] == 10.0
+    assert q["day_change_pct"] == 10.0
+    assert q["name"] == "TCS"
+
+
+def test_make_quote_without_previous_close():
+    q = make_quote("TCS", "NSE", 110.0)
+    assert q["previous_close"] == 110.0
+    assert q["day_change_pct"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_falls_back_in_order():
+    first, second = FakeSource("a"), FakeSource("b", price=50)
+    provider = QuoteProvider([first, second], batch_sources=[])
+    with patch("app.services.market.provider.get_http_client", AsyncMock()):
+        data = await provider.fetch("INFY")
+    assert data["source"] == "b"
+    assert first.calls == ["INFY"] and second.calls == ["INFY"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_skips_unsupported_sources():
+    limited, fallback = FakeSource("mc", price=99, symbols={"TCS"}), FakeSource("g", price=50)
+    provider = QuoteProvider([limited, fallback], batch_sources=[])
+    with patch("app.services.market.provider.get_http_client", AsyncMock()):
+        data = await provider.fetch("INFY")
+    assert data["source"] == "g"
+    assert limited.calls == []
+
+
+@pytest.mark.asyncio
+async def test_get_many_only_fetches_misses():
+    source = FakeSource("a", price=50)
+    provider = QuoteProvider([source], batch_sources=[])
+    hit = make_quote("TCS", "NSE", 100.0, source="cache")
+    with (
+        patch("app.services.market.provider.get_http_client", AsyncMock()),
+        patch(
+            "app.services.market.provider.cache_mget",
+            AsyncMock(return_value={quote_cache_key("TCS"): hit, quote_cache_key("INFY"): None}),
+        ),
+        patch("app.services.market.provider.cache_mset", AsyncMock()) as mset,
+        patch("app.services.market.provider.claim", AsyncMock(side_effect=lambda keys, ttl: keys)),
+        patch("app.services.market.provider.release", AsyncMock()),
+    ):
+        prices = await provider.get_many(["TCS", "INFY"])
+
+    assert prices["TCS"]["source"] == "cache"
+    assert prices["INFY"]["source"] == "a"
+    assert source.calls == ["INFY"]
+    assert list(mset.call_args.args[0]) == [quote_cache_key("INFY")]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_fetch_once():
+    source = FakeSource("a", price=50)
+    provider = QuoteProvider([source], batch_sources=[])
+    with (
+        patch("app.services.market.provider.get_http_client", AsyncMock()),
+        patch("app.services.market.provider.cache_mget", AsyncMock(return_value={})),
+        patch("app.services.market.provider.cache_mset", AsyncMock()),
+        patch("app.services.market.provider.claim", AsyncMock(side_effect=lambda keys, ttl: keys)),
+        patch("app.services.market.provider.release", AsyncMock()),
+    ):
+        results = await asyncio.gather(*[provider.get("TCS") for _ in range(10)])
+
+    assert source.calls == ["TCS"]
+    assert all(r["current_price"] == 50 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_symbols_wait_for_peer_worker():
+    source = FakeSource("a", price=50)
+    provider = QuoteProvider([source], batch_sources=[])
+    peer_quote = make_quote("TCS", "NSE", 77.0, source="peer")
+    with (
+        patch("app.services.market.provider.get_http_client", AsyncMock()),
+        patch("app.services.market.provider.cache_mget", AsyncMock(return_value={})),
+        patch("app.services.market.provider.cache_mset", AsyncMock()),
+        patch("app.services.market.provider.claim", AsyncMock(return_value=[])),
+        patch("app.services.market.provider.release", AsyncMock()),
+        patch(
+            "app.services.market.provider.wait_for_peers",
+            AsyncMock(return_value={quote_cache_key("TCS"): peer_quote}),
+        ),
+    ):
+        data = await provider.get("TCS")
+
+    assert data["source"] == "peer"
+    assert source.calls == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_chunks_batches_and_falls_back_for_misses():
+    batch = FakeBatchSource(known={"TCS", "INFY", "ITC"})
+    single = FakeSource("single", price=50)
+    provider = QuoteProvider([single], batch_sources=[batch])
+    with patch("app.services.market.provider.get_http_client", AsyncMock()):
+        results = await provider.fetch_many(["TCS", "INFY", "ITC", "NEWCO", "SBIN"])
+
+    assert batch.chunks == [["TCS", "INFY"], ["ITC", "NEWCO"], ["SBIN"]]
+    assert {s: q["source"] for s, q in results.items()} == {
+        "TCS": "batch",
+        "INFY": "batch",
+        "ITC": "batch",
+        "NEWCO": "single",
+        "SBIN": "single",
+    }
+    assert sorted(single.calls) == ["NEWCO", "SBIN"]
+
+
+@pytest.mark.asyncio
+async def test_yahoo_spark_parses_multi_ticker_response():
+    from unittest.mock import MagicMock
+
+    from app.services.market.sources import YahooSparkSource
+
+    resp = MagicMock(status_code=200)
+    resp.json.return_value = {
+        "spark": {
+            "result": [
+                {"symbol": "TCS.NS", "response": [{"meta": {"regularMarketPrice": 110, "chartPreviousClose": 100}}]},
+                {"symbol": "INFY.NS", "response": [{"meta": {}}]},
+            ]
+        }
+    }
+    client = MagicMock()
+    client.get = AsyncMock(return_value=resp)
+
+    with patch("app.services.market.sources.throttle", AsyncMock(return_value=0)):
+        results = await YahooSparkSource().fetch_many(client, ["TCS", "INFY"], "NSE")
+
+    assert list(results) == ["TCS"]
+    assert results["TCS"]["day_change_pct"] == 10.0
+    assert "symbols=TCS.NS,INFY.NS" in client.get.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_local_tier_skips_redis_on_repeat_reads():
+    provider = QuoteProvider([FakeSource("a", price=50)], batch_sources=[])
+    hit = make_quote("TCS", "NSE", 100.0, source="cache")
+    mget = AsyncMock(return_value={quote_cache_key("TCS"): hit})
+    with patch("app.services.market.provider.cache_mget", mget):
+        await provider.get("TCS")
+        await provider.get("TCS")
+    assert mget.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_quote_served_while_refreshing_in_background():
+    source = FakeSource("fresh", price=50)
+    provider = QuoteProvider([source], batch_sources=[])
+    stale = make_quote("TCS", "NSE", 100.0, source="cache")
+    stale["fetched_at"] = 0
+    with (
+        patch("app.services.market.provider.get_http_client", AsyncMock()),
+        patch("app.services.market.provider.cache_mget", AsyncMock(return_value={quote_cache_key("TCS"): stale})),
+        patch("app.services.market.provider.cache_mset", AsyncMock()) as mset,
+        patch("app.services.market.provider.claim", AsyncMock(side_effect=lambda keys, ttl: keys)),
+        patch("app.services.market.provider.release", AsyncMock()),
+    ):
+        data = await provider.get("TCS")
+        assert data["source"] == "cache"
+        await asyncio.gather(*provider._tasks)
+
+    assert source.calls == ["TCS"]
+    assert mset.await_count == 1
+    assert provider._local.get(quote_cache_key("TCS"))["source"] == "fresh"
@@ -0,0 +1,91 @@
+"""Unit tests for the rolling statistics table."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.market import rolling_stats
+from app.services.market.rolling_stats import compute_stats
+
+
+def _bars(n: int):
+    return [
+        {
+            "date": f"2026-{1 + i // 28:02d}-{1 + i % 28:02d}",
+            "open": 100 + i,
+            "high": 102 + i,
+            "low": 99 + i,
+            "close": 101 + i,
+            "volume": 1000 + i,
+        }
+        for i in range(n)
+    ]
+
+
+class TestComputeStats:
+    def test_window_stats(self):
+        stats = compute_stats(_bars(300))
+        assert stats["as_of"] == _bars(300)[-1]["date"]
+        assert stats["high_52w"] == 102 + 299
+        assert stats["low_52w"] == 99 + 300 - 252
+        assert stats["sma_20"] == sum(101 + i for i in range(280, 300)) / 20
+        assert stats["sma_200"] == sum(101 + i for i in range(100, 300)) / 200
+        assert stats["avg_volume_20d"] == sum(1000 + i for i in range(280, 300)) / 20
+        # The 3-point high-low range dominates the distance from the previous close
+        assert stats["atr_14"] == 3
+
+    def test_short_history_leaves_long_windows_empty(self):
+        stats = compute_stats(_bars(30))
+        assert stats["sma_20"] is not None
+        assert stats["sma_50"] is None and stats["sma_200"] is None
+
+    def test_no_bars(self):
+        assert compute_stats([]) is None
+
+
+@pytest.mark.asyncio
+async def test_read_computes_only_rows_missing_from_table_or_stale():
+    async def _cursor():
+        yield {"symbol": "TCS", "as_of": "2026-10-16", "high_52w": 4500.0}
+        yield {"symbol": "WATCHED", "as_of": "2026-09-01", "high_52w": 10.0}
+
+    collection = MagicMock(find=MagicMock(return_value=_cursor()))
+    rolling_stats._local.clear()
+    rolling_stats._attempted.clear()
+    with (
+        patch.object(rolling_stats.RollingStats, "get_motor_collection", return_value=collection),
+        patch.object(rolling_stats, "last_complete_session", return_value="2026-10-16"),
+        patch.object(
+            rolling_stats, "_compute_and_store", AsyncMock(side_effect=lambda s: {"symbol": s, "as_of": "2026-10-16"})
+        ) as compute,
+    ):
+        stats = await rolling_stats.get_rolling_stats(["TCS", "INFY", "WATCHED"])
+    assert stats["TCS"]["high_52w"] == 4500.0
+    assert stats["WATCHED"]["as_of"] == "2026-10-16"
+    assert sorted(c.args[0] for c in compute.await_args_list) == ["INFY", "WATCHED"]
+    rolling_stats._local.clear()
+    rolling_stats._attempted.clear()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_session_is_recomputed_once_per_session():
+    async def _cursor(*args, **kwargs):
+        yield {"symbol": "HALTED", "as_of": "2026-09-01", "high_52w": 10.0}
+
+    collection = MagicMock(find=MagicMock(side_effect=_cursor))
+    compute = AsyncMock(return_value={"symbol": "HALTED", "as_of": "2026-09-01"})
+    rolling_stats._local.clear()
+    rolling_stats._attempted.clear()
+    with (
+        patch.object(rolling_stats.RollingStats, "get_motor_collection", return_value=collection),
+        patch.object(rolling_stats, "_compute_and_store", compute),
+        patch.object(rolling_stats, "last_complete_session", return_value="2026-10-16"),
+    ):
+        for _ in range(3):
+            assert (await rolling_stats.get_rolling_stats(["HALTED"]))["HALTED"]["as_of"] == "2026-09-01"
+        assert compute.await_count == 1 and collection.find.call_count == 1
+        with patch.object(rolling_stats, "last_complete_session", return_value="2026-10-19"):
+            await rolling_stats.get_rolling_stats(["HALTED"])
+    assert compute.await_count == 2
+    rolling_stats._local.clear()
+    rolling_stats._attempted.clear()
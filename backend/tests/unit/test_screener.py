@@ -0,0 +1,63 @@
+"""Unit tests for the vectorized universe screener."""
+
+import numpy as np
+import pytest
+
+from app.services.market.screener import QUOTE_COLUMNS, STORED_COLUMNS, Filter, ScreenerFrame, parse_filters
+
+NAN = np.nan
+
+
+def _frame():
+    rows = {
+        # symbol: price, change_pct, volume, pe, roe, high_52w
+        "AAA": (100, 2.0, 1000, 12, 22, 102),
+        "BBB": (50, -1.5, 5000, 35, 9, 80),
+        "CCC": (200, 0.5, 300, NAN, 30, 400),
+        "DDD": (75, 3.1, NAN, 18, 16, 76),
+    }
+    symbols = list(rows)
+    columns = {c: np.full(len(symbols), NAN) for c in QUOTE_COLUMNS + STORED_COLUMNS}
+    for i, (price, change, volume, pe, roe, high) in enumerate(rows.values()):
+        columns["price"][i], columns["change_pct"][i], columns["volume"][i] = price, change, volume
+        columns["pe"][i], columns["roe"][i], columns["high_52w"][i] = pe, roe, high
+    return ScreenerFrame(symbols, columns)
+
+
+class TestScreen:
+    def test_filters_are_anded_and_nan_never_matches(self):
+        rows = _frame().screen([Filter("pe", "<=", 20), Filter("roe", ">=", 15)], "roe")
+        assert [r["symbol"] for r in rows] == ["AAA", "DDD"]
+
+    def test_sort_and_top_k(self):
+        rows = _frame().screen([], "change_pct", descending=True, limit=2)
+        assert [r["symbol"] for r in rows] == ["DDD", "AAA"]
+        rows = _frame().screen([], "change_pct", descending=False, limit=1)
+        assert rows[0]["symbol"] == "BBB"
+
+    @pytest.mark.parametrize("limit", [0, -3])
+    def test_non_positive_limit_is_clamped(self, limit):
+        rows = _frame().screen([], "change_pct", limit=limit)
+        assert [r["symbol"] for r in rows] == ["DDD"]
+
+    def test_missing_sort_values_rank_last(self):
+        rows = _frame().screen([], "volume")
+        assert rows[-1]["symbol"] == "DDD"
+        assert rows[-1]["volume"] is None
+
+    def test_derived_pct_of_high(self):
+        rows = _frame().screen([Filter("pct_of_high", ">=", 95)], "pct_of_high")
+        assert {r["symbol"] for r in rows} == {"AAA", "DDD"}
+
+
+class TestParseFilters:
+    def test_parses_expressions(self):
+        assert parse_filters("roce>=20, debt_equity<0.5") == [
+            Filter("roce", ">=", 20.0),
+            Filter("debt_equity", "<", 0.5),
+        ]
+
+    @pytest.mark.parametrize("expr", ["pe<<3", "bogus>1", "pe>abc"])
+    def test_rejects_bad_expressions(self, expr):
+        with pytest.raises(ValueError):
+            parse_filters(expr)
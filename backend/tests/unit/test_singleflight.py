@@ -0,0 +1,81 @@
+"""Unit tests for in-process single-flight coalescing."""
+
+import asyncio
+
+import pytest
+from app.services.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_load():
+    flight = SingleFlight()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"price": 100}
+
+    results = await asyncio.gather(*[flight.do("price:TCS:NSE", loader) for _ in range(20)])
+    assert calls == 1
+    assert all(r == {"price": 100} for r in results)
+    assert flight.inflight() == 0
+
+
+@pytest.mark.asyncio
+async def test_overlapping_batches_load_each_key_once():
+    flight = SingleFlight()
+    seen = []
+
+    async def loader(keys):
+        seen.extend(keys)
+        await asyncio.sleep(0.01)
+        return {k: k.lower() for k in keys}
+
+    first, second = await asyncio.gather(flight.do_many(["A", "B"], loader), flight.do_many(["B", "C"], loader))
+    assert sorted(seen) == ["A", "B", "C"]
+    assert first == {"A": "a", "B": "b"}
+    assert second == {"B": "b", "C": "c"}
+
+
+@pytest.mark.asyncio
+async def test_failure_propagates_and_clears_inflight():
+    flight = SingleFlight()
+
+    async def loader():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        await flight.do("k", loader)
+    assert flight.inflight() == 0
+
+    async def ok():
+        return 1
+
+    assert await flight.do("k", ok) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_owner_hands_the_load_to_waiters():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.05 if calls == 1 else 0)
+        return calls
+
+    owner = asyncio.create_task(flight.do("k", loader))
+    await started.wait()
+    waiter = asyncio.create_task(flight.do("k", loader))
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await owner
+    assert await waiter == 2
+    assert flight.inflight() == 0
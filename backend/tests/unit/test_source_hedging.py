@@ -0,0 +1,90 @@
+"""Unit tests for adaptive source ordering and hedged quote fetches."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.market.provider import QuoteProvider
+from app.services.market.source_stats import PRIOR_COST, SourceStats
+from app.services.market.sources import QuoteSource, make_quote
+
+
+class SlowSource(QuoteSource):
+    def __init__(self, name, delay, price=100.0):
+        self.name = name
+        self.delay = delay
+        self.price = price
+        self.calls = 0
+        self.cancelled = False
+
+    async def fetch(self, client, symbol, exchange):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return make_quote(symbol, exchange, self.price, source=self.name) if self.price else None
+
+
+def _seed(stats, name, latency, ok=True, n=20):
+    for _ in range(n):
+        stats.observe(name, latency, ok)
+
+
+def test_order_prefers_fast_reliable_sources_and_keeps_unmeasured_in_place():
+    stats = SourceStats(min_samples=20)
+    a, b, c = SlowSource("yahoo", 0), SlowSource("mc", 0), SlowSource("google", 0)
+    assert stats.order([a, b, c]) == [a, b, c]
+
+    _seed(stats, "yahoo", 3.0)  # Slow
+    _seed(stats, "google", 0.2)
+    assert stats.order([a, b, c]) == [c, b, a]
+
+    _seed(stats, "google", 0.2, ok=False, n=190)  # Fast but mostly failing
+    assert stats.cost("google") > PRIOR_COST
+    assert stats.order([a, b, c])[0] is b
+
+
+def test_percentile_needs_enough_samples():
+    stats = SourceStats(min_samples=5)
+    _seed(stats, "yahoo", 0.1, n=4)
+    assert stats.percentile("yahoo", 0.95) is None
+    stats.observe("yahoo", 2.0, True)
+    assert stats.percentile("yahoo", 0.95) == 2.0
+    assert stats.percentile("yahoo", 0.5) == 0.1
+
+
+def test_cancelled_hedge_losers_stay_out_of_the_window():
+    stats = SourceStats(min_samples=5)
+    _seed(stats, "yahoo", 2.0, n=5)
+    for _ in range(50):
+        stats.observe("yahoo", 0.3, None)
+    assert stats.percentile("yahoo", 0.95) == 2.0
+    assert stats.error_rate("yahoo") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_at_its_p95():
+    slow, fast = SlowSource("yahoo", delay=5), SlowSource("google", delay=0.01, price=50.0)
+    provider = QuoteProvider([slow, fast], batch_sources=[])
+    _seed(provider.stats, "yahoo", 0.1)
+    _seed(provider.stats, "google", 0.5)  # Slower history, so yahoo stays first
+    with patch("app.services.market.provider.get_http_client", AsyncMock()):
+        data = await asyncio.wait_for(provider.fetch("INFY"), timeout=1)
+        await asyncio.sleep(0)
+
+    assert data["source"] == "google"
+    assert slow.calls == 1 and fast.calls == 1
+    assert slow.cancelled
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_hands_over_without_waiting():
+    failing, backup = SlowSource("yahoo", delay=0, price=None), SlowSource("google", delay=0)
+    provider = QuoteProvider([failing, backup], batch_sources=[])
+    with patch("app.services.market.provider.get_http_client", AsyncMock()):
+        data = await asyncio.wait_for(provider.fetch("INFY"), timeout=0.5)
+    assert data["source"] == "google"
+    assert provider.stats.error_rate("yahoo") == 1.0
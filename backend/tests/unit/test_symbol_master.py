@@ -0,0 +1,41 @@
+"""Unit tests for the symbol master."""
+
+from app.services.symbols import SymbolMaster, get_symbol_master
+
+ROWS = [
+    {"symbol": "TCS", "isin": "INE467B01029", "name": "TCS Ltd", "sector": "IT", "yahoo": "", "mc_code": "TCS"},
+    {"symbol": "KOTAKALPHA", "isin": "", "name": "", "sector": "Factor ETF", "yahoo": "ALPHA", "mc_code": ""},
+    {"symbol": "INFY", "isin": "", "name": "Infosys", "sector": "IT", "yahoo": "", "mc_code": ""},
+]
+
+
+class TestSymbolMaster:
+    def test_lookups(self):
+        master = SymbolMaster(ROWS)
+        assert len(master) == 3
+        assert master.sector("TCS") == "IT"
+        assert master.name("TCS") == "TCS Ltd"
+        assert master.mc_code("TCS") == "TCS"
+        assert master.by_isin("INE467B01029").symbol == "TCS"
+
+    def test_unknown_symbol_falls_back(self):
+        master = SymbolMaster(ROWS)
+        assert master.sector("NEWCO") == "Others"
+        assert master.name("NEWCO") == "NEWCO"
+        assert master.mc_code("INFY") is None
+        assert master.get("NEWCO") is None
+
+    def test_yahoo_ticker_mapping(self):
+        master = SymbolMaster(ROWS)
+        assert master.yahoo_ticker("KOTAKALPHA") == "ALPHA.NS"
+        assert master.yahoo_ticker("TCS", "BSE") == "TCS.BO"
+        assert master.yahoo_ticker("NEWCO") == "NEWCO.NS"
+
+    def test_sectors_are_interned(self):
+        master = SymbolMaster(ROWS)
+        assert master._sectors == ["Others", "IT", "Factor ETF"]
+
+    def test_bundled_list_loads(self):
+        master = get_symbol_master()
+        assert master.sector("RELIANCE") == "Oil & Gas"
+        assert master.mc_code("HDFCBANK") == "HDF01"
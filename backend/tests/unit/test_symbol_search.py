@@ -0,0 +1,91 @@
+"""Unit tests for the local symbol search index."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.market import price_service
+from app.services.symbols.search import SearchIndex
+
+ENTRIES = [
+    ("TATAMOTORS", "Tata Motors Ltd", "BSE"),
+    ("TATAMOTORS", "Tata Motors Ltd", "NSE"),
+    ("TATASTEEL", "Tata Steel Ltd", "NSE"),
+    ("TCS", "Tata Consultancy Services Ltd", "NSE"),
+    ("HDFCBANK", "HDFC Bank Ltd", "NSE"),
+    ("RELIANCE", "Reliance Industries Ltd", "NSE"),
+]
+
+
+def _symbols(results):
+    return [(r["symbol"], r["exchange"]) for r in results]
+
+
+class TestSearchIndex:
+    index = SearchIndex(ENTRIES)
+
+    def test_exact_symbol_first(self):
+        assert self.index.search("tcs")[0]["symbol"] == "TCS"
+
+    def test_symbol_prefix_prefers_nse(self):
+        assert _symbols(self.index.search("TATA"))[:2] == [("TATASTEEL", "NSE"), ("TATAMOTORS", "NSE")]
+
+    def test_name_words_match_in_any_position(self):
+        assert [r["symbol"] for r in self.index.search("consultancy")] == ["TCS"]
+        assert [r["symbol"] for r in self.index.search("tata mot")][0] == "TATAMOTORS"
+
+    def test_spaced_query_matches_symbol(self):
+        assert self.index.search("hdfc bank")[0]["symbol"] == "HDFCBANK"
+
+    def test_fuzzy_catches_typos(self):
+        assert self.index.search("relaince")[0]["symbol"] == "RELIANCE"
+
+    def test_limit_and_empty_query(self):
+        assert len(self.index.search("T", limit=2)) == 2
+        assert self.index.search("  ") == []
+
+    def test_payload_rides_along_with_hits(self):
+        index = SearchIndex([("PPFAS", "Parag Parikh Flexi Cap", "NSE", "MF"), ("TCS", "Tata Consultancy", "NSE")])
+        assert index.search("parag")[0] == {
+            "symbol": "PPFAS",
+            "name": "Parag Parikh Flexi Cap",
+            "exchange": "NSE",
+            "payload": "MF",
+        }
+        assert "payload" not in index.search("tcs")[0]
+
+
+class TestSearchStock:
+    index = SearchIndex(ENTRIES)
+
+    async def _search(self, query, yahoo):
+        with (
+            patch.object(price_service, "search_symbols", self.index.search),
+            patch.object(price_service, "_search_yahoo", AsyncMock(return_value=yahoo)) as fetch,
+        ):
+            return await price_service.search_stock(query), fetch
+
+    @pytest.mark.asyncio
+    async def test_exact_symbol_skips_yahoo(self):
+        results, fetch = await self._search("TCS", [])
+        assert results[0]["symbol"] == "TCS"
+        fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_partial_prefix_hits_are_topped_up_from_yahoo(self):
+        yahoo = [{"symbol": "TATASTEEL", "name": "Tata Steel", "exchange": "NSE"}]
+        yahoo.append({"symbol": "TATACHEM", "name": "Tata Chemicals", "exchange": "NSE"})
+        results, _ = await self._search("TATA", yahoo)
+        assert _symbols(results) == [
+            ("TATASTEEL", "NSE"),
+            ("TATAMOTORS", "NSE"),
+            ("TATAMOTORS", "BSE"),
+            ("TCS", "NSE"),
+            ("TATACHEM", "NSE"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fuzzy_hits_rank_after_yahoo(self):
+        yahoo = [{"symbol": "RELINFRA", "name": "Reliance Infrastructure", "exchange": "NSE"}]
+        results, _ = await self._search("relaince", yahoo)
+        assert [r["symbol"] for r in results] == ["RELINFRA", "RELIANCE"]
@@ -0,0 +1,75 @@
+"""Unit tests for the per-host upstream rate limiter."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import cache, upstream_limiter
+from app.services.upstream_limiter import HostLimiter, Lane, current_lane, in_batch_lane
+
+
+def _redis_returning(*waits):
+    r = MagicMock()
+    r.eval = AsyncMock(side_effect=list(waits))
+    return AsyncMock(return_value=r)
+
+
+@pytest.mark.asyncio
+async def test_token_granted_immediately_when_available():
+    limiter = HostLimiter("example.com", rate=10, burst=1)
+    with patch.object(cache, "get_redis", _redis_returning(0)):
+        waited = await limiter.acquire()
+    assert waited < 0.05
+    assert limiter.depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_lane_asks_bucket_to_keep_reserve():
+    limiter = HostLimiter("example.com", rate=10, burst=10)
+    get_redis = _redis_returning(0)
+    with patch.object(cache, "get_redis", get_redis):
+        await limiter.acquire(Lane.BATCH)
+    r = await get_redis()
+    assert r.eval.call_args.args[-1] == 10 * upstream_limiter.BATCH_RESERVE
+
+
+@pytest.mark.asyncio
+async def test_interactive_preempts_queued_batch():
+    limiter = HostLimiter("example.com", rate=20, burst=1)
+    order = []
+
+    async def take(lane):
+        order.append(lane)
+        await asyncio.sleep(0)
+        return 0 if len(order) > 1 else 0.05
+
+    async def call(lane, tag):
+        await limiter.acquire(lane)
+        granted.append(tag)
+
+    granted = []
+    with patch.object(limiter, "_take", side_effect=take):
+        batch = asyncio.create_task(call(Lane.BATCH, "batch"))
+        await asyncio.sleep(0.01)  # Batch is at the head, waiting for a token
+        await asyncio.gather(batch, call(Lane.INTERACTIVE, "interactive"))
+
+    assert granted == ["interactive", "batch"]
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_bucket_without_redis():
+    limiter = HostLimiter("example.com", rate=1, burst=1)
+    with patch.object(cache, "get_redis", AsyncMock(side_effect=ConnectionError)):
+        assert await limiter._take(Lane.INTERACTIVE) == 0
+        assert await limiter._take(Lane.INTERACTIVE) > 0
+
+
+@pytest.mark.asyncio
+async def test_in_batch_lane_sets_context():
+    @in_batch_lane
+    async def job():
+        return current_lane()
+
+    assert await job() == Lane.BATCH
+    assert current_lane() == Lane.INTERACTIVE